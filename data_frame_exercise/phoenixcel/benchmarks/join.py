@@ -0,0 +1,50 @@
+'''
+Joins metrics.csv to a small lookup table of activities, once with the
+nested loop over _list that people used to write and once with
+DataFrame.join. Run it from the data_frame_exercise folder:
+
+    python -m phoenixcel.benchmarks.join
+'''
+import os
+import time
+
+from phoenixcel.src.dataframe import DataFrame
+
+
+METRICS = os.path.join(os.path.dirname(__file__), '..', '..', 'metrics.csv')
+
+
+def stopwatch(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label}: {time.perf_counter() - start:.4f} seconds")
+    return result
+
+
+def nested_loop(metrics, lookup):
+    rows = []
+    for row in metrics._list:
+        for match in lookup._list:
+            if row['Activity'] == match['Activity']:
+                rows.append({**row, **match})
+    return rows
+
+
+def main():
+    metrics = DataFrame.from_csv(METRICS)
+    activities = sorted(set(metrics['Activity']))
+    lookup = DataFrame.from_dictionary({
+        'Activity': activities,
+        'Code': list(range(len(activities))),
+    })
+    print(f"{len(metrics)} metric rows, {len(lookup)} lookup rows")
+
+    expected = stopwatch("nested loop", lambda: nested_loop(metrics, lookup))
+    joined = stopwatch("hash join", lambda: metrics.join(lookup, on='Activity', method='hash'))
+    ordered = metrics.sort_by('Activity')
+    stopwatch("merge join (pre-sorted)", lambda: ordered.join(lookup, on='Activity', method='merge'))
+    assert joined._list == expected
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+'''
+Measures how long a csv takes to load and the peak memory (RSS) of the
+process doing it, for metrics.csv and for a synthetic file made by
+repeating its rows. Each load runs in a fresh python process, since peak
+RSS only ever goes up. Run it from the data_frame_exercise folder:
+
+    python -m phoenixcel.benchmarks.load
+    python -m phoenixcel.benchmarks.load --rows 1000000
+    python -m phoenixcel.benchmarks.load --baseline <git revision>
+
+The rows of a list of dictionaries (what csv.DictReader gives you, and
+how DataFrames used to be stored) are measured too, for comparison, and
+with --baseline so is DataFrame.from_csv as it was at that revision.
+--loaders picks which ones run: a list of dictionaries of 10 million
+rows needs about 7 GB.
+'''
+import argparse
+import csv
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+METRICS = os.path.join(ROOT, 'metrics.csv')
+LOADERS = ('dataframe', 'row dictionaries', 'baseline')
+
+
+def peak_rss_megabytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def synthetic_csv(rows):
+    '''Writes metrics.csv's rows over and over until there are `rows` of them.'''
+    path = os.path.join(tempfile.gettempdir(), f'phoenixcel_metrics_{rows}.csv')
+    if os.path.exists(path):
+        return path
+    with open(METRICS, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        source = list(reader)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for start in range(0, rows, len(source)):
+            writer.writerows(source[:rows - start])
+    return path
+
+
+def baseline_tree(revision):
+    '''Extracts the package as it was at a git revision into a temporary folder.'''
+    folder = tempfile.mkdtemp(prefix='phoenixcel_baseline_')
+    top = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel'], cwd=ROOT,
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    prefix = os.path.relpath(os.path.join(ROOT, 'phoenixcel'), top)
+    archive = subprocess.run(
+        ['git', 'archive', revision, prefix], cwd=top, check=True, capture_output=True,
+    ).stdout
+    subprocess.run(['tar', '-x', '-C', folder], input=archive, check=True)
+    return os.path.join(folder, os.path.dirname(prefix))
+
+
+def measure(loader, path):
+    # Runs in the child process, with the package to measure on PYTHONPATH
+    start = time.perf_counter()
+    if loader in ('dataframe', 'baseline'):
+        from phoenixcel.src.dataframe import DataFrame
+        loaded = DataFrame.from_csv(path)
+    else:
+        with open(path, newline='') as f:
+            loaded = list(csv.DictReader(f))
+    seconds = time.perf_counter() - start
+    print(f"{seconds:.3f} {peak_rss_megabytes():.1f} {len(loaded)}")
+
+
+def run(loader, path, root=ROOT):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--measure', loader, path],
+        check=True, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=root),
+    ).stdout.split()
+    seconds, megabytes, rows = float(output[0]), float(output[1]), int(output[2])
+    print(f"  {loader:>16}: {rows} rows in {seconds:.3f} seconds, peak RSS {megabytes:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000,
+                        help='rows in the synthetic file (default 10,000,000)')
+    parser.add_argument('--baseline', metavar='REVISION',
+                        help='also load with DataFrame.from_csv as of this git revision')
+    parser.add_argument('--loaders', nargs='+', choices=LOADERS, default=list(LOADERS),
+                        help='which loaders to run (default all)')
+    parser.add_argument('--measure', nargs=2, metavar=('LOADER', 'PATH'), help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.measure:
+        measure(*arguments.measure)
+        return
+
+    roots = {loader: ROOT for loader in arguments.loaders}
+    if 'baseline' in roots:
+        if arguments.baseline is None:
+            del roots['baseline']
+        else:
+            roots['baseline'] = baseline_tree(arguments.baseline)
+
+    for label, path in (('metrics.csv', METRICS), (f'{arguments.rows} rows', synthetic_csv(arguments.rows))):
+        print(label)
+        for loader, root in roots.items():
+            run(loader, path, root)
+
+
+if __name__ == '__main__':
+    main()
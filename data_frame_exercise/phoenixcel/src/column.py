@@ -0,0 +1,570 @@
+from array import array
+from datetime import date, datetime
+
+
+# Each dtype maps to the typecode of the array that holds its values.
+# Strings are dictionary-encoded: the buffer holds integer codes
+# that point into a shared list of categories. Dates are stored as
+# their proleptic Gregorian ordinal.
+TYPECODES = {
+    'int64': 'q',
+    'float64': 'd',
+    'bool': 'b',
+    'str': 'l',
+    'date': 'l',
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y')
+BOOLEAN_STRINGS = {'True': True, 'False': False, 'true': True, 'false': False}
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def infer_dtype(values):
+    '''
+    Picks the narrowest dtype that can hold every value in a column.
+
+    Input:
+      values - any iterable of python values
+
+    Output:
+      one of 'int64', 'float64', 'bool', 'str', 'date' or 'object'
+
+    Modifies:
+      Nothing
+    '''
+    dtype = None
+    for value in values:
+        value_type = type(value)
+        if value_type is bool:
+            found = 'bool'
+        elif value_type is int:
+            found = 'int64' if INT64_MIN <= value <= INT64_MAX else 'object'
+        elif value_type is float:
+            found = 'float64'
+        elif value_type is str:
+            found = 'str'
+        elif value_type is date:
+            found = 'date'
+        else:
+            return 'object'
+
+        if dtype is None or dtype == found:
+            dtype = found
+        elif {dtype, found} == {'int64', 'float64'}:
+            dtype = 'float64'
+        else:
+            return 'object'
+    return dtype or 'object'
+
+
+def infer_string_dtype(strings):
+    '''
+    Guesses which dtype a column read from a csv should be parsed into,
+    looking only at the sample of strings it is given.
+    Dates are never guessed, because plenty of code slices them as text;
+    ask for them explicitly with dtypes={'Period Start': 'date'}.
+
+    Input:
+      strings - a sample of the raw strings in one column
+
+    Output:
+      one of 'int64', 'float64', 'bool' or 'str'
+
+    Modifies:
+      Nothing
+    '''
+    candidates = ['int64', 'float64', 'bool']
+    for string in strings:
+        if 'int64' in candidates and not _looks_like_int(string):
+            candidates.remove('int64')
+        if 'float64' in candidates and not _looks_like_float(string):
+            candidates.remove('float64')
+        if 'bool' in candidates and string not in BOOLEAN_STRINGS:
+            candidates.remove('bool')
+        if not candidates:
+            return 'str'
+    return candidates[0] if strings else 'str'
+
+
+def _looks_like_int(string):
+    # Whole numbers too big for an int64 buffer stay text
+    try:
+        value = int(string)
+    except (TypeError, ValueError):
+        return False
+    return str(value) == string and INT64_MIN <= value <= INT64_MAX
+
+
+def _looks_like_float(string):
+    # Whole numbers with leading zeros (zip codes, ids) stay text
+    if string.lstrip('-').isdigit():
+        return _looks_like_int(string)
+    try:
+        float(string)
+    except (TypeError, ValueError):
+        return False
+    return '_' not in string and string.strip() == string
+
+
+def parse_strings(strings, dtype):
+    '''
+    Turns a whole column of raw csv strings into a Column in one go,
+    instead of casting one value at a time inside assign lambdas.
+
+    Inputs:
+      strings - a list of the raw strings in one column
+      dtype - the dtype to parse into; 'date' also accepts
+              ('date', format) to pick a strptime format
+
+    Outputs:
+      a Column of that dtype
+
+    Modifies:
+      Nothing
+
+    Raises:
+      ValueError when a string can't be parsed into the dtype
+    '''
+    date_formats = DATE_FORMATS
+    if isinstance(dtype, tuple):
+        dtype, date_format = dtype
+        date_formats = (date_format,)
+
+    if dtype == 'int64':
+        try:
+            return Column('int64', array('q', map(int, strings)))
+        except OverflowError:
+            raise ValueError("a value is outside the int64 range") from None
+    if dtype == 'float64':
+        return Column('float64', array('d', map(float, strings)))
+    if dtype == 'bool':
+        try:
+            return Column('bool', array('b', map(BOOLEAN_STRINGS.__getitem__, strings)))
+        except KeyError as error:
+            raise ValueError(f"{error} is not a boolean") from None
+    if dtype == 'date':
+        # Dates repeat a lot in real extracts, so each distinct
+        # string only goes through strptime once.
+        ordinals = {}
+        data = array('l')
+        for string in strings:
+            ordinal = ordinals.get(string)
+            if ordinal is None:
+                ordinal = ordinals[string] = _parse_date(string, date_formats)
+            data.append(ordinal)
+        return Column('date', data)
+    if dtype == 'str':
+        # Number the distinct strings first, then look every row up
+        # in one pass that never leaves C
+        codes = dict.fromkeys(strings)
+        if None not in codes:
+            categories = list(codes)
+            codes.update(zip(categories, range(len(categories))))
+            return Column('str', array('l', map(codes.__getitem__, strings)), categories)
+    return Column.from_values(strings, dtype=dtype)
+
+
+def parse_string(string, dtype):
+    '''Parses a single raw csv string the same way parse_strings would.'''
+    date_formats = DATE_FORMATS
+    if isinstance(dtype, tuple):
+        dtype, date_format = dtype
+        date_formats = (date_format,)
+
+    if dtype == 'int64':
+        value = int(string)
+        if not INT64_MIN <= value <= INT64_MAX:
+            raise ValueError(f"{string!r} is outside the int64 range")
+        return value
+    if dtype == 'float64':
+        return float(string)
+    if dtype == 'bool':
+        if string not in BOOLEAN_STRINGS:
+            raise ValueError(f"{string!r} is not a boolean")
+        return BOOLEAN_STRINGS[string]
+    if dtype == 'date':
+        return date.fromordinal(_parse_date(string, date_formats))
+    return string
+
+
+def _parse_date(string, date_formats):
+    for date_format in date_formats:
+        try:
+            return datetime.strptime(string, date_format).toordinal()
+        except (TypeError, ValueError):
+            pass
+    raise ValueError(f"{string!r} does not match any of {date_formats}")
+
+
+class Column():
+    '''
+    One column of a DataFrame, kept in a single typed buffer.
+
+    Numbers and booleans live in an array.array, strings live in an
+    array of integer codes plus a list of the distinct strings, and
+    anything else falls back to a plain python list.
+
+    A column can also be a view: it reads another column's buffer through
+    a selection vector of row positions instead of holding values of its
+    own. Buffers that are shared like this are copied before they are
+    written to (copy-on-write), so neither side ever sees the other change.
+    '''
+    def __init__(self, dtype, data, categories=None, selection=None):
+        self.dtype = dtype
+        self._data = data
+        self._categories = categories
+        self._selection = selection
+        # _shared: another column reads this buffer, so it is copied
+        # before a value is overwritten. _shared_whole: one of them reads
+        # it without a selection vector, so it would also see rows added
+        # to the end, and appending has to copy too.
+        self._shared = False
+        self._shared_whole = False
+        if dtype == 'str':
+            self._codes = {category: code for code, category in enumerate(categories)}
+
+    # Ways to create an instance
+    @classmethod
+    def from_values(cls, values, dtype=None):
+        if isinstance(values, Column) and dtype in (None, values.dtype):
+            return values.copy()
+        if not isinstance(values, (list, tuple)):
+            values = list(values)
+        if dtype is None:
+            dtype = infer_dtype(values)
+
+        if dtype == 'str':
+            column = cls('str', array('l'), [])
+            column.extend(values)
+            return column
+        if dtype == 'object':
+            return cls('object', list(values))
+        if dtype == 'date':
+            return cls('date', array('l', [value.toordinal() for value in values]))
+        return cls(dtype, array(TYPECODES[dtype], values))
+
+    # Properties
+    @property
+    def categories(self):
+        return self._categories
+
+    def __len__(self):
+        if self._selection is not None:
+            return len(self._selection)
+        return len(self._data)
+
+    def __iter__(self):
+        raw = self._raw()
+        if self.dtype == 'str':
+            return map(self._categories.__getitem__, raw)
+        if self.dtype == 'bool':
+            return map(bool, raw)
+        if self.dtype == 'date':
+            return map(date.fromordinal, raw)
+        return raw
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.view(range(len(self))[index])
+        if self._selection is not None:
+            index = self._selection[index]
+        value = self._data[index]
+        if self.dtype == 'str':
+            return self._categories[value]
+        if self.dtype == 'bool':
+            return bool(value)
+        if self.dtype == 'date':
+            return date.fromordinal(value)
+        return value
+
+    def __repr__(self):
+        return f"Column(dtype={self.dtype!r}, length={len(self)})"
+
+    def _raw(self):
+        # The buffer's entries (codes, ordinals...) in row order
+        if self._selection is None:
+            return iter(self._data)
+        return map(self._data.__getitem__, self._selection)
+
+    # Methods for reading the buffer
+    def to_list(self):
+        return list(self)
+
+    def view(self, indices):
+        '''
+        A lightweight column over some of this column's rows. Nothing is
+        copied except the list of positions.
+
+        Input:
+          indices - an iterable of integer row positions (or an array('l'),
+                    which is used as is)
+
+        Output:
+          a new Column that shares this column's buffer
+
+        Modifies:
+          Marks this column's buffer as shared.
+        '''
+        if not isinstance(indices, array):
+            indices = array('l', indices)
+        if self._selection is not None:
+            indices = array('l', map(self._selection.__getitem__, indices))
+        return self._sharing(indices)
+
+    def share(self):
+        '''A second column object over the same buffer and the same rows.'''
+        return self._sharing(self._selection)
+
+    def _sharing(self, selection):
+        column = Column.__new__(Column)
+        column.__dict__.update(self.__dict__)
+        column._selection = selection
+        column._shared = self._shared = True
+        if selection is None:
+            column._shared_whole = self._shared_whole = True
+        return column
+
+    def take(self, indices):
+        '''
+        Builds a new column out of the values at the given positions.
+
+        Input:
+          indices - an iterable of integer row positions
+
+        Output:
+          a new Column with the same dtype
+
+        Modifies:
+          Nothing
+        '''
+        if self._selection is not None:
+            indices = map(self._selection.__getitem__, indices)
+        data = self._data
+        if self.dtype == 'object':
+            return Column('object', [data[i] for i in indices])
+        taken = array(TYPECODES[self.dtype], [data[i] for i in indices])
+        return Column(self.dtype, taken, self._categories and list(self._categories))
+
+    def factorize(self):
+        '''
+        Numbers the distinct values of the column in order of first
+        appearance. String columns reuse their dictionary codes, so
+        only small integers get hashed.
+
+        Input:
+          None
+
+        Output:
+          codes - an array holding the number of each row's value
+          uniques - the distinct values, indexed by their number
+
+        Modifies:
+          Nothing
+        '''
+        if self.dtype == 'str':
+            # The codes only need renumbering when they are not already
+            # in order of first appearance (views, unused categories)
+            order = list(dict.fromkeys(self._raw()))
+            uniques = [self._categories[code] for code in order]
+            if order == list(range(len(order))):
+                return array('l', self._raw()), uniques
+            renumber = {code: number for number, code in enumerate(order)}
+            return array('l', map(renumber.__getitem__, self._raw())), uniques
+
+        values = iter(self)
+        lookup = {}
+        uniques = []
+        codes = array('l')
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(uniques)
+                uniques.append(value)
+            codes.append(code)
+        return codes, uniques
+
+    def sort_keys(self, descending=False):
+        '''
+        A list of keys, one per row, that order the same way as the
+        column's values but are cheap to compare: strings are replaced by
+        their rank among the categories, dates by their ordinal, and
+        missing values (None) in object columns sort last.
+
+        Input:
+          descending - True when the keys will be sorted largest first
+                       (reverse=True), so None still ends up last
+
+        Output:
+          a list of sort keys in row order
+
+        Modifies:
+          Nothing
+        '''
+        if self.dtype == 'str':
+            categories = self._categories
+            ranks = [0] * len(categories)
+            for rank, code in enumerate(sorted(range(len(categories)), key=categories.__getitem__)):
+                ranks[code] = rank
+            return list(map(ranks.__getitem__, self._raw()))
+        if self.dtype == 'object':
+            if descending:
+                return [(value is not None, value) for value in self._raw()]
+            return [(value is None, value) for value in self._raw()]
+        return list(self._raw())
+
+    def copy(self):
+        categories = self._categories
+        if self.dtype == 'object':
+            data = list(self._raw())
+        elif self._selection is None and isinstance(self._data, array):
+            data = self._data[:]
+        else:
+            data = array(TYPECODES[self.dtype], self._raw())
+        return Column(
+            self.dtype,
+            data,
+            list(categories) if categories is not None else None
+        )
+
+    def _make_private(self, appending=False):
+        # Copy-on-write: take a private copy of a shared (or memory-mapped,
+        # read-only) buffer before writing. Views only read the rows in
+        # their selection vectors, so adding rows to the end doesn't
+        # disturb them (new categories do show up in their category list).
+        shared = self._shared_whole if appending else self._shared
+        if shared or self._selection is not None or \
+                isinstance(self._data, memoryview):
+            private = self.copy()
+            self._data = private._data
+            self._categories = private._categories
+            self._selection = None
+            self._shared = False
+            self._shared_whole = False
+            if self.dtype == 'str':
+                self._codes = private._codes
+
+    # Methods for changing the buffer
+    def __setitem__(self, index, value):
+        '''
+        Overwrites the value at one row position, widening the dtype
+        like extend does when the value does not fit.
+
+        Inputs:
+          index - the row position
+          value - the new python value
+
+        Output:
+          None
+
+        Modifies:
+          Modifies the column in place.
+        '''
+        self._make_private()
+        incoming = infer_dtype([value])
+        if incoming != self.dtype:
+            self._widen(incoming)
+
+        if self.dtype == 'str':
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self._categories)
+                self._categories.append(value)
+            value = code
+        elif self.dtype == 'date':
+            value = value.toordinal()
+        self._data[index] = value
+
+    def append(self, value):
+        self.extend((value,))
+
+    def extend(self, values):
+        '''
+        Adds values to the end of the column, widening the dtype
+        (int64 -> float64 -> object) when a value does not fit.
+
+        Input:
+          values - an iterable of python values, or another Column,
+                   whose buffer is appended without going through
+                   python values when the dtypes match
+
+        Output:
+          None
+
+        Modifies:
+          Modifies the column in place.
+        '''
+        if isinstance(values, Column) and values.dtype == self.dtype and self.dtype != 'object':
+            if values is self:
+                values = values.copy()
+            self._make_private(appending=True)
+            if self.dtype == 'str':
+                # Translate the other column's codes into this one's
+                codes = self._codes
+                categories = self._categories
+                remap = []
+                for category in values.categories:
+                    code = codes.get(category)
+                    if code is None:
+                        code = codes[category] = len(categories)
+                        categories.append(category)
+                    remap.append(code)
+                self._data.extend(map(remap.__getitem__, values._raw()))
+            elif values._selection is None and isinstance(values._data, array) and \
+                    values._data.typecode == self._data.typecode:
+                # Straight buffer to buffer, without python values
+                self._data.extend(values._data)
+            else:
+                self._data.extend(values._raw())
+            return
+        if not isinstance(values, (list, tuple)):
+            values = list(values)
+        self._make_private(appending=True)
+        incoming = infer_dtype(values)
+        if values and incoming != self.dtype:
+            self._widen(incoming)
+
+        if self.dtype == 'str':
+            codes = self._codes
+            categories = self._categories
+            for value in dict.fromkeys(values):
+                if value not in codes:
+                    codes[value] = len(categories)
+                    categories.append(value)
+            self._data.extend(map(codes.__getitem__, values))
+        elif self.dtype == 'date':
+            self._data.extend([value.toordinal() for value in values])
+        else:
+            self._data.extend(values)
+
+    def _extend_strings(self, strings):
+        # Adds raw strings to a str column, numbering any new ones in
+        # this column's dictionary directly. Returns False, having added
+        # nothing, when there are missing values (None) among them.
+        uniques = dict.fromkeys(strings)
+        if None in uniques:
+            return False
+        self._make_private(appending=True)
+        codes = self._codes
+        categories = self._categories
+        for value in uniques:
+            if value not in codes:
+                codes[value] = len(categories)
+                categories.append(value)
+        self._data.extend(map(codes.__getitem__, strings))
+        return True
+
+    def _widen(self, incoming):
+        if self.dtype == 'int64' and incoming == 'float64' or \
+                len(self) == 0 and incoming != 'object':
+            replacement = Column.from_values(list(self), dtype=incoming)
+        elif self.dtype == 'float64' and incoming == 'int64':
+            return
+        else:
+            replacement = Column('object', list(self))
+        self.dtype = replacement.dtype
+        self._data = replacement._data
+        self._categories = replacement._categories
+        if self.dtype == 'str':
+            self._codes = replacement._codes
@@ -1,79 +1,456 @@
 import csv
-from phoenixcel.src.series import Series
-from phoenixcel.src.groupby import GroupBy
+import heapq
+from array import array
+from itertools import chain, compress, count, islice
+from phoenixcel.src import parallel, storage
+from phoenixcel.src.column import Column, infer_string_dtype, parse_string, parse_strings
+from phoenixcel.src.expressions import Expr
+from phoenixcel.src.series import Categorical, Series
+from phoenixcel.src.groupby import GroupBy, MaterializedGroupBy, plan_aggregations, results_from_states
+from phoenixcel.src.index import INDEX_KINDS
+from phoenixcel.src.join import HOW, can_merge, hash_join, merge_join
+from phoenixcel.src.lazy import CsvScan, LazyFrame, columns_read
+
+
+def _gather(column, positions):
+    # A view when every position is real, otherwise a new column with None gaps
+    if None not in positions:
+        return column.view(positions)
+    return Column.from_values([
+        column[position] if position is not None else None for position in positions
+    ])
+
+
+def _column_condition(key, predicate):
+    return lambda row: predicate(row[key])
+
+
+# Every change to a column gets a new number from here, so a cached
+# derived column can tell whether what it was computed from has changed
+_VERSIONS = count(1)
+
+
+def _fingerprint(func):
+    # What makes two row functions compute the same thing: their code,
+    # default arguments, the values they closed over and, for methods,
+    # the object they are bound to. None when those can't be used as a
+    # dictionary key.
+    bound = getattr(func, '__self__', None)
+    func = getattr(func, '__func__', func)
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return None
+    try:
+        cells = tuple(cell.cell_contents for cell in func.__closure__ or ())
+        fingerprint = (code, func.__defaults__, cells, bound)
+        hash(fingerprint)
+    except (TypeError, ValueError):
+        return None
+    return fingerprint
+
+
+# How many csv rows are turned into column buffers at a time
+PARSE_BATCH_SIZE = 65536
+
+
+class _WrongGuess(Exception):
+    # Inferred dtypes didn't fit values further down the file; the
+    # columns have to be read again as text
+    def __init__(self, keys):
+        super().__init__(keys)
+        self.keys = keys
+
+
+def _parse_cell(string, key, column_schema):
+    # Predicates see parsed values. Falling back to the raw string when a
+    # guessed dtype doesn't fit would hand the predicate a different type
+    # for some rows (and for all of them once the column is read again as
+    # text), so a wrong guess under a predicate is an error instead.
+    dtype, requested = column_schema
+    try:
+        return parse_string(string, dtype)
+    except (TypeError, ValueError):
+        if requested:
+            raise
+        raise ValueError(
+            f"column {key!r} was guessed to be {dtype} but holds {string!r}, and a where "
+            f"condition reads it; pass dtypes={{{key!r}: ...}} to say how to parse it"
+        ) from None
+
 
 class DataFrame():
     def __init__(self):
         self._dictionary = {}
-        self._list = []
+        self._indexes = {}
+        # Objects (like MaterializedGroupBy) told about appends and updates
+        self._listeners = []
+        # Column header -> version, and assign_columns(cache=True)'s derived columns:
+        # fingerprint -> (columns read, their versions, the column)
+        self._versions = {}
+        self._derived = {}
 
     # Ways to crate an instance
     @classmethod
-    def from_csv(cls, file_path):
-        df = cls()
-        header_unread = True
+    def from_csv(cls, file_path, dtypes=None, infer_schema=True, sample_size=1000,
+                 usecols=None, where=None):
+        '''
+        Reads a csv file into a new dataframe, parsing each column
+        into a typed buffer once, at load time.
 
-        with open(file_path) as f:
-            reader = csv.DictReader(f)
+        Inputs:
+          file_path - the path to the csv file
+          dtypes - optional {column: dtype} for columns whose type you
+                   already know, e.g. {'Period Start': ('date', '%m/%d/%Y')}
+          infer_schema - when True, guess the other columns' dtypes from
+                         the first sample_size rows; otherwise keep them as str
+          sample_size - how many rows the guess looks at
+          usecols - optional list of the only columns to keep
+          where - optional {column: predicate}; a row is only kept if every
+                  predicate returns True for that row's (parsed) value.
+                  Rows and columns that are left out are never stored.
+                  Raises ValueError if a guessed dtype of one of these
+                  columns turns out not to fit; give it in dtypes.
 
-            for row in reader:
-                if header_unread:
-                    for key in row.keys():
-                        df._dictionary[key] = Series()
-                    header_unread = False
-                
-                df._list.append(row)
+        Outputs:
+          A new DataFrame
+
+        Modifies:
+          Nothing
+        '''
+        conditions = []
+        for key, predicate in (where or {}).items():
+            conditions.append(([key], _column_condition(key, predicate)))
+        return cls._read_csv(file_path, dtypes, infer_schema, sample_size, usecols, conditions)
 
-                for key in row.keys():
-                    df._dictionary[key].append(row[key])
+    @classmethod
+    def scan_csv(cls, file_path, dtypes=None, infer_schema=True, sample_size=1000):
+        '''
+        Starts a lazy pipeline over a csv file. When it is collected,
+        leading wheres are checked while the file is parsed and only the
+        columns the pipeline uses are kept.
+
+        Inputs:
+          file_path, dtypes, infer_schema, sample_size - as in from_csv
 
-            for key in list(df._dictionary.keys()):
-                setattr(df, key.lower().replace(" ", "_"), df._dictionary[key])
+        Outputs:
+          A new LazyFrame
+
+        Modifies:
+          Nothing
+        '''
+        return LazyFrame(CsvScan(cls, file_path, dtypes, infer_schema, sample_size))
+
+    @classmethod
+    def read_csv_chunks(cls, file_path, chunk_size=10000, dtypes=None,
+                        infer_schema=True, sample_size=1000, usecols=None, where=None):
+        '''
+        Reads a csv file a few rows at a time, so files bigger than
+        memory can still go through a where/assign/group_by pipeline.
+        The schema is worked out on the first chunk and reused for the rest.
+        When a guessed dtype turns out not to fit a later chunk, that
+        column is read as text from that chunk on; chunks already yielded
+        keep the guessed dtype. Pass dtypes to avoid this.
+
+        Inputs:
+          file_path - the path to the csv file
+          chunk_size - the most rows of the file any one dataframe comes from
+          dtypes, infer_schema, sample_size, usecols, where - as in from_csv
+
+        Outputs:
+          A generator of DataFrames, one per chunk_size rows of the file
+
+        Modifies:
+          Nothing
+        '''
+        if chunk_size < 1:
+            raise ValueError("chunk_size has to be at least 1")
+        conditions = []
+        for key, predicate in (where or {}).items():
+            conditions.append(([key], _column_condition(key, predicate)))
+
+        with open(file_path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            schema = None
+            while True:
+                chunk = list(islice(reader, chunk_size))
+                if not chunk:
+                    return
+                if schema is None:
+                    schema = cls._csv_schema(
+                        header, chunk, dtypes, infer_schema, sample_size, usecols, conditions
+                    )
+                yield cls._chunk_from_csv_rows(header, chunk, schema, usecols, conditions)
+
+    @classmethod
+    def _read_csv(cls, file_path, dtypes, infer_schema, sample_size, usecols, conditions):
+        # conditions is a list of (columns, function of a row holding those columns)
+        schema = None
+        while True:
+            with open(file_path, newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                sample = list(islice(reader, sample_size))
+                if schema is None:
+                    schema = cls._csv_schema(
+                        header, sample, dtypes, infer_schema, sample_size, usecols, conditions
+                    )
+                try:
+                    return cls._from_csv_rows(header, chain(sample, reader), schema, usecols, conditions)
+                except _WrongGuess as wrong:
+                    # Every wrong guess is found in one pass, so the file
+                    # is read at most twice
+                    for key in wrong.keys:
+                        schema[key] = ('str', False)
+
+    @classmethod
+    def _chunk_from_csv_rows(cls, header, chunk, schema, usecols, conditions):
+        # A wrong guess turns the column into text in the shared schema,
+        # so this chunk and every later one read it the same way
+        try:
+            return cls._from_csv_rows(header, chunk, schema, usecols, conditions)
+        except _WrongGuess as wrong:
+            for key in wrong.keys:
+                schema[key] = ('str', False)
+            return cls._from_csv_rows(header, chunk, schema, usecols, conditions)
+
+    @staticmethod
+    def _csv_schema(header, rows, dtypes, infer_schema, sample_size,
+                    usecols=None, conditions=()):
+        # Maps each column that will be read to (dtype, whether the user asked for it)
+        dtypes = dtypes or {}
+        wanted = set(header if usecols is None else usecols)
+        for keys, _ in conditions:
+            wanted.update(keys)
+        unknown = [key for key in list(dtypes.keys()) + list(wanted) if key not in header]
+        if unknown:
+            raise KeyError(f"these columns are not in the csv: {unknown}")
+
+        schema = {}
+        sample = rows[:sample_size]
+        for position, key in enumerate(header):
+            if key not in wanted:
+                continue
+            if key in dtypes:
+                schema[key] = (dtypes[key], True)
+            elif infer_schema:
+                strings = [row[position] for row in sample if position < len(row)]
+                schema[key] = (infer_string_dtype(strings), False)
+            else:
+                schema[key] = ('str', False)
+        return schema
+
+    @classmethod
+    def _from_csv_rows(cls, header, rows, schema, usecols=None, conditions=()):
+        # Rows are parsed a batch at a time and appended to typed
+        # buffers, so only one batch of raw strings is ever held at once.
+        df = cls()
+        keys = [key for key in header if usecols is None or key in usecols]
+        positions = [header.index(key) for key in keys]
+        tests = [
+            ([(key, header.index(key)) for key in condition_keys], condition)
+            for condition_keys, condition in conditions
+        ]
+        columns = {key: None for key in keys}
+        wrong = []
+
+        rows = iter(rows)
+        width = len(header)
+        while True:
+            # Each row is spread over one list of strings per column as
+            # soon as it is read. Keeping a batch of row lists around
+            # instead made the garbage collector walk them over and over.
+            batch = [[] for _ in keys]
+            appends = [strings.append for strings in batch]
+            read = kept = 0
+            for row in islice(rows, PARSE_BATCH_SIZE):
+                read += 1
+                if len(row) != width:
+                    row = (row + [None] * width)[:width]
+                if tests and not all(
+                    condition({key: _parse_cell(row[position], key, schema[key]) for key, position in cells})
+                    for cells, condition in tests
+                ):
+                    continue
+                kept += 1
+                for append, position in zip(appends, positions):
+                    append(row[position])
+            if not read:
+                break
+            if not kept:
+                continue
+
+            for key, strings in zip(keys, batch):
+                if key in wrong:
+                    continue
+                dtype, requested = schema[key]
+                column = columns[key]
+                if dtype == 'str' and column is not None and column.dtype == 'str' and \
+                        column._extend_strings(strings):
+                    # Numbered in the column's own dictionary, with no
+                    # batch dictionary to translate
+                    continue
+                try:
+                    parsed = parse_strings(strings, dtype)
+                except (TypeError, ValueError):
+                    # A guess made from the sample can be wrong further down
+                    # the file; only a dtype the caller asked for is binding.
+                    # Keep going to find any other wrong guesses.
+                    if requested:
+                        raise
+                    wrong.append(key)
+                    continue
+                if column is None:
+                    columns[key] = parsed
+                else:
+                    column.extend(parsed)
+
+        if wrong:
+            raise _WrongGuess(wrong)
+        for key, column in columns.items():
+            if column is None:
+                columns[key] = parse_strings([], schema[key][0])
+        df._dictionary.update(columns)
         return df
 
+    @classmethod
+    def open(cls, file_path):
+        '''
+        Opens a dataframe written by save(). The file is memory-mapped,
+        so opening it is nearly instant no matter how big it is, and
+        only the columns you touch are ever read from disk.
+
+        Input:
+          file_path - the file to open
+
+        Output:
+          A new DataFrame
+
+        Modifies:
+          Nothing
+        '''
+        return storage.load(cls, file_path)
+
     @classmethod
     def from_rows(cls, rows):
         df = cls()
         for key in rows[0].keys():
-            df._dictionary[key] = Series()
-        for row in rows:
-            for key in rows[0].keys():
-                df._dictionary[key].append(row[key])
-        
-            df._list.append(row)
-
-        for key in list(df._dictionary.keys()):
-            setattr(df, key.lower().replace(" ", "_"), df._dictionary[key])
-
+            df._dictionary[key] = Column.from_values([row[key] for row in rows])
         return df
 
     @classmethod
     def from_dictionary(cls, dictionary):
         df = cls()
-        df._dictionary = dictionary
-        for i in range(len(dictionary[list(dictionary.keys())[0]])):
-            item = {}
-            for key in dictionary.keys():
-                item[key] = dictionary[key][i]
-            df._list.append(item)
+        for key, values in dictionary.items():
+            df._dictionary[key] = Column.from_values(values)
+        lengths = {key: len(column) for key, column in df._dictionary.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"columns have different lengths: {lengths}")
+        return df
 
-        for key in list(df._dictionary.keys()):
-            setattr(df, key.lower().replace(" ", "_"), df._dictionary[key])
+    def save(self, file_path):
+        '''
+        Writes the dataframe to a binary file, one contiguous buffer per
+        column, that DataFrame.open can map back in without parsing.
 
-        return df
+        Input:
+          file_path - where to write the file
+
+        Output:
+          None
+
+        Modifies:
+          Creates or overwrites file_path.
+        '''
+        storage.save(self, file_path)
 
     # Properties
     @property
     def shape(self):
-        return \
-            len(self._dictionary.keys()), \
-            len(self._dictionary[list(self._dictionary.keys())[0]])
+        return len(self._dictionary.keys()), len(self)
 
     @property
     def columns(self):
         return list(self._dictionary.keys())
 
+    @property
+    def _list(self):
+        '''
+        The rows of the dataframe as a list of dictionaries.
+        Built on demand from the column buffers, so prefer _rows()
+        when you only need to walk over them once.
+        '''
+        return list(self._rows())
+
+    def __len__(self):
+        for column in self._dictionary.values():
+            return len(column)
+        return 0
+
+    def _rows(self, keys=None):
+        # keys narrows each row down to the columns a caller will read
+        if keys is None:
+            keys = list(self._dictionary.keys())
+        if not keys:
+            # Nothing to read, but every row is still there
+            for _ in range(len(self)):
+                yield {}
+            return
+        columns = [self._dictionary[key] for key in keys]
+        for values in zip(*columns):
+            yield dict(zip(keys, values))
+
+    def _select(self, keys=None):
+        # A new dataframe over some of this one's columns, sharing their buffers
+        if keys is None:
+            keys = self._dictionary.keys()
+        df = DataFrame()
+        for key in keys:
+            df._dictionary[key] = self._dictionary[key].share()
+        return df
+
+    def _take(self, indices):
+        # A new dataframe that views the given rows of this one. Every
+        # column gets the same selection vector; nothing else is copied.
+        indices = array('l', indices)
+        composed = {}
+        df = DataFrame()
+        for key, column in self._dictionary.items():
+            parent = column._selection
+            if parent is not None and id(parent) not in composed:
+                composed[id(parent)] = column.view(indices)._selection
+            selection = indices if parent is None else composed[id(parent)]
+            df._dictionary[key] = column._sharing(selection)
+        return df
+
+    # Columns are reachable as attributes, e.g. df.period_start
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        for key in self._dictionary.keys():
+            if key.lower().replace(" ", "_") == name:
+                return self[key]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
     # Methods for getting a column in the dictionary
+    def column(self, item):
+        '''
+        Get a read-only view of a column, without copying its values.
+
+        Input:
+          item - the column header
+
+        Output:
+          the column's Column, which can be indexed, sliced (giving
+          another view), iterated over and measured with len()
+
+        Modifies:
+          Nothing
+        '''
+        return self._dictionary[item].share()
+
     def __getitem__(self, item):
         '''
         Get a reference to a column in the dataframe.
@@ -82,12 +459,19 @@ class DataFrame():
           item - the column header
 
         Output:
-          the column, which is a series
+          the column, which is a series; string columns come back as a
+          Categorical series built from a copy of the dataframe's codes,
+          and number columns keep a (copy-on-write) share of their buffer
 
         Modifies:
           Nothing
         '''
-        return Series(self._dictionary[item])
+        column = self._dictionary[item]
+        if column.dtype == 'str':
+            return Categorical.from_codes(column._raw(), list(column.categories))
+        if column.dtype in ('int64', 'float64'):
+            return Series.from_column(column)
+        return Series(column)
 
     # Method for setting a column in the dictionary
     def __setitem__(self, key, value):
@@ -101,27 +485,551 @@ class DataFrame():
         Outputs:
           None
 
+        Modifies:
+          Modifies the dataframe object in place. Raises ValueError when
+          value doesn't have one entry per row.
+        '''
+        if isinstance(value, Categorical) and \
+                all(type(category) is str for category in value.categories):
+            # Already encoded: keep the codes instead of hashing every string
+            column = Column('str', array('l', value.codes), list(value.categories))
+        else:
+            column = Column.from_values(value)
+        self._replace_column(key, column)
+
+    def _replace_column(self, key, column):
+        for other_key, other in self._dictionary.items():
+            if other_key != key:
+                if len(other) != len(column):
+                    raise ValueError(
+                        f"column {key!r} has {len(column)} rows but the dataframe has {len(other)}"
+                    )
+                break
+        self._dictionary[key] = column
+        self._changed([key])
+        if key in self._indexes:
+            self.create_index(key, kind=self._indexes[key].kind)
+        for listener in list(self._listeners):
+            listener.column_replaced(self, key)
+
+    def _changed(self, keys, rows_added=False):
+        # New versions for the columns, and cached derived columns
+        # computed from them are dropped. New rows make every cached
+        # column too short, including those that read no columns.
+        for key in keys:
+            self._versions[key] = next(_VERSIONS)
+        if rows_added:
+            self._derived = {}
+            return
+        self._derived = {
+            fingerprint: entry for fingerprint, entry in self._derived.items()
+            if entry[0] is not None and not entry[0].intersection(keys)
+        }
+
+    def update_row(self, position, values):
+        '''
+        Changes some of the values in one row.
+
+        Inputs:
+          position - the row position
+          values - a dictionary of column header -> new value
+
+        Outputs:
+          None
+
+        Modifies:
+          Modifies the dataframe object in place; indexes and
+          materialized group summaries are updated for just this row.
+        '''
+        unknown = values.keys() - self._dictionary.keys()
+        if unknown:
+            raise KeyError(f"these columns are not in the dataframe: {sorted(unknown)}")
+        if not -len(self) <= position < len(self):
+            raise IndexError("row position out of range")
+        position %= len(self)
+
+        old = {}
+        for key, value in values.items():
+            column = self._dictionary[key]
+            old[key] = column[position]
+            column[position] = value
+            if key in self._indexes:
+                self._indexes[key].replace(position, old[key], value)
+        self._changed(values.keys())
+        for listener in list(self._listeners):
+            listener.row_updated(self, position, old)
+
+    # Methods for adding rows
+    def append_rows(self, rows):
+        '''
+        Adds rows to the end of the dataframe. Each column buffer grows
+        in place, so an append costs about as much as the new rows, and
+        indexes only take in the new rows instead of being rebuilt.
+
+        Input:
+          rows - an iterable of row dictionaries; a column a row leaves
+                 out is None for that row
+
+        Output:
+          This dataframe, so calls can be chained
+
         Modifies:
           Modifies the dataframe object in place.
+
+        Raises:
+          KeyError for a row holding a column the dataframe doesn't have
         '''
-        self._dictionary[key] = value
-        for index, item in enumerate(self._list):
-            item[key] = value[index]
+        rows = list(rows)
+        if not self._dictionary and rows:
+            for key in rows[0]:
+                self._dictionary[key] = Column.from_values([])
+        values = {key: [row.get(key) for row in rows] for key in self._dictionary}
+        self._extend({key for row in rows for key in row}, values, len(rows))
+        return self
 
-        setattr(self, key.lower().replace(" ", "_"), self._dictionary[key])
+    @classmethod
+    def concat(cls, frames):
+        '''
+        Stacks dataframes on top of each other.
+
+        Input:
+          frames - an iterable of DataFrames; the first one decides the
+                   columns, and a column a later one is missing is None
+                   in its rows
 
-    def where(self, condition):
-        rows = [row for row in self._list if condition(row)]
-        return DataFrame.from_rows(rows)
+        Output:
+          A new DataFrame; the frames themselves are left as they were
+
+        Modifies:
+          Nothing
+
+        Raises:
+          KeyError for a frame holding a column the first one doesn't have
+        '''
+        frames = list(frames)
+        df = cls()
+        if not frames:
+            return df
+        for key, column in frames[0]._dictionary.items():
+            df._dictionary[key] = column.copy()
+        for frame in frames[1:]:
+            df._extend(frame._dictionary.keys(), frame._dictionary, len(frame))
+        return df
+
+    def _extend(self, keys, columns, length):
+        # Appends `length` rows given as {header: values}, where the
+        # values may be a list or a whole Column
+        unknown = set(keys) - self._dictionary.keys()
+        if unknown:
+            raise KeyError(f"these columns are not in the dataframe: {sorted(unknown)}")
+        start = len(self)
+        for key, column in self._dictionary.items():
+            values = columns.get(key)
+            column.extend([None] * length if values is None else values)
+        self._changed(self._dictionary.keys(), rows_added=True)
+        for key, index in self._indexes.items():
+            values = columns.get(key)
+            index.extend(start, [None] * length if values is None else values)
+        for listener in list(self._listeners):
+            listener.rows_appended(self, start)
+
+    # Methods for indexed lookups
+    def create_index(self, column, kind='hash'):
+        '''
+        Builds an index on a column so lookup() (and, for a sorted index,
+        between()) can find rows without scanning the whole dataframe.
+        The index is rebuilt whenever the column is replaced.
+
+        Inputs:
+          column - the column header
+          kind - 'hash' for equality lookups in O(1), or 'sorted' for
+                 equality and range lookups in O(log n)
+
+        Outputs:
+          None
+
+        Modifies:
+          Adds the index to the dataframe.
+        '''
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"kind has to be one of {list(INDEX_KINDS)}")
+        self._indexes[column] = INDEX_KINDS[kind](self._dictionary[column])
+
+    def drop_index(self, column):
+        del self._indexes[column]
+
+    def lookup(self, column, value):
+        '''
+        The rows whose column equals value. Uses the column's index
+        when there is one and scans the column when there isn't.
+
+        Inputs:
+          column - the column header
+          value - the value to look for
+
+        Outputs:
+          A new DataFrame viewing the matching rows, in row order
+
+        Modifies:
+          Nothing
+        '''
+        index = self._indexes.get(column)
+        if index is None:
+            positions = [
+                position for position, found in enumerate(self._dictionary[column])
+                if found == value
+            ]
+        else:
+            positions = sorted(index.lookup(value))
+        return self._take(positions)
+
+    def between(self, column, low, high):
+        '''
+        The rows with low <= column <= high. Uses the column's sorted
+        index when there is one and scans the column when there isn't.
+
+        Inputs:
+          column - the column header
+          low, high - the ends of the range, both included
+
+        Outputs:
+          A new DataFrame viewing the matching rows, in row order
+
+        Modifies:
+          Nothing
+        '''
+        index = self._indexes.get(column)
+        if index is None or index.kind != 'sorted':
+            positions = [
+                position for position, found in enumerate(self._dictionary[column])
+                if found is not None and low <= found <= high
+            ]
+        else:
+            positions = sorted(index.between(low, high))
+        return self._take(positions)
+
+    def where(self, condition, workers=None):
+        '''
+        Keeps the rows for which condition(row) is truthy.
+
+        Inputs:
+          condition - a function of a row dictionary, or an expression
+                      such as col('days') > 3, which runs a column at a time
+          workers - optional number of processes to split the rows across;
+                    worth it when condition is slow and the frame is large
+
+        Outputs:
+          A new DataFrame viewing the matching rows
+
+        Modifies:
+          Nothing
+        '''
+        if isinstance(condition, Expr):
+            indices = list(compress(range(len(self)), condition._values(self)))
+        elif parallel.can_run_in_parallel(workers) and len(self) > 1:
+            indices = parallel.matching_indices(self, condition, workers)
+        else:
+            indices = [
+                index for index, row in enumerate(self._rows()) if condition(row)
+            ]
+        return self._take(indices)
 
     def assign(self, **kwargs):
-        for key, value in kwargs.items():
-            new_column = Series()
-            for row in self._list:
-                new_column.append(value(row))
-            self.__setitem__(key, new_column)
+        '''
+        Adds a column for every keyword, computed from each row.
+
+        Inputs:
+          kwargs - column header -> function of a row dictionary, or an
+                   expression such as col('Period Start').str[-4:]. Any
+                   header can be used; for options see assign_columns.
+
+        Outputs:
+          This dataframe, so calls can be chained
+
+        Modifies:
+          Modifies the dataframe object in place.
+        '''
+        return self.assign_columns(kwargs)
+
+    def assign_columns(self, columns, workers=None, cache=False):
+        '''
+        Adds a column for every entry of columns, like assign, with options.
+
+        Functions that don't read each other's columns are worked out
+        together in one pass over the rows (one process pool when workers
+        is given); one that reads a column added earlier in the same call
+        waits until that column is there, so later entries can build on
+        earlier ones.
+
+        Inputs:
+          columns - a dictionary of column header -> function of a row
+                    dictionary, or an expression
+          workers - optional number of processes to split the rows across;
+                    the functions then run in forked copies of this
+                    process, so side effects they have are not seen here
+          cache - when True, a function this dataframe has already
+                  computed, with the same code, defaults and closed-over
+                  values, reuses its column as long as none of the
+                  columns it reads has changed since. Only use it for
+                  functions that don't depend on anything else (globals,
+                  files, the time...)
+
+        Outputs:
+          This dataframe, so calls can be chained
+
+        Modifies:
+          Modifies the dataframe object in place.
+        '''
+        batch = []
+        for key, value in columns.items():
+            reads = columns_read(value)
+            if batch and (isinstance(value, Expr) or reads is None or
+                          reads.intersection(pending for pending, _, _ in batch)):
+                self._assign_batch(batch, workers)
+                batch = []
+
+            cached = None
+            if cache and not isinstance(value, Expr):
+                fingerprint = _fingerprint(value)
+                if fingerprint is not None:
+                    versions = self._versions_of(reads)
+                    entry = self._derived.get(fingerprint)
+                    if entry is not None and entry[1] == versions:
+                        # Reused in place, so columns keep their order
+                        self._assign_batch(batch, workers)
+                        batch = []
+                        self._replace_column(key, entry[2].share())
+                        continue
+                    cached = (fingerprint, reads, versions)
+
+            if isinstance(value, Expr):
+                self.__setitem__(key, value.evaluate(self))
+            else:
+                batch.append((key, value, cached))
+        self._assign_batch(batch, workers)
         return self
 
+    def _assign_batch(self, batch, workers):
+        # Computes row functions that don't read each other's columns
+        # in one pass, and remembers the ones assign_columns is caching
+        if not batch:
+            return
+        funcs = [func for _, func, _ in batch]
+        if parallel.can_run_in_parallel(workers) and len(self) > 1:
+            results = parallel.evaluate(self, funcs, workers)
+        else:
+            results = [Series() for _ in funcs]
+            for row in self._rows():
+                for values, func in zip(results, funcs):
+                    values.append(func(row))
+
+        for (key, _, cached), values in zip(batch, results):
+            self.__setitem__(key, values)
+            if cached is not None:
+                fingerprint, reads, versions = cached
+                self._derived[fingerprint] = (reads, versions, self._dictionary[key].share())
+
+    def _versions_of(self, keys):
+        # keys is None when a function might read any column. The row
+        # count is part of it, for functions that read no columns at all.
+        if keys is None:
+            keys = self._dictionary.keys()
+        return len(self), tuple(sorted((key, self._versions.get(key, 0)) for key in keys))
+
+    def sort_by(self, columns, descending=False):
+        '''
+        Orders the rows by one or more columns. The order is worked out
+        once as a permutation of row positions, and the new dataframe
+        views this one's buffers through it. Rows that tie keep their
+        current order (the sort is stable).
+
+        Inputs:
+          columns - a column header, or a list of them to sort by in turn
+          descending - True to sort largest first, or a list with one
+                       True/False per column
+
+        Outputs:
+          A new DataFrame with the rows in order
+
+        Modifies:
+          Nothing
+        '''
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        if isinstance(descending, bool):
+            descending = [descending] * len(columns)
+        if len(descending) != len(columns):
+            raise ValueError("descending needs one True/False per column")
+
+        order = list(range(len(self)))
+        # Sorting by the last key first and the first key last works
+        # because each pass keeps ties in the order the previous pass left.
+        for key, reverse in reversed(list(zip(columns, descending))):
+            order.sort(key=self._dictionary[key].sort_keys(reverse).__getitem__, reverse=reverse)
+        return self._take(order)
+
+    def top_k(self, columns, k, descending=True):
+        '''
+        The k rows with the largest (or smallest) values, found with a
+        heap of size k instead of sorting every row.
+
+        Inputs:
+          columns - a column header, or a list of them compared in turn
+          k - how many rows to keep
+          descending - True for the largest values, False for the smallest
+
+        Outputs:
+          A new DataFrame with those rows, best first; missing values
+          (None) count as the worst either way
+
+        Modifies:
+          Nothing
+        '''
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        if len(columns) == 1:
+            keys = self._dictionary[columns[0]].sort_keys(descending)
+        else:
+            keys = list(zip(*(self._dictionary[key].sort_keys(descending) for key in columns)))
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        return self._take(pick(k, range(len(self)), key=keys.__getitem__))
+
+    def nlargest(self, k, columns):
+        return self.top_k(columns, k, descending=True)
+
+    def nsmallest(self, k, columns):
+        return self.top_k(columns, k, descending=False)
+
+    def join(self, other, on, how='inner', method=None, suffix='_right'):
+        '''
+        Combines the rows of two dataframes that share a key.
+
+        Inputs:
+          other - the dataframe to join to this one
+          on - the key column (or list of key columns) both frames have
+          how - 'inner' keeps only rows with a match on both sides,
+                'left' keeps every row of this frame,
+                'outer' keeps every row of both frames
+          method - 'hash' builds a hash table on the smaller frame and
+                   probes it with the other; 'merge' walks two frames that
+                   are already sorted by the key, and raises ValueError
+                   when they aren't. By default 'merge' is used when
+                   both frames happen to be sorted.
+          suffix - added to columns of other whose names are already taken
+
+        Outputs:
+          A new DataFrame, in this frame's row order. Values missing
+          because a row had no match are None.
+
+        Modifies:
+          Nothing
+        '''
+        if how not in HOW:
+            raise ValueError(f"how has to be one of {HOW}")
+        on = [on] if isinstance(on, str) else list(on)
+        left_keys = self._join_keys(on)
+        right_keys = other._join_keys(on)
+        if method is None:
+            method = 'merge' if can_merge(left_keys, right_keys) else 'hash'
+        if method not in ('hash', 'merge'):
+            raise ValueError("method has to be 'hash' or 'merge'")
+        if method == 'merge' and not can_merge(left_keys, right_keys):
+            raise ValueError("method='merge' needs both frames sorted by the key")
+        join = merge_join if method == 'merge' else hash_join
+        left, right = join(left_keys, right_keys, how)
+
+        df = DataFrame()
+        for key, column in self._dictionary.items():
+            if key in on and how == 'outer':
+                other_column = other._dictionary[key]
+                df._dictionary[key] = Column.from_values([
+                    column[l] if l is not None else other_column[r]
+                    for l, r in zip(left, right)
+                ])
+            else:
+                df._dictionary[key] = _gather(column, left)
+        for key, column in other._dictionary.items():
+            if key in on:
+                continue
+            name = key + suffix if key in df._dictionary else key
+            df._dictionary[name] = _gather(column, right)
+        return df
+
+    def _join_keys(self, on):
+        if len(on) == 1:
+            return list(self._dictionary[on[0]])
+        return list(zip(*(self._dictionary[key] for key in on)))
+
+    def describe_by(self, column, *args, workers=None):
+        '''
+        Groups the dataframe and summarizes every group in one go, the
+        same as group_by(column).describe_with(*args), but without keeping
+        any rows per group. With workers, each process groups and partly
+        aggregates its own chunk of rows and the partial results are merged.
+
+        Inputs:
+          column - the column (or list of columns) to group on
+          args - describe_with style aggregation dictionaries; built-in
+                 aggregations plus 'aggregate' with a using_func
+          workers - optional number of processes to use
+
+        Outputs:
+          A GroupBy Description: group -> {"<column> <aggregation>": result}
+
+        Modifies:
+          Nothing
+        '''
+        by = [column] if isinstance(column, str) else list(column)
+        plans = plan_aggregations(args)
+        unplanned = [
+            aggregation['agg'] for position, aggregation in enumerate(args)
+            if not any(position in members for _, members in plans.values())
+        ]
+        if unplanned:
+            raise ValueError(f"describe_by can't compute {unplanned}; use group_by().describe_with()")
+
+        keys, states = parallel.grouped_states(
+            self, by, {key: states for key, (states, _) in plans.items()}, workers
+        )
+        results = results_from_states(args, plans, keys, states)
+        return GroupBy.description(args, results)
+
+    def materialize_by(self, column, *args):
+        '''
+        Groups the dataframe and keeps a summary of every group that
+        stays up to date as rows are appended (append_rows) or changed
+        (update_row), so refreshing it costs about as much as the rows
+        that changed rather than a whole new group_by.
+
+        Inputs:
+          column - the column (or list of columns) to group on
+          args - describe_with style aggregation dictionaries using
+                 sum, count, average/avg, min, max or spread
+
+        Outputs:
+          A MaterializedGroupBy; call .describe() for the current summary
+          and .close() once it is no longer needed
+
+        Modifies:
+          Registers the summary with the dataframe.
+        '''
+        by = [column] if isinstance(column, str) else list(column)
+        return MaterializedGroupBy(self, by, args)
+
+    def lazy(self):
+        '''
+        Starts a pipeline that is only planned, not run, until .collect()
+        is called, so it can be optimized as a whole first.
+
+        Input:
+          None
+
+        Output:
+          A new LazyFrame reading from this dataframe
+
+        Modifies:
+          Nothing
+        '''
+        return LazyFrame(self)
+
     def group_by(self, column):
         '''
         Returns an object that aggregates the items in the dataframe
@@ -130,7 +1038,8 @@ class DataFrame():
         phoenixcell's name pays tribute (Please don't sue me, Microsoft)
 
         Inputs:
-          column - the column on whose value the items should be grouped
+          column - the column on whose value the items should be grouped,
+                   or a list of columns to group on their combined values
 
         Outputs:
           A new GroupBy() object
@@ -138,12 +1047,5 @@ class DataFrame():
         Modifies:
           Nothing
         '''
-        groups = GroupBy()
-        for item in self._list:
-            maybe_unique_column_value = item[column]
-            if maybe_unique_column_value in groups.keys():
-                groups[maybe_unique_column_value].append(item)
-            else:
-                groups[maybe_unique_column_value] = Series()
-                groups[maybe_unique_column_value].append(item)
-        return groups
\ No newline at end of file
+        by = [column] if isinstance(column, str) else list(column)
+        return GroupBy.from_columns(self._dictionary, by)
@@ -0,0 +1,327 @@
+import operator
+from abc import ABC, abstractmethod
+from array import array
+from itertools import repeat
+
+from phoenixcel.src.column import Column
+
+
+def col(name):
+    '''
+    Refers to a column in an expression, e.g.
+        df.assign(year=col('Period Start').str[-4:])
+        df.where((col('Activity') == 'Alley Grading-Unimproved') & (col('days') > 3))
+    '''
+    return Col(name)
+
+
+def lit(value):
+    '''A constant in an expression; plain values are turned into these for you.'''
+    return Lit(value)
+
+
+def _expression(value):
+    return value if isinstance(value, Expr) else Lit(value)
+
+
+class Expr(ABC):
+    '''
+    A calculation over whole columns. Expressions are built with the
+    usual operators and evaluated a column at a time: the operator runs
+    through map() over the buffers instead of a Python call per row, and
+    a calculation on a single string column runs once per distinct string.
+
+    An expression can also be called with a row dictionary, like the
+    lambdas it stands in for, so it works anywhere a row function does.
+    '''
+    @abstractmethod
+    def columns(self):
+        '''The set of column headers the expression reads.'''
+
+    def evaluate(self, frame):
+        '''
+        Computes the expression for every row of a dataframe.
+
+        Input:
+          frame - the DataFrame to read columns from
+
+        Output:
+          a Column with one value per row
+
+        Modifies:
+          Nothing
+        '''
+        values = self._values(frame)
+        if isinstance(values, Column):
+            return values.share()
+        return Column.from_values(values)
+
+    @abstractmethod
+    def __call__(self, row):
+        '''The expression's value for one row dictionary.'''
+
+    @abstractmethod
+    def _values(self, frame):
+        '''Either a Column or a list with one value per row.'''
+
+    # Expressions can't be used as True/False; that would silently
+    # evaluate `a == 1 and b == 2` as just `b == 2`.
+    def __bool__(self):
+        raise TypeError("use & and | (not 'and' and 'or') to combine expressions")
+
+    __hash__ = object.__hash__
+
+    # Arithmetic
+    def __add__(self, other):
+        return Binary(operator.add, self, other, '+')
+
+    def __radd__(self, other):
+        return Binary(operator.add, other, self, '+')
+
+    def __sub__(self, other):
+        return Binary(operator.sub, self, other, '-')
+
+    def __rsub__(self, other):
+        return Binary(operator.sub, other, self, '-')
+
+    def __mul__(self, other):
+        return Binary(operator.mul, self, other, '*')
+
+    def __rmul__(self, other):
+        return Binary(operator.mul, other, self, '*')
+
+    def __truediv__(self, other):
+        return Binary(operator.truediv, self, other, '/')
+
+    def __rtruediv__(self, other):
+        return Binary(operator.truediv, other, self, '/')
+
+    def __floordiv__(self, other):
+        return Binary(operator.floordiv, self, other, '//')
+
+    def __mod__(self, other):
+        return Binary(operator.mod, self, other, '%')
+
+    def __pow__(self, other):
+        return Binary(operator.pow, self, other, '**')
+
+    def __neg__(self):
+        return Unary(operator.neg, self, '-')
+
+    # Comparisons
+    def __eq__(self, other):
+        return Binary(operator.eq, self, other, '==')
+
+    def __ne__(self, other):
+        return Binary(operator.ne, self, other, '!=')
+
+    def __lt__(self, other):
+        return Binary(operator.lt, self, other, '<')
+
+    def __le__(self, other):
+        return Binary(operator.le, self, other, '<=')
+
+    def __gt__(self, other):
+        return Binary(operator.gt, self, other, '>')
+
+    def __ge__(self, other):
+        return Binary(operator.ge, self, other, '>=')
+
+    # Boolean combinators
+    def __and__(self, other):
+        return Binary(_both, self, other, '&')
+
+    def __rand__(self, other):
+        return Binary(_both, other, self, '&')
+
+    def __or__(self, other):
+        return Binary(_either, self, other, '|')
+
+    def __ror__(self, other):
+        return Binary(_either, other, self, '|')
+
+    def __invert__(self):
+        return Unary(operator.not_, self, '~')
+
+    # Other element-wise operations
+    def isin(self, values):
+        values = frozenset(values)
+        return Unary(values.__contains__, self, 'isin')
+
+    def cast(self, to):
+        '''Converts every value with a type like int, float or str.'''
+        return Unary(to, self, f'cast[{to.__name__}]')
+
+    def apply(self, func):
+        '''Runs any one-argument function on every value.'''
+        return Unary(func, self, getattr(func, '__name__', 'apply'))
+
+    def is_null(self):
+        return Unary(_is_none, self, 'is_null')
+
+    @property
+    def str(self):
+        return StringMethods(self)
+
+
+def _both(left, right):
+    return bool(left and right)
+
+
+def _either(left, right):
+    return bool(left or right)
+
+
+def _is_none(value):
+    return value is None
+
+
+class Col(Expr):
+    def __init__(self, name):
+        self.name = name
+
+    def columns(self):
+        return {self.name}
+
+    def __call__(self, row):
+        return row[self.name]
+
+    def _values(self, frame):
+        return frame._dictionary[self.name]
+
+    def __repr__(self):
+        return f"col({self.name!r})"
+
+
+class Lit(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def columns(self):
+        return set()
+
+    def __call__(self, row):
+        return self.value
+
+    def _values(self, frame):
+        return [self.value] * len(frame)
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+class Unary(Expr):
+    def __init__(self, func, operand, label):
+        self.func = func
+        self.operand = _expression(operand)
+        self.label = label
+
+    def columns(self):
+        return self.operand.columns()
+
+    def __call__(self, row):
+        return self.func(self.operand(row))
+
+    def _values(self, frame):
+        values = self.operand._values(frame)
+        if isinstance(values, Column) and values.dtype == 'str':
+            return _per_category(values, self.func)
+        return list(map(self.func, values))
+
+    def __repr__(self):
+        return f"{self.label}({self.operand!r})"
+
+
+class Binary(Expr):
+    def __init__(self, func, left, right, label):
+        self.func = func
+        self.left = _expression(left)
+        self.right = _expression(right)
+        self.label = label
+
+    def columns(self):
+        return self.left.columns() | self.right.columns()
+
+    def __call__(self, row):
+        return self.func(self.left(row), self.right(row))
+
+    def _values(self, frame):
+        func = self.func
+        # A string column against a constant only needs working out
+        # once per distinct string
+        if isinstance(self.right, Lit):
+            left = self.left._values(frame)
+            if isinstance(left, Column) and left.dtype == 'str':
+                value = self.right.value
+                return _per_category(left, lambda category: func(category, value))
+            return list(map(func, left, repeat(self.right.value)))
+        if isinstance(self.left, Lit):
+            right = self.right._values(frame)
+            if isinstance(right, Column) and right.dtype == 'str':
+                value = self.left.value
+                return _per_category(right, lambda category: func(value, category))
+            return list(map(func, repeat(self.left.value), right))
+        return list(map(func, self.left._values(frame), self.right._values(frame)))
+
+    def __repr__(self):
+        return f"({self.left!r} {self.label} {self.right!r})"
+
+
+class StringMethods():
+    '''String operations on every value, reached through expr.str'''
+    def __init__(self, expr):
+        self._expr = expr
+
+    def __getitem__(self, item):
+        return Unary(operator.itemgetter(item), self._expr, f'str[{item!r}]')
+
+    def upper(self):
+        return Unary(str.upper, self._expr, 'upper')
+
+    def lower(self):
+        return Unary(str.lower, self._expr, 'lower')
+
+    def strip(self):
+        return Unary(str.strip, self._expr, 'strip')
+
+    def len(self):
+        return Unary(len, self._expr, 'len')
+
+    def startswith(self, prefix):
+        return Unary(lambda value: value.startswith(prefix), self._expr, 'startswith')
+
+    def endswith(self, suffix):
+        return Unary(lambda value: value.endswith(suffix), self._expr, 'endswith')
+
+    def contains(self, part):
+        return Unary(lambda value: part in value, self._expr, 'contains')
+
+
+def _per_category(column, func):
+    # Runs func once per distinct string a row holds, then spreads the
+    # answers over the rows through the column's codes. A view over a
+    # few rows of a big dictionary is cheaper to do row by row.
+    if len(column.categories) > len(column):
+        return list(map(func, column))
+    used = set(column._raw())
+    results = [
+        func(category) if code in used else None
+        for code, category in enumerate(column.categories)
+    ]
+    if used and all(type(results[code]) is str for code in used):
+        # Still strings: keep the column dictionary-encoded, merging
+        # categories that now read the same
+        codes = {}
+        categories = []
+        remap = []
+        for old_code, result in enumerate(results):
+            if old_code not in used:
+                remap.append(-1)
+                continue
+            code = codes.get(result)
+            if code is None:
+                code = codes[result] = len(categories)
+                categories.append(result)
+            remap.append(code)
+        return Column('str', array('l', map(remap.__getitem__, column._raw())), categories)
+    return list(map(results.__getitem__, column._raw()))
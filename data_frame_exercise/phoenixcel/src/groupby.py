@@ -1,29 +1,245 @@
+from array import array
+
+from phoenixcel.src.kernels import (
+    segment_approx_distinct, segment_approx_quantile, segment_count,
+    segment_first, segment_last, segment_max, segment_mean, segment_min,
+    segment_spread, segment_sum, segment_variance, variance,
+    STATES, add_group, add_value, finish, merge_part, remove_value,
+    rescan_group, segment_states
+)
+from phoenixcel.src.sketches import DistinctSketch, QuantileSketch
+
+
+class Rows():
+    '''
+    The rows that fall into one group. Only their positions are stored;
+    each row is built as a dictionary from the source columns on demand.
+    '''
+    def __init__(self, columns, indices):
+        self._columns = columns
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __iter__(self):
+        keys = list(self._columns.keys())
+        columns = list(self._columns.values())
+        for index in self._indices:
+            yield {key: column[index] for key, column in zip(keys, columns)}
+
+    def __getitem__(self, position):
+        index = self._indices[position]
+        return {key: column[index] for key, column in self._columns.items()}
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def factorize_columns(columns, by):
+    '''
+    Numbers the distinct values (or combinations of values) of the key
+    columns in order of first appearance.
+
+    Inputs:
+      columns - a dictionary of column header -> Column
+      by - the list of headers to group on
+
+    Outputs:
+      codes - an array with the group number of every row
+      keys - the group keys, indexed by group number; tuples when
+             there is more than one header
+
+    Modifies:
+      Nothing
+    '''
+    if len(by) == 1:
+        return columns[by[0]].factorize()
+
+    factorized = [columns[key].factorize() for key in by]
+    lookup = {}
+    keys = []
+    codes = array('l')
+    for combination in zip(*(key_codes for key_codes, _ in factorized)):
+        code = lookup.get(combination)
+        if code is None:
+            code = lookup[combination] = len(keys)
+            keys.append(tuple(
+                uniques[part] for part, (_, uniques) in zip(combination, factorized)
+            ))
+        codes.append(code)
+    return codes, keys
+
+
+def plan_aggregations(args, fusable=lambda agg: agg in STATES):
+    '''
+    Works out, for every column, the running state that all the
+    aggregations asked of it need, so that state can be filled in with
+    a single scan of the column.
+
+    Inputs:
+      args - describe_with style aggregation dictionaries
+      fusable - says whether a built-in aggregation may be planned
+
+    Outputs:
+      A dictionary of column -> (set of state names, positions in args
+      of the aggregations it serves)
+
+    Modifies:
+      Nothing
+    '''
+    plans = {}
+    for position, aggregation in enumerate(args):
+        agg = aggregation['agg']
+        if agg == 'aggregate':
+            needs = ('values',)
+        elif agg in STATES and fusable(agg):
+            needs = STATES[agg]
+        else:
+            continue
+        states, members = plans.setdefault(aggregation['column'], (set(), []))
+        states.update(needs)
+        members.append(position)
+    return plans
+
+
+def results_from_states(args, plans, keys, states_by_column):
+    # Turns filled-in state into {position in args: {group key: result}}
+    results = {}
+    for column, (_, members) in plans.items():
+        state = states_by_column[column]
+        for position in members:
+            aggregation = args[position]
+            if aggregation['agg'] == 'aggregate':
+                using_func = aggregation['using_func']
+                results[position] = {
+                    key: using_func(values) for key, values in zip(keys, state['values'])
+                }
+            else:
+                q = aggregation.get('q', 0.5)
+                results[position] = {
+                    key: finish(aggregation['agg'], state, code, q)
+                    for code, key in enumerate(keys)
+                }
+    return results
+
+
 class GroupBy(dict):
+    # A GroupBy made by DataFrame.group_by keeps the source columns
+    # and the row positions of every group instead of copies of the rows.
+    _columns = None
+    _indices = None
+    _codes = None
+    _keys = None
+
+    @classmethod
+    def from_columns(cls, columns, by):
+        '''
+        Groups the rows of a set of columns in one pass: the key columns
+        are factorized into integer codes, and each group remembers
+        the positions of its rows.
+
+        Inputs:
+          columns - a dictionary of column header -> Column
+          by - the list of headers to group on; more than one header
+               makes every group key a tuple
+
+        Outputs:
+          A new GroupBy() object
+
+        Modifies:
+          Marks the columns' buffers as shared, so later writes to them
+          copy first and the groups keep seeing the rows they were made from.
+        '''
+        codes, keys = factorize_columns(columns, by)
+
+        positions = [array('l') for _ in keys]
+        for index, code in enumerate(codes):
+            positions[code].append(index)
+
+        groups = cls()
+        groups._columns = {key: column.share() for key, column in columns.items()}
+        groups._indices = {}
+        groups._codes = codes
+        groups._keys = keys
+        for key, indices in zip(keys, positions):
+            groups._indices[key] = indices
+            groups[key] = Rows(groups._columns, indices)
+        return groups
+
     def sum(self, on=None):
-        return self.aggregate(on=on, using_func=sum)
+        return self._reduce(on, segment_sum, sum)
 
     def average(self, on=None):
         def func(listo):
             return sum(listo) / len(listo)
 
-        return self.aggregate(on=on, using_func=func)
+        return self._reduce(on, segment_mean, func)
 
     avg = average
 
     def count(self, on=None):
-        return self.aggregate(on=on, using_func=len)
+        return self._reduce(on, segment_count, len)
 
     def min(self, on=None):
-        return self.aggregate(on=on, using_func=min)
+        return self._reduce(on, segment_min, min)
 
     def max(self, on=None):
-        return self.aggregate(on=on, using_func=max)
+        return self._reduce(on, segment_max, max)
 
     def spread(self, on=None):
         def func(listo):
             return max(listo) - min(listo)
 
-        return self.aggregate(on=on, using_func=func)
+        return self._reduce(on, segment_spread, func)
+
+    def var(self, on=None):
+        return self._reduce(on, segment_variance, variance)
+
+    def first(self, on=None):
+        return self._reduce(on, segment_first, lambda listo: listo[0])
+
+    def last(self, on=None):
+        return self._reduce(on, segment_last, lambda listo: listo[-1])
+
+    def approx_distinct(self, on=None):
+        '''
+        Estimates how many distinct values of a column each group has,
+        with a HyperLogLog sketch of fixed size per group instead of a
+        set of every value. Typically within 2% of the exact count.
+        '''
+        def func(listo):
+            return DistinctSketch.from_values(listo).estimate()
+
+        return self._reduce(on, segment_approx_distinct, func)
+
+    def approx_quantile(self, on=None, q=0.5):
+        '''
+        Estimates a quantile of a column (the median by default) in every
+        group, with a KLL sketch of bounded size per group instead of a
+        sorted list of every value. q may also be a list of quantiles.
+        '''
+        def func(listo):
+            return QuantileSketch.from_values(listo).quantile(q)
+
+        def kernel(codes, values, size):
+            return segment_approx_quantile(codes, values, size, q)
+
+        return self._reduce(on, kernel, func)
+
+    def _reduce(self, on, kernel, fallback):
+        '''
+        Runs a built-in aggregation. A GroupBy made from a dataframe
+        computes every group in a single pass over the column with a
+        segmented kernel; any other GroupBy goes through aggregate.
+        '''
+        if self._codes is None or on is None:
+            return self.aggregate(on=on, using_func=fallback)
+        results = kernel(self._codes, self._columns[on], len(self._keys))
+        return dict(zip(self._keys, results))
 
     def aggregate(self, on=None, using_func=None):
         aggregator = {}
@@ -33,21 +249,71 @@ class GroupBy(dict):
             raise Exception(f"How do you want '{on}' aggregated?")
         else:
             for key in self.keys():
-                addends = [item[on] for item in self[key]]
-                aggregator[key] = using_func(addends)
+                aggregator[key] = using_func(self._values(key, on))
         return aggregator
 
+    def _values(self, key, on):
+        if self._indices is None:
+            return [item[on] for item in self[key]]
+        column = self._columns[on]
+        return [column[index] for index in self._indices[key]]
+
     def describe_with(self, *args):
+        '''
+        Summarizes every group with several aggregations at once.
+
+        Input:
+          args - dictionaries like {'agg': 'average', 'column': 'x'},
+                 {'agg': 'approx_quantile', 'column': 'x', 'q': 0.9}, or
+                 {'agg': 'aggregate', 'column': 'x', 'using_func': max}
+
+        Output:
+          A GroupBy Description: group -> {"<column> <aggregation>": result}
+
+        Modifies:
+          Nothing
+        '''
+        results = self._describe_fused(args) if self._codes is not None else {}
+        for position, aggregation in enumerate(args):
+            if position in results:
+                continue
+            if aggregation['agg'] == 'aggregate':
+                results[position] = self.aggregate(on=aggregation['column'], using_func=aggregation['using_func'])
+            else:
+                # Anything else in the dictionary (like q) is passed along
+                options = {
+                    key: value for key, value in aggregation.items()
+                    if key not in ('agg', 'column')
+                }
+                aggregation_function = getattr(self, aggregation['agg'])
+                results[position] = aggregation_function(on=aggregation['column'], **options)
+        return GroupBy.description(args, results)
+
+    @staticmethod
+    def description(args, results):
+        '''
+        Lays out aggregation results as a GroupBy Description.
+
+        Inputs:
+          args - the aggregation dictionaries that were asked for
+          results - position in args -> {group key: result}
+
+        Outputs:
+          A new GroupBy: group -> {"<column> <aggregation>": result}
+
+        Modifies:
+          Nothing
+        '''
         descriptions = {}
-        for aggregation in args:
+        for position, aggregation in enumerate(args):
             if aggregation['agg'] == 'aggregate':
-                result = self.aggregate(on=aggregation['column'], using_func=aggregation['using_func'])
                 function_name = aggregation['using_func'].__name__
+            elif 'q' in aggregation:
+                function_name = f"{aggregation['agg']}({aggregation['q']})"
             else:
-                aggregation_function = getattr(self, aggregation['agg'])
-                result = aggregation_function(on=aggregation['column'])
                 function_name = aggregation['agg']
 
+            result = results[position]
             for result_key in result.keys():
                 if not descriptions.get(result_key):
                     descriptions[result_key] = {}
@@ -55,6 +321,19 @@ class GroupBy(dict):
                 descriptions[result_key][aggregation_label] = result[result_key]
         return GroupBy(descriptions)
 
+    def _describe_fused(self, args):
+        # Plans all the aggregations asked of each column together, so
+        # every column is scanned once however many statistics it feeds.
+        # Aggregations a subclass has overridden are left to run on their own.
+        plans = plan_aggregations(
+            args, lambda agg: getattr(type(self), agg) is getattr(GroupBy, agg)
+        )
+        states_by_column = {
+            column: segment_states(self._codes, self._columns[column], len(self._keys), states)
+            for column, (states, _) in plans.items()
+        }
+        return results_from_states(args, plans, self._keys, states_by_column)
+
     def print_cute(self):
         '''
         Prints out a GroupBy or a GroupBy Description in a nice format.
@@ -79,3 +358,144 @@ class GroupBy(dict):
             else:
                 for component in value:
                     print(f"  {component}")
+
+
+# The aggregations a MaterializedGroupBy can keep up to date row by row
+INCREMENTAL = ('sum', 'count', 'average', 'avg', 'min', 'max', 'spread')
+
+
+class MaterializedGroupBy():
+    '''
+    A summary of a dataframe's groups (sums, counts, averages, minimums,
+    maximums) that is kept up to date while the dataframe changes.
+    Appending rows folds just those rows into the groups' running state,
+    and updating a row takes its old values back out and puts the new
+    ones in, so describe() never has to regroup the whole dataframe.
+
+    The one thing that can't be undone cheaply is removing the row that
+    held a group's minimum or maximum; that group's values are scanned
+    again the next time describe() is called. That costs one pass over
+    the column (O(rows)), however many groups went stale since the last
+    describe(), so it adds up when describe() is called after every
+    update of a min or max. Sums, counts and averages never rescan.
+    '''
+    def __init__(self, frame, by, args):
+        unsupported = [
+            aggregation['agg'] for aggregation in args
+            if aggregation['agg'] not in INCREMENTAL
+        ]
+        if unsupported:
+            raise ValueError(f"these aggregations can't be kept up to date: {unsupported}")
+        self._frame = frame
+        self._by = list(by)
+        self._args = list(args)
+        self._plans = plan_aggregations(self._args)
+        for states, _ in self._plans.values():
+            states.add('count')
+        self._build()
+        frame._listeners.append(self)
+
+    def _build(self):
+        columns = self._frame._dictionary
+        self._codes, self._keys = factorize_columns(columns, self._by)
+        self._lookup = {key: code for code, key in enumerate(self._keys)}
+        self._sizes = segment_count(self._codes, self._codes, len(self._keys))
+        self._states = {
+            column: segment_states(self._codes, columns[column], len(self._keys), states)
+            for column, (states, _) in self._plans.items()
+        }
+        # (column, group code) pairs whose min/max need a rescan
+        self._stale = set()
+
+    def close(self):
+        '''Stops following the dataframe.'''
+        self._frame._listeners.remove(self)
+
+    # Methods the dataframe calls when it changes
+    def rows_appended(self, frame, start):
+        positions = range(start, len(frame))
+        columns = {
+            key: frame._dictionary[key].take(positions)
+            for key in set(self._by) | self._plans.keys()
+        }
+        part_codes, part_keys = factorize_columns(columns, self._by)
+        part_states = {
+            column: segment_states(part_codes, columns[column], len(part_keys), states)
+            for column, (states, _) in self._plans.items()
+        }
+        known = len(self._keys)
+        codes = merge_part(self._keys, self._lookup, self._states, (part_keys, part_states))
+        self._sizes.extend([0] * (len(self._keys) - known))
+        for part_code in part_codes:
+            code = codes[part_code]
+            self._codes.append(code)
+            self._sizes[code] += 1
+
+    def row_updated(self, frame, position, old):
+        # old holds the previous value of every column that changed
+        columns = frame._dictionary
+        code = self._codes[position]
+        new_code = self._code_for(tuple(columns[key][position] for key in self._by))
+        for column in self._plans:
+            if column not in old and code == new_code:
+                continue
+            state = self._states[column]
+            if remove_value(state, code, old.get(column, columns[column][position])):
+                self._stale.add((column, code))
+            add_value(state, new_code, columns[column][position])
+        self._codes[position] = new_code
+        self._sizes[code] -= 1
+        self._sizes[new_code] += 1
+
+    def column_replaced(self, frame, key):
+        if key in self._by or key in self._plans:
+            self._build()
+
+    def _code_for(self, values):
+        key = values[0] if len(values) == 1 else values
+        code = self._lookup.get(key)
+        if code is None:
+            code = self._lookup[key] = len(self._keys)
+            self._keys.append(key)
+            self._sizes.append(0)
+            for state in self._states.values():
+                add_group(state)
+        return code
+
+    # Methods for reading the summary
+    def describe(self):
+        '''
+        The summary as it stands now, laid out like describe_with's.
+
+        Input:
+          None
+
+        Output:
+          A GroupBy Description: group -> {"<column> <aggregation>": result},
+          leaving out groups that have no rows left
+
+        Modifies:
+          Rescans the groups whose min or max was updated away.
+        '''
+        stale = {}
+        for column, code in self._stale:
+            stale.setdefault(column, {})[code] = []
+        for column, gathered in stale.items():
+            # One pass over the column for all of its stale groups
+            for group, value in zip(self._codes, self._frame._dictionary[column]):
+                if group in gathered:
+                    gathered[group].append(value)
+            for code, values in gathered.items():
+                rescan_group(self._states[column], code, values)
+        self._stale = set()
+
+        live = [code for code, size in enumerate(self._sizes) if size]
+        results = {}
+        for column, (_, members) in self._plans.items():
+            state = self._states[column]
+            for position in members:
+                agg = self._args[position]['agg']
+                results[position] = {
+                    self._keys[code]: finish(agg, state, code) for code in live
+                }
+        return GroupBy.description(self._args, results)
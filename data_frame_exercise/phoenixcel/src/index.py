@@ -0,0 +1,113 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class HashIndex():
+    '''
+    Maps every value of a column to the positions of the rows holding it,
+    so an equality lookup is one dictionary access.
+    '''
+    kind = 'hash'
+
+    def __init__(self, column):
+        self._positions = {}
+        self.extend(0, column)
+
+    def extend(self, start, values):
+        '''Indexes new rows whose positions begin at start.'''
+        positions = self._positions
+        for position, value in enumerate(values, start):
+            found = positions.get(value)
+            if found is None:
+                found = positions[value] = array('l')
+            found.append(position)
+
+    def replace(self, position, old, new):
+        '''Moves a row whose value changed from old to new.'''
+        found = self._positions[old]
+        found.remove(position)
+        if not found:
+            del self._positions[old]
+        found = self._positions.get(new)
+        if found is None:
+            found = self._positions[new] = array('l')
+        # Keep every value's positions in row order
+        found.insert(bisect_left(found, position), position)
+
+    def lookup(self, value):
+        return self._positions.get(value, array('l'))
+
+    def between(self, low, high):
+        raise TypeError("a hash index can't answer range lookups; use kind='sorted'")
+
+
+class SortedIndex():
+    '''
+    Keeps the values of a column in sorted order next to their row
+    positions, so equality and range lookups are a binary search.
+    Missing values (None) can't be ordered against the rest, so their
+    positions are kept in a list of their own, which lookup(None) returns.
+    '''
+    kind = 'sorted'
+
+    def __init__(self, column):
+        pairs = sorted(
+            (value, position) for position, value in enumerate(column)
+            if value is not None
+        )
+        self._keys = [value for value, _ in pairs]
+        self._positions = array('l', [position for _, position in pairs])
+        self._missing = array('l', [position for position, value in enumerate(column) if value is None])
+
+    def extend(self, start, values):
+        '''Indexes new rows whose positions begin at start.'''
+        keys = self._keys
+        positions = self._positions
+        for position, value in enumerate(values, start):
+            if value is None:
+                self._missing.append(position)
+                continue
+            # New rows come last, so among equal keys they go after the rest
+            spot = bisect_right(keys, value)
+            keys.insert(spot, value)
+            positions.insert(spot, position)
+
+    def replace(self, position, old, new):
+        '''Moves a row whose value changed from old to new.'''
+        keys = self._keys
+        positions = self._positions
+        if old is None:
+            self._missing.remove(position)
+        else:
+            spot = bisect_left(keys, old)
+            while positions[spot] != position:
+                spot += 1
+            del keys[spot]
+            del positions[spot]
+        if new is None:
+            self._missing.insert(bisect_left(self._missing, position), position)
+        else:
+            # Among equal keys, rows stay in row order
+            spot = bisect_left(keys, new)
+            stop = bisect_right(keys, new)
+            while spot < stop and positions[spot] < position:
+                spot += 1
+            keys.insert(spot, new)
+            positions.insert(spot, position)
+
+    def lookup(self, value):
+        if value is None:
+            return self._missing[:]
+        return self.between(value, value)
+
+    def between(self, low, high):
+        '''Positions of the rows with low <= value <= high, in value order.'''
+        start = bisect_left(self._keys, low)
+        stop = bisect_right(self._keys, high)
+        return self._positions[start:stop]
+
+
+INDEX_KINDS = {
+    'hash': HashIndex,
+    'sorted': SortedIndex,
+}
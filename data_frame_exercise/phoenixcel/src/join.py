@@ -0,0 +1,129 @@
+# Both join algorithms produce the same thing: two lists, left and right,
+# where left[i] and right[i] are the row positions that make up the i-th
+# row of the result. A position is None when that side has no match
+# (only in left and outer joins). Rows come out in left-row order, and
+# rows of the right frame that matched nothing go at the end.
+# Keys that are None never match anything, like NULL in SQL.
+
+HOW = ('inner', 'left', 'outer')
+
+
+def _is_sorted(keys):
+    # None keys are skipped by merge_join, so they can go anywhere
+    previous = None
+    for key in keys:
+        if key is None:
+            continue
+        if previous is not None and key < previous:
+            return False
+        previous = key
+    return True
+
+
+def can_merge(left_keys, right_keys):
+    '''True when both key sequences are already in order, so a merge join can run.'''
+    try:
+        return _is_sorted(left_keys) and _is_sorted(right_keys)
+    except TypeError:
+        return False
+
+
+def hash_join(left_keys, right_keys, how):
+    '''
+    Joins with a hash table built on the smaller side and probed with
+    the larger one.
+
+    Inputs:
+      left_keys, right_keys - the join key of every row on each side
+      how - 'inner', 'left' or 'outer'
+
+    Outputs:
+      (left positions, right positions) as described at the top
+
+    Modifies:
+      Nothing
+    '''
+    build_left = len(left_keys) < len(right_keys)
+    build_keys, probe_keys = (left_keys, right_keys) if build_left else (right_keys, left_keys)
+
+    table = {}
+    for position, key in enumerate(build_keys):
+        if key is not None:
+            table.setdefault(key, []).append(position)
+
+    pairs = []
+    for probe_position, key in enumerate(probe_keys):
+        for build_position in table.get(key, ()) if key is not None else ():
+            if build_left:
+                pairs.append((build_position, probe_position))
+            else:
+                pairs.append((probe_position, build_position))
+    if build_left:
+        pairs.sort()
+
+    return _add_unmatched(pairs, len(left_keys), len(right_keys), how)
+
+
+def merge_join(left_keys, right_keys, how):
+    '''
+    Joins two sides whose keys are already sorted by walking them
+    together, without building a hash table.
+
+    Inputs and outputs are the same as for hash_join. Apart from None
+    keys, both sides have to be in order (see can_merge): on unsorted
+    keys matches are missed.
+    '''
+    # None keys match nothing, and leaving them out keeps every run of
+    # equal keys in one piece even when a None sits inside it
+    left_present = [position for position, key in enumerate(left_keys) if key is not None]
+    right_present = [position for position, key in enumerate(right_keys) if key is not None]
+
+    pairs = []
+    left_index = right_index = 0
+    while left_index < len(left_present) and right_index < len(right_present):
+        left_key = left_keys[left_present[left_index]]
+        right_key = right_keys[right_present[right_index]]
+        if left_key < right_key:
+            left_index += 1
+        elif right_key < left_key:
+            right_index += 1
+        else:
+            # Pair up the whole run of equal keys on both sides
+            left_end = left_index
+            while left_end < len(left_present) and left_keys[left_present[left_end]] == left_key:
+                left_end += 1
+            right_end = right_index
+            while right_end < len(right_present) and right_keys[right_present[right_end]] == right_key:
+                right_end += 1
+            for left_match in left_present[left_index:left_end]:
+                for right_match in right_present[right_index:right_end]:
+                    pairs.append((left_match, right_match))
+            left_index, right_index = left_end, right_end
+
+    return _add_unmatched(pairs, len(left_keys), len(right_keys), how)
+
+
+def _add_unmatched(pairs, left_length, right_length, how):
+    if how == 'inner':
+        return [left for left, _ in pairs], [right for _, right in pairs]
+
+    left_positions = []
+    right_positions = []
+    matches = iter(pairs)
+    match = next(matches, None)
+    for left in range(left_length):
+        if match is None or match[0] != left:
+            left_positions.append(left)
+            right_positions.append(None)
+        while match is not None and match[0] == left:
+            left_positions.append(left)
+            right_positions.append(match[1])
+            match = next(matches, None)
+
+    if how == 'outer':
+        matched = set(right for _, right in pairs)
+        for right in range(right_length):
+            if right not in matched:
+                left_positions.append(None)
+                right_positions.append(right)
+    return left_positions, right_positions
@@ -0,0 +1,375 @@
+# Segmented reductions: each kernel walks a column once, alongside
+# the group code of every row, and returns one result per group.
+# They all take the same arguments:
+#   codes - an iterable with the group number of each row
+#   values - an iterable with the value of each row
+#   size - how many groups there are
+from phoenixcel.src.sketches import DistinctSketch, QuantileSketch
+
+_EMPTY = object()
+
+
+def segment_count(codes, values, size):
+    counts = [0] * size
+    for code in codes:
+        counts[code] += 1
+    return counts
+
+
+def segment_sum(codes, values, size):
+    totals = [0] * size
+    for code, value in zip(codes, values):
+        totals[code] += value
+    return totals
+
+
+def segment_mean(codes, values, size):
+    totals = [0] * size
+    counts = [0] * size
+    for code, value in zip(codes, values):
+        totals[code] += value
+        counts[code] += 1
+    return [total / count for total, count in zip(totals, counts)]
+
+
+def segment_min(codes, values, size):
+    lowest = [_EMPTY] * size
+    for code, value in zip(codes, values):
+        current = lowest[code]
+        if current is _EMPTY or value < current:
+            lowest[code] = value
+    return lowest
+
+
+def segment_max(codes, values, size):
+    highest = [_EMPTY] * size
+    for code, value in zip(codes, values):
+        current = highest[code]
+        if current is _EMPTY or value > current:
+            highest[code] = value
+    return highest
+
+
+def segment_spread(codes, values, size):
+    lowest = [_EMPTY] * size
+    highest = [_EMPTY] * size
+    for code, value in zip(codes, values):
+        if lowest[code] is _EMPTY:
+            lowest[code] = highest[code] = value
+        elif value < lowest[code]:
+            lowest[code] = value
+        elif value > highest[code]:
+            highest[code] = value
+    return [high - low for high, low in zip(highest, lowest)]
+
+
+def segment_variance(codes, values, size):
+    '''
+    Sample variance (divided by n - 1) of every group, using Welford's
+    update so it needs one pass and no list of each group's values.
+    Groups with a single row get nan, as there is no spread to measure.
+    '''
+    counts = [0] * size
+    means = [0.0] * size
+    squares = [0.0] * size
+    for code, value in zip(codes, values):
+        count = counts[code] + 1
+        delta = value - means[code]
+        mean = means[code] + delta / count
+        squares[code] += delta * (value - mean)
+        counts[code] = count
+        means[code] = mean
+    return [
+        square / (count - 1) if count > 1 else float('nan')
+        for square, count in zip(squares, counts)
+    ]
+
+
+def segment_first(codes, values, size):
+    firsts = [_EMPTY] * size
+    for code, value in zip(codes, values):
+        if firsts[code] is _EMPTY:
+            firsts[code] = value
+    return firsts
+
+
+def segment_last(codes, values, size):
+    lasts = [_EMPTY] * size
+    for code, value in zip(codes, values):
+        lasts[code] = value
+    return lasts
+
+
+def segment_approx_distinct(codes, values, size):
+    '''Estimated distinct values per group, from a HyperLogLog sketch each.'''
+    sketches = segment_states(codes, values, size, {'distinct_sketch'})['distinct_sketch']
+    return [sketch.estimate() for sketch in sketches]
+
+
+def segment_approx_quantile(codes, values, size, q=0.5):
+    '''Approximate quantile(s) q of every group, from a KLL sketch each.'''
+    sketches = segment_states(codes, values, size, {'quantile_sketch'})['quantile_sketch']
+    return [sketch.quantile(q) for sketch in sketches]
+
+
+def variance(values):
+    '''The same sample variance as segment_variance, for a single list.'''
+    return segment_variance([0] * len(values), values, 1)[0]
+
+
+# The running state each built-in aggregation is read from. Asking for
+# several aggregations of one column only keeps each piece of state once.
+STATES = {
+    'sum': ('sum',),
+    'average': ('sum', 'count'),
+    'avg': ('sum', 'count'),
+    'count': ('count',),
+    'min': ('min',),
+    'max': ('max',),
+    'spread': ('min', 'max'),
+    'var': ('count', 'mean', 'm2'),
+    'first': ('first',),
+    'last': ('last',),
+    'approx_distinct': ('distinct_sketch',),
+    'approx_quantile': ('quantile_sketch',),
+}
+
+
+def segment_states(codes, values, size, states):
+    '''
+    Fills in every requested piece of per-group state in one pass.
+
+    Inputs:
+      codes, values, size - as for the other kernels
+      states - a set drawn from 'count', 'sum', 'min', 'max', 'first',
+               'last', 'mean', 'm2', 'distinct_sketch', 'quantile_sketch'
+               (a sketch per group, see sketches.py) and 'values' (each
+               group's values, for aggregations that need to see all of them)
+
+    Outputs:
+      A dictionary of state name -> list with one entry per group
+
+    Modifies:
+      Nothing
+    '''
+    want_sum = 'sum' in states
+    want_min = 'min' in states
+    want_max = 'max' in states
+    want_first = 'first' in states
+    want_last = 'last' in states
+    want_m2 = 'm2' in states or 'mean' in states
+    want_values = 'values' in states
+    want_distinct = 'distinct_sketch' in states
+    want_quantiles = 'quantile_sketch' in states
+
+    counts = [0] * size
+    totals = [0] * size
+    lowest = [_EMPTY] * size
+    highest = [_EMPTY] * size
+    firsts = [_EMPTY] * size
+    lasts = [_EMPTY] * size
+    means = [0.0] * size
+    squares = [0.0] * size
+    gathered = [[] for _ in range(size)] if want_values else None
+    distinct = [DistinctSketch() for _ in range(size)] if want_distinct else None
+    quantiles = [QuantileSketch() for _ in range(size)] if want_quantiles else None
+
+    for code, value in zip(codes, values):
+        count = counts[code] = counts[code] + 1
+        if want_sum:
+            totals[code] += value
+        if want_min:
+            current = lowest[code]
+            if current is _EMPTY or value < current:
+                lowest[code] = value
+        if want_max:
+            current = highest[code]
+            if current is _EMPTY or value > current:
+                highest[code] = value
+        if want_first and count == 1:
+            firsts[code] = value
+        if want_last:
+            lasts[code] = value
+        if want_m2:
+            delta = value - means[code]
+            means[code] += delta / count
+            squares[code] += delta * (value - means[code])
+        if want_values:
+            gathered[code].append(value)
+        if want_distinct:
+            distinct[code].add(value)
+        if want_quantiles:
+            quantiles[code].add(value)
+
+    filled = {
+        'count': counts, 'sum': totals, 'min': lowest, 'max': highest,
+        'first': firsts, 'last': lasts, 'mean': means, 'm2': squares,
+        'values': gathered, 'distinct_sketch': distinct, 'quantile_sketch': quantiles,
+    }
+    return {state: filled[state] for state in states}
+
+
+def finish(aggregation, state, code, q=0.5):
+    '''
+    Reads one group's result for a built-in aggregation out of its
+    state; q is the quantile approx_quantile reads.
+    '''
+    if aggregation == 'approx_distinct':
+        return state['distinct_sketch'][code].estimate()
+    if aggregation == 'approx_quantile':
+        return state['quantile_sketch'][code].quantile(q)
+    if aggregation in ('average', 'avg'):
+        return state['sum'][code] / state['count'][code]
+    if aggregation == 'spread':
+        return state['max'][code] - state['min'][code]
+    if aggregation == 'var':
+        count = state['count'][code]
+        return state['m2'][code] / (count - 1) if count > 1 else float('nan')
+    return state[aggregation][code]
+
+
+# Keeping state up to date one row at a time, for aggregates that are
+# maintained as their dataframe changes. Only count, sum, min and max
+# are kept this way.
+def add_group(state):
+    '''Adds an empty group to the end of a state.'''
+    for name, values in state.items():
+        values.append(0 if name in ('count', 'sum') else _EMPTY)
+
+
+def add_value(state, code, value):
+    '''Folds one more value into a group's state.'''
+    if 'count' in state:
+        state['count'][code] += 1
+    if 'sum' in state:
+        state['sum'][code] += value
+    if 'min' in state:
+        current = state['min'][code]
+        if current is _EMPTY or value < current:
+            state['min'][code] = value
+    if 'max' in state:
+        current = state['max'][code]
+        if current is _EMPTY or value > current:
+            state['max'][code] = value
+
+
+def remove_value(state, code, value):
+    '''
+    Takes one value back out of a group's state. Counts and sums can be
+    undone exactly, but a minimum or maximum that was this very value
+    can't: the next one down is not known.
+
+    Output:
+      True when the group's min or max has to be worked out again
+      from its rows with rescan_group
+
+    Modifies:
+      Modifies state in place.
+    '''
+    if 'count' in state:
+        state['count'][code] -= 1
+        if state['count'][code] == 0:
+            for name in ('sum', 'min', 'max'):
+                if name in state:
+                    state[name][code] = 0 if name == 'sum' else _EMPTY
+            return False
+    if 'sum' in state:
+        state['sum'][code] -= value
+    return 'min' in state and state['min'][code] == value or \
+        'max' in state and state['max'][code] == value
+
+
+def rescan_group(state, code, values):
+    '''Works out a group's min and max again from all of its values.'''
+    values = list(values)
+    if 'min' in state:
+        state['min'][code] = min(values) if values else _EMPTY
+    if 'max' in state:
+        state['max'][code] = max(values) if values else _EMPTY
+
+
+def merge_partials(parts):
+    '''
+    Combines per-group state computed separately on consecutive chunks
+    of rows (the reduce half of a map-reduce group by). Groups keep the
+    order in which they first appear, exactly as if the rows had been
+    scanned in one go.
+
+    Input:
+      parts - a list of (keys, {column: state}) in row order, where each
+              state is what segment_states returned for that chunk
+
+    Output:
+      keys - every group key
+      states - {column: state} with one entry per key
+
+    Modifies:
+      May extend the 'values' lists inside parts.
+    '''
+    keys = []
+    lookup = {}
+    merged = {}
+    for part in parts:
+        merge_part(keys, lookup, merged, part)
+    return keys, merged
+
+
+def merge_part(keys, lookup, merged, part):
+    '''
+    Merges the state of one more chunk of rows into running state.
+
+    Inputs:
+      keys - the group keys seen so far, in order of first appearance
+      lookup - group key -> its position in keys
+      merged - {column: state} for those keys
+      part - (keys, {column: state}) for the new chunk
+
+    Output:
+      a list with the position in keys of each of the part's groups
+
+    Modifies:
+      Adds new groups to keys, lookup and merged, and folds the rest
+      into the state they already have.
+    '''
+    part_keys, part_states = part
+    codes = []
+    for part_code, key in enumerate(part_keys):
+        code = lookup.get(key)
+        if code is None:
+            code = lookup[key] = len(keys)
+            keys.append(key)
+            for column, state in part_states.items():
+                target = merged.setdefault(column, {name: [] for name in state})
+                for name, values in state.items():
+                    target[name].append(values[part_code])
+        else:
+            for column, state in part_states.items():
+                _merge_group(merged[column], code, state, part_code)
+        codes.append(code)
+    return codes
+
+
+def _merge_group(into, code, state, other):
+    if 'm2' in state:
+        # Chan et al.'s formula for combining two Welford accumulators
+        count_a, count_b = into['count'][code], state['count'][other]
+        count = count_a + count_b
+        delta = state['mean'][other] - into['mean'][code]
+        into['mean'][code] += delta * count_b / count
+        into['m2'][code] += state['m2'][other] + delta * delta * count_a * count_b / count
+    if 'count' in state:
+        into['count'][code] += state['count'][other]
+    if 'sum' in state:
+        into['sum'][code] += state['sum'][other]
+    # A group can be left empty when all its rows are updated away
+    if 'min' in state and (into['min'][code] is _EMPTY or state['min'][other] < into['min'][code]):
+        into['min'][code] = state['min'][other]
+    if 'max' in state and (into['max'][code] is _EMPTY or state['max'][other] > into['max'][code]):
+        into['max'][code] = state['max'][other]
+    if 'last' in state:
+        into['last'][code] = state['last'][other]
+    if 'values' in state:
+        into['values'][code].extend(state['values'][other])
+    for sketch in ('distinct_sketch', 'quantile_sketch'):
+        if sketch in state:
+            into[sketch][code] = into[sketch][code].merge(state[sketch][other])
@@ -0,0 +1,282 @@
+import dis
+from functools import reduce
+from operator import and_
+
+from phoenixcel.src.expressions import Expr
+
+
+def columns_read(func):
+    '''
+    Works out which columns a row-wise function looks at, by reading its
+    bytecode for row["Column"] and row.get("Column") lookups. An
+    expression already knows its columns.
+
+    Input:
+      func - a function that takes a row dictionary as its first argument,
+             or an expression
+
+    Output:
+      a set of column headers, or None if the function uses the row in
+      any other way (computed keys, passing the row along, closures...)
+      and so might read any column
+
+    Modifies:
+      Nothing
+    '''
+    if isinstance(func, Expr):
+        return func.columns()
+    if getattr(func, '__self__', None) is not None:
+        # A bound method's first argument is the object, not the row
+        return None
+    code = getattr(func, '__code__', None)
+    if code is None or code.co_argcount < 1:
+        return None
+    row_name = code.co_varnames[0]
+    if row_name in code.co_cellvars:
+        return None
+
+    instructions = [
+        instruction for instruction in dis.get_instructions(code)
+        if instruction.opname not in ('CACHE', 'EXTENDED_ARG')
+    ]
+    reads = set()
+    for position, instruction in enumerate(instructions):
+        names = instruction.argval if isinstance(instruction.argval, tuple) else (instruction.argval,)
+        if 'FAST' not in instruction.opname or row_name not in names:
+            continue
+        if instruction.opname != 'LOAD_FAST':
+            return None
+
+        following = instructions[position + 1:position + 3]
+        if len(following) == 2 and following[0].opname == 'LOAD_CONST' \
+                and isinstance(following[0].argval, str) \
+                and following[1].opname == 'BINARY_SUBSCR':
+            reads.add(following[0].argval)
+        elif len(following) == 2 and following[0].opname in ('LOAD_METHOD', 'LOAD_ATTR') \
+                and following[0].argval == 'get' \
+                and following[1].opname == 'LOAD_CONST' \
+                and isinstance(following[1].argval, str):
+            reads.add(following[1].argval)
+        else:
+            return None
+    return reads
+
+
+class LazyFrame():
+    '''
+    A dataframe pipeline that has been written down but not run yet.
+
+    where, assign and select only add a step to the plan. collect()
+    optimizes the plan and then runs it:
+      - a where moves ahead of any assign whose column it doesn't read,
+        so the assign only computes values for rows that survive
+      - consecutive wheres and consecutive assigns each run in one pass
+      - assigns nobody reads and columns nobody uses are dropped
+        when the plan ends in a select
+    '''
+    def __init__(self, source, steps=()):
+        self._source = source
+        self._steps = tuple(steps)
+
+    # Methods for building the plan
+    def where(self, condition):
+        return self._then(('where', condition, columns_read(condition)))
+
+    def assign(self, **kwargs):
+        steps = [('assign', key, value, columns_read(value)) for key, value in kwargs.items()]
+        return LazyFrame(self._source, self._steps + tuple(steps))
+
+    def select(self, *columns):
+        return self._then(('select', list(columns)))
+
+    def _then(self, step):
+        return LazyFrame(self._source, self._steps + (step,))
+
+    # Methods for running the plan
+    def collect(self):
+        '''
+        Optimizes and runs the plan.
+
+        Input:
+          None
+
+        Output:
+          A new DataFrame; the source dataframe is left as it was
+
+        Modifies:
+          Nothing
+        '''
+        needed, stages = self._optimize()
+        if isinstance(self._source, CsvScan):
+            conditions, stages = _split_scan_conditions(stages)
+            df = self._source.read(needed, conditions)
+        elif needed is not None:
+            df = self._source._select([key for key in self._source.columns if key in needed])
+        else:
+            df = self._source._select()
+        for stage in stages:
+            df = stage.run(df)
+        return df
+
+    def group_by(self, column):
+        return self.collect().group_by(column)
+
+    def explain(self):
+        '''Describes the optimized plan, one stage per line.'''
+        needed, stages = self._optimize()
+        columns = 'all columns' if needed is None else ', '.join(sorted(needed))
+        lines = [f"scan ({columns})"]
+        if isinstance(self._source, CsvScan):
+            conditions, stages = _split_scan_conditions(stages)
+            if conditions:
+                lines.append(f"filter while parsing ({len(conditions)} condition{'s' if len(conditions) > 1 else ''})")
+        lines.extend(stage.describe() for stage in stages)
+        return '\n'.join(lines)
+
+    def _optimize(self):
+        steps, needed = _prune(_push_down_predicates(list(self._steps)))
+        return needed, _fuse(steps)
+
+
+class CsvScan():
+    '''
+    The source of a LazyFrame that reads a csv file. Reading is put off
+    until collect(), so the plan can tell it which columns to keep and
+    which rows to skip while parsing.
+    '''
+    def __init__(self, frame_class, file_path, dtypes, infer_schema, sample_size):
+        self._frame_class = frame_class
+        self.file_path = file_path
+        self.dtypes = dtypes
+        self.infer_schema = infer_schema
+        self.sample_size = sample_size
+
+    def read(self, keys=None, conditions=()):
+        return self._frame_class._read_csv(
+            self.file_path, self.dtypes, self.infer_schema, self.sample_size,
+            None if keys is None else sorted(keys), list(conditions)
+        )
+
+
+def _split_scan_conditions(stages):
+    # The wheres at the very front of the plan whose columns are known
+    # can be checked by the csv reader itself, before rows are stored.
+    if not stages or stages[0].kind != 'where':
+        return [], stages
+    conditions = []
+    remaining = []
+    for step in stages[0].steps:
+        if step[2] is None:
+            remaining.append(step)
+        else:
+            conditions.append((sorted(step[2]), step[1]))
+    rest = stages[1:]
+    if remaining:
+        rest = [_Stage('where', remaining)] + rest
+    return conditions, rest
+
+
+def _push_down_predicates(steps):
+    # Bubble every where toward the front of the plan, past any assign
+    # that defines none of the columns the where reads.
+    moved = True
+    while moved:
+        moved = False
+        for position in range(1, len(steps)):
+            before, step = steps[position - 1], steps[position]
+            if step[0] != 'where' or before[0] != 'assign':
+                continue
+            reads = step[2]
+            if reads is not None and before[1] not in reads:
+                steps[position - 1], steps[position] = step, before
+                moved = True
+    return steps
+
+
+def _prune(steps):
+    # Walk backwards from the end, keeping only the assigns whose
+    # column is read later on or is part of the final select. What is
+    # still needed at the front is all the source has to provide.
+    needed = None
+    kept = []
+    for step in reversed(steps):
+        kind = step[0]
+        if kind == 'select':
+            needed = set(step[1]) if needed is None else needed & set(step[1])
+        elif kind == 'assign':
+            if needed is not None and step[1] not in needed:
+                continue
+            if needed is not None:
+                needed.discard(step[1])
+                needed = None if step[3] is None else needed | step[3]
+        elif kind == 'where' and needed is not None:
+            needed = None if step[2] is None else needed | step[2]
+        kept.append(step)
+    kept.reverse()
+    if not needed and needed is not None:
+        # Reading no columns at all would lose how many rows there are
+        needed = None
+    return kept, needed
+
+
+def _fuse(steps):
+    stages = []
+    for step in steps:
+        kind = step[0]
+        if stages and stages[-1].kind == kind and kind != 'select':
+            stages[-1].steps.append(step)
+        else:
+            stages.append(_Stage(kind, [step]))
+    return stages
+
+
+class _Stage():
+    # A run of same-kind steps that executes as one pass over the rows
+    def __init__(self, kind, steps):
+        self.kind = kind
+        self.steps = steps
+
+    def reads(self):
+        position = 2 if self.kind == 'where' else 3
+        reads = set()
+        for step in self.steps:
+            if step[position] is None:
+                return None
+            reads |= step[position]
+        return reads
+
+    def run(self, df):
+        if self.kind == 'select':
+            return df._select(self.steps[0][1])
+
+        if all(isinstance(step[-2], Expr) for step in self.steps):
+            # Expressions run a column at a time instead
+            if self.kind == 'where':
+                return df.where(reduce(and_, [step[1] for step in self.steps]))
+            return df.assign(**{step[1]: step[2] for step in self.steps})
+
+        reads = self.reads()
+        keys = None if reads is None else [key for key in df.columns if key in reads]
+        if self.kind == 'where':
+            conditions = [step[1] for step in self.steps]
+            indices = [
+                index for index, row in enumerate(df._rows(keys))
+                if all(condition(row) for condition in conditions)
+            ]
+            return df._take(indices)
+
+        assignments = [(step[1], step[2], []) for step in self.steps]
+        for row in df._rows(keys):
+            for key, func, values in assignments:
+                value = row[key] = func(row)
+                values.append(value)
+        for key, _, values in assignments:
+            df[key] = values
+        return df
+
+    def describe(self):
+        if self.kind == 'select':
+            return f"select ({', '.join(self.steps[0][1])})"
+        if self.kind == 'where':
+            return f"where ({len(self.steps)} condition{'s' if len(self.steps) > 1 else ''})"
+        return f"assign ({', '.join(step[1] for step in self.steps)})"
@@ -0,0 +1,147 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from phoenixcel.src.groupby import factorize_columns
+from phoenixcel.src.kernels import merge_partials, segment_states
+
+
+# Worker processes are forked, so they inherit the dataframe and the
+# user's function from the parent instead of having them pickled: the
+# column buffers are shared copy-on-write pages, and lambdas work too.
+# Only the (start, stop) of each partition goes to a worker, and only
+# its results come back.
+_frame = None
+_func = None
+
+
+def can_run_in_parallel(workers):
+    return bool(workers) and workers > 1 and \
+        'fork' in multiprocessing.get_all_start_methods()
+
+
+def partitions(length, parts):
+    '''
+    Splits range(length) into at most `parts` contiguous, nearly
+    equal (start, stop) pieces.
+    '''
+    parts = max(1, min(parts, length))
+    size, extra = divmod(length, parts)
+    bounds = []
+    start = 0
+    for part in range(parts):
+        stop = start + size + (1 if part < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def map_partitions(frame, func, task, workers):
+    '''
+    Runs task(start, stop) on every partition of the frame in a pool of
+    forked processes and returns the results in partition order.
+
+    Inputs:
+      frame - the DataFrame the workers read from
+      func - the user's function, made available to the task
+      task - a module-level function of (start, stop)
+      workers - how many processes to use
+
+    Outputs:
+      a list with one result per partition
+
+    Modifies:
+      Nothing in this process; anything func changes only changes
+      in the worker's copy
+    '''
+    bounds = partitions(len(frame), workers)
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(
+        max_workers=len(bounds),
+        mp_context=context,
+        initializer=_install,
+        initargs=(frame, func),
+    ) as pool:
+        futures = [pool.submit(task, start, stop) for start, stop in bounds]
+        return [future.result() for future in futures]
+
+
+def _install(frame, func):
+    global _frame, _func
+    _frame = frame
+    _func = func
+
+
+def _partition_rows(start, stop):
+    return _frame._take(range(start, stop))._rows()
+
+
+def evaluate_task(start, stop):
+    rows = list(_partition_rows(start, stop))
+    return [[func(row) for row in rows] for func in _func]
+
+
+def filter_task(start, stop):
+    return [
+        start + offset
+        for offset, row in enumerate(_partition_rows(start, stop))
+        if _func(row)
+    ]
+
+
+def evaluate(frame, funcs, workers):
+    '''
+    The value of each of funcs for every row of the frame, computed in
+    parallel by a single pool: one list of values per function.
+    '''
+    columns = [[] for _ in funcs]
+    for part in map_partitions(frame, funcs, evaluate_task, workers):
+        for values, computed in zip(columns, part):
+            values.extend(computed)
+    return columns
+
+
+def matching_indices(frame, condition, workers):
+    '''The positions of the rows that pass condition, found in parallel.'''
+    indices = []
+    for part in map_partitions(frame, condition, filter_task, workers):
+        indices.extend(part)
+    return indices
+
+
+def _partial_states(frame, by, plans):
+    # The map half: group one chunk locally and fill in its state
+    codes, keys = factorize_columns(frame._dictionary, by)
+    return keys, {
+        column: segment_states(codes, frame._dictionary[column], len(keys), states)
+        for column, states in plans.items()
+    }
+
+
+def partial_states_task(start, stop):
+    by, plans = _func
+    return _partial_states(_frame._take(range(start, stop)), by, plans)
+
+
+def grouped_states(frame, by, plans, workers):
+    '''
+    Per-group aggregation state for a whole frame, computed as partial
+    states on chunks of rows in a process pool and merged afterwards.
+
+    Inputs:
+      frame - the DataFrame to group
+      by - the list of headers to group on
+      plans - {column: set of state names} as in segment_states
+      workers - how many processes to use; None or 1 runs in this process
+
+    Outputs:
+      keys - the group keys in order of first appearance
+      states - {column: state} with one entry per key
+
+    Modifies:
+      Nothing
+    '''
+    if can_run_in_parallel(workers) and len(frame) > 1:
+        parts = map_partitions(frame, (by, plans), partial_states_task, workers)
+    else:
+        parts = [_partial_states(frame, by, plans)]
+    return merge_partials(parts)
@@ -1,12 +1,340 @@
+import math
+import operator
+from array import array
+from collections import Counter
+from itertools import repeat
+
+from phoenixcel.src.stats import RunningStats
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
 class Series(list):
+    '''
+    A list of the values in one column, with column math on top.
+
+    Column math goes through named methods, which work element by
+    element against another sequence of the same length or against a
+    single value: s.mul(2), s.add(other), s.gt(3). The operators keep
+    their list meaning (s + [4] concatenates, s < other compares whole
+    lists). The loops run inside map() rather than as python comprehensions.
+
+    A series of floats can also keep the typed buffer it came from (see
+    from_buffer and from_column); when NumPy is installed, sum() then
+    runs over that buffer without copying it. Whole numbers are always
+    added up by python, so they never overflow.
+    '''
+    _buffer = None
+    _column = None
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        '''
+        Builds a series of numbers that keeps the array.array it was
+        made from for reductions.
+
+        Input:
+          buffer - an array.array of ints or floats
+
+        Output:
+          a new Series
+
+        Modifies:
+          Nothing
+        '''
+        series = cls(buffer)
+        series._buffer = buffer
+        return series
+
+    @classmethod
+    def from_column(cls, column):
+        '''
+        Builds a series of a number column's values that keeps a share of
+        the column (no copy), whose buffer reductions can read.
+
+        Input:
+          column - an int64 or float64 Column
+
+        Output:
+          a new Series
+
+        Modifies:
+          Marks the column's buffer as shared.
+        '''
+        series = cls(column)
+        series._column = column.share()
+        return series
+
+    def _float_buffer(self):
+        # The array of floats behind the values, if there is one
+        buffer = self._buffer
+        if buffer is None and self._column is not None and self._column._selection is None:
+            buffer = self._column._data
+        if isinstance(buffer, array) and buffer.typecode == 'd':
+            return buffer
+        return None
+
+    # Reductions
     def sum(self):
+        buffer = self._float_buffer()
+        if buffer is not None and numpy is not None:
+            return float(numpy.frombuffer(buffer, dtype='d').sum())
         return sum(self)
 
-    def average(self):
-        return sum(self) / len(self)
+    def mean(self):
+        return self.sum() / len(self)
+
+    average = mean
+    avg = mean
+
+    def min(self):
+        return min(self)
+
+    def max(self):
+        return max(self)
+
+    def std(self):
+        '''The sample standard deviation.'''
+        if len(self) < 2:
+            return float('nan')
+        mean = math.fsum(self) / len(self)
+        deviations = list(map(operator.sub, self, repeat(mean)))
+        return math.sqrt(math.fsum(map(operator.mul, deviations, deviations)) / (len(self) - 1))
+
+    def describe(self):
+        '''
+        Count, mean, standard deviation, min, max and sum from a single
+        pass over the values (see RunningStats).
+
+        Input:
+          None
+
+        Output:
+          a dictionary of statistic name -> value
+
+        Modifies:
+          Nothing
+        '''
+        return self.running_stats().describe()
+
+    def running_stats(self):
+        '''
+        The values' RunningStats, which can be merged with other chunks',
+        e.g. sum((chunk['x'].running_stats() for chunk in chunks), RunningStats())
+        '''
+        return RunningStats.from_values(self)
+
+    def quantile(self, q):
+        '''
+        The value below which a fraction q of the values fall,
+        interpolating between the two nearest values like NumPy does.
+
+        Input:
+          q - a number from 0 to 1, or a list of them
+
+        Output:
+          the quantile, or a list with one per q
+
+        Modifies:
+          Nothing
+        '''
+        ordered = sorted(self)
+        if not ordered:
+            raise ValueError("quantile of an empty series")
+
+        def one(fraction):
+            if not 0 <= fraction <= 1:
+                raise ValueError("q has to be between 0 and 1")
+            position = fraction * (len(ordered) - 1)
+            below = math.floor(position)
+            above = min(below + 1, len(ordered) - 1)
+            return ordered[below] + (ordered[above] - ordered[below]) * (position - below)
+
+        if isinstance(q, (list, tuple)):
+            return [one(fraction) for fraction in q]
+        return one(q)
+
+    def apply(self, func):
+        # NumPy ufuncs (numpy.sqrt, numpy.log...) run over the whole
+        # series at once; anything else is mapped value by value
+        if numpy is not None and isinstance(func, numpy.ufunc):
+            return Series(func(numpy.asarray(self)).tolist())
+        return Series(map(func, self))
+
+    # Element-wise math
+    def _elementwise(self, func, other, reflected=False):
+        if isinstance(other, (list, tuple, array)):
+            if len(other) != len(self):
+                raise ValueError(f"can't combine series of lengths {len(self)} and {len(other)}")
+        else:
+            other = repeat(other)
+        if reflected:
+            return Series(map(func, other, self))
+        return Series(map(func, self, other))
 
-    avg = average
+    def add(self, other):
+        return self._elementwise(operator.add, other)
+
+    def radd(self, other):
+        return self._elementwise(operator.add, other, reflected=True)
+
+    def sub(self, other):
+        return self._elementwise(operator.sub, other)
+
+    def rsub(self, other):
+        return self._elementwise(operator.sub, other, reflected=True)
+
+    def mul(self, other):
+        return self._elementwise(operator.mul, other)
+
+    def rmul(self, other):
+        return self._elementwise(operator.mul, other, reflected=True)
+
+    def truediv(self, other):
+        return self._elementwise(operator.truediv, other)
+
+    def rtruediv(self, other):
+        return self._elementwise(operator.truediv, other, reflected=True)
+
+    div = truediv
+    rdiv = rtruediv
+
+    def lt(self, other):
+        return self._elementwise(operator.lt, other)
+
+    def le(self, other):
+        return self._elementwise(operator.le, other)
+
+    def gt(self, other):
+        return self._elementwise(operator.gt, other)
+
+    def ge(self, other):
+        return self._elementwise(operator.ge, other)
+
+    def eq(self, other):
+        return self._elementwise(operator.eq, other)
+
+    def ne(self, other):
+        return self._elementwise(operator.ne, other)
+
+    # List methods that change the values make the buffer stale
+    # (they are wrapped below the class)
+    def _changed(self):
+        self._buffer = None
+        self._column = None
+
+
+def _changing(name):
+    method = getattr(list, name)
+
+    def changed(self, *args, **kwargs):
+        self._changed()
+        return method(self, *args, **kwargs)
+    changed.__name__ = name
+    changed.__doc__ = method.__doc__
+    return changed
+
+
+for _name in ('append', 'extend', 'insert', 'pop', 'remove', 'clear', 'sort',
+              'reverse', '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(Series, _name, _changing(_name))
+del _name
+
+
+class Categorical(Series):
+    '''
+    A series of repeated values (usually strings like an Activity name)
+    kept as small integer codes into a shared list of the distinct
+    values, its categories. It is still a list of the values, but every
+    row refers to the same few objects, and the code-based methods below
+    only have to look at integers.
+
+    Changing the series with list methods is fine; the codes are worked
+    out again the next time they are needed.
+    '''
+    def __init__(self, values=()):
+        super().__init__(values)
+        self._encoding = None
+
+    @classmethod
+    def from_codes(cls, codes, categories):
+        '''
+        Builds a categorical series straight from its encoding.
+
+        Inputs:
+          codes - an iterable of integer positions into categories
+          categories - the list of distinct values
+
+        Output:
+          a new Categorical
+
+        Modifies:
+          Nothing
+        '''
+        codes = array('l', codes)
+        series = cls(map(categories.__getitem__, codes))
+        series._encoding = (codes, categories)
+        return series
+
+    @property
+    def codes(self):
+        return self._encoded()[0]
+
+    @property
+    def categories(self):
+        return self._encoded()[1]
+
+    def _encoded(self):
+        if self._encoding is None:
+            lookup = {}
+            categories = []
+            codes = array('l')
+            for value in self:
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(categories)
+                    categories.append(value)
+                codes.append(code)
+            self._encoding = (codes, categories)
+        return self._encoding
+
+    # Methods that work on the codes
+    def _elementwise(self, func, other, reflected=False):
+        # Against a single value, each category only needs working out once
+        if isinstance(other, (list, tuple, array)):
+            return super()._elementwise(func, other, reflected)
+        codes, categories = self._encoded()
+        if reflected:
+            results = [func(other, category) for category in categories]
+        else:
+            results = [func(category, other) for category in categories]
+        return Series(map(results.__getitem__, codes))
+
+    def isin(self, values):
+        '''A Series of True/False saying which rows hold one of values.'''
+        codes, categories = self._encoded()
+        wanted = set(values)
+        matches = [category in wanted for category in categories]
+        return Series(map(matches.__getitem__, codes))
+
+    def value_counts(self):
+        '''How many rows hold each category, most common first.'''
+        codes, categories = self._encoded()
+        return {categories[code]: count for code, count in Counter(codes).most_common()}
 
     def apply(self, func):
-        self = Series([func(x) for x in self])
-        return self
+        # func runs once per category a row holds instead of once per row
+        codes, categories = self._encoded()
+        used = set(codes)
+        results = [
+            func(category) if code in used else None
+            for code, category in enumerate(categories)
+        ]
+        return Series(map(results.__getitem__, codes))
+
+    # List methods that change the values make the codes stale
+    def _changed(self):
+        self._encoding = None
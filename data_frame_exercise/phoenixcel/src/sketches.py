@@ -0,0 +1,190 @@
+import math
+import random
+from hashlib import blake2b
+
+
+# Sketches answer a question about a column approximately, in memory
+# that doesn't grow with the number of rows. Missing values (None) are
+# left out of both. Two sketches built over separate chunks of rows
+# can be merged into the sketch of all of them.
+
+
+class DistinctSketch():
+    '''
+    A HyperLogLog estimate of how many distinct values have been added.
+
+    Each value is hashed; the first `precision` bits of the hash pick one
+    of 2 ** precision registers, which remembers the longest run of
+    leading zeros seen in the rest of the hash. With the default
+    precision of 12 that is 4 KB per sketch and a typical error of
+    about 1.6% (1.04 / sqrt(registers)).
+
+    Values are told apart by their repr, so hashes are the same in every
+    process and run (unlike hash() on strings). Numbers that are equal
+    count once, as in a set: 1, 1.0 and True are the same value.
+    '''
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision has to be between 4 and 18")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    @classmethod
+    def from_values(cls, values, precision=12):
+        sketch = cls(precision)
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def add(self, value):
+        if value is None:
+            return
+        if isinstance(value, float) and value.is_integer() or isinstance(value, bool):
+            value = int(value)
+        hashed = int.from_bytes(blake2b(repr(value).encode(), digest_size=8).digest(), 'big')
+        rest_bits = 64 - self.precision
+        register = hashed >> rest_bits
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self._registers[register]:
+            self._registers[register] = rank
+
+    def merge(self, other):
+        '''A new sketch of every value added to either one.'''
+        if other.precision != self.precision:
+            raise ValueError("only sketches with the same precision can be merged")
+        merged = DistinctSketch(self.precision)
+        merged._registers = bytearray(map(max, self._registers, other._registers))
+        return merged
+
+    def estimate(self):
+        '''The estimated number of distinct values, as an int.'''
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / math.fsum(2.0 ** -rank for rank in self._registers)
+        empty = self._registers.count(0)
+        if raw <= 2.5 * size and empty:
+            # Few values: counting the empty registers is more accurate
+            return round(size * math.log(size / empty))
+        return round(raw)
+
+
+class QuantileSketch():
+    '''
+    A KLL sketch of the distribution of the values added, for
+    approximate quantiles (medians, percentiles...).
+
+    Values go into a stack of compactors. When a compactor fills up it
+    is sorted and every other value (picked with a coin flip) moves up
+    a level, where each one stands for twice as many values. k decides
+    how big the compactors are: around 3 * k values are kept however
+    many are added, and quantiles are typically within about 1.7 / k
+    in rank of the exact answer (1% for the default of 200). Until
+    that many values have been added the answers are exact.
+
+    Which half of a compactor moves up is picked at random. The default
+    seed is fixed, so the same values give the same answers on every
+    run and in every worker process; pass seed=None for fresh randomness.
+    '''
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self._compactors = [[]]
+        self._size = 0
+        self._random = random.Random(seed)
+        self._max_size = self._capacity_total()
+
+    @classmethod
+    def from_values(cls, values, k=200, seed=0):
+        sketch = cls(k, seed)
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def __len__(self):
+        # How many values the sketch stands for
+        return sum(len(items) << height for height, items in enumerate(self._compactors))
+
+    def _capacity(self, height):
+        depth = len(self._compactors) - height - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _capacity_total(self):
+        return sum(self._capacity(height) for height in range(len(self._compactors)))
+
+    def _grow(self):
+        self._compactors.append([])
+        self._max_size = self._capacity_total()
+
+    def add(self, value):
+        if value is None:
+            return
+        self._compactors[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        for height, items in enumerate(self._compactors):
+            if len(items) < self._capacity(height):
+                continue
+            if height + 1 >= len(self._compactors):
+                self._grow()
+            items.sort()
+            # An odd one out stays behind; half of the rest move up
+            odd = len(items) % 2
+            offset = odd + (self._random.random() < 0.5)
+            self._compactors[height + 1].extend(items[offset::2])
+            del items[odd:]
+            self._size = sum(map(len, self._compactors))
+            if self._size < self._max_size:
+                break
+
+    def merge(self, other):
+        '''A new sketch of every value added to either one.'''
+        merged = QuantileSketch(max(self.k, other.k))
+        merged._random.setstate(self._random.getstate())
+        while len(merged._compactors) < max(len(self._compactors), len(other._compactors)):
+            merged._grow()
+        for sketch in (self, other):
+            for height, items in enumerate(sketch._compactors):
+                merged._compactors[height].extend(items)
+        merged._size = sum(map(len, merged._compactors))
+        while merged._size >= merged._max_size:
+            merged._compress()
+        return merged
+
+    def quantile(self, q):
+        '''
+        The value below which about a fraction q of the values fall.
+
+        Input:
+          q - a number from 0 to 1, or a list of them
+
+        Output:
+          the quantile (None when nothing was added), or a list with one per q
+
+        Modifies:
+          Nothing
+        '''
+        weighted = sorted(
+            (value, 1 << height)
+            for height, items in enumerate(self._compactors) for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+
+        def one(fraction):
+            if not 0 <= fraction <= 1:
+                raise ValueError("q has to be between 0 and 1")
+            if not weighted:
+                return None
+            target = fraction * total
+            seen = 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    return value
+            return weighted[-1][0]
+
+        if isinstance(q, (list, tuple)):
+            return [one(fraction) for fraction in q]
+        return one(q)
@@ -0,0 +1,126 @@
+import math
+
+
+class RunningStats():
+    '''
+    Count, sum, mean, variance, min and max of a stream of numbers,
+    all kept up to date in a single pass without storing the numbers.
+
+    The mean and variance use Welford's update, which doesn't lose
+    precision the way summing squares does, and the sum is compensated
+    (Kahan-Babuska-Neumaier), so adding many small floats to a big
+    total doesn't drop them. Two RunningStats built over separate
+    chunks of a file can be merged into the stats of the whole.
+    '''
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        # Whole numbers add up exactly, so the total stays an int
+        # until the first float arrives
+        self._total = 0
+        self._compensation = 0
+
+    @classmethod
+    def from_values(cls, values):
+        stats = cls()
+        stats.update(values)
+        return stats
+
+    # Methods for adding numbers
+    def add(self, value):
+        '''
+        Folds one more number in.
+
+        Input:
+          value - an int or float
+
+        Output:
+          None
+
+        Modifies:
+          Modifies the stats in place.
+        '''
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        '''
+        Combines these stats with other's, as if every number that went
+        into either had gone into one (Chan et al.'s formula).
+
+        Input:
+          other - another RunningStats
+
+        Output:
+          a new RunningStats; neither input changes
+
+        Modifies:
+          Nothing
+        '''
+        merged = RunningStats()
+        merged.count = self.count + other.count
+        if merged.count:
+            delta = other.mean - self.mean
+            merged.mean = self.mean + delta * other.count / merged.count
+            merged.m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / merged.count
+        merged._total = self._total + other._total
+        merged._compensation = self._compensation + other._compensation
+        merged.min = min(value for value in (self.min, other.min) if value is not None) \
+            if merged.count else None
+        merged.max = max(value for value in (self.max, other.max) if value is not None) \
+            if merged.count else None
+        return merged
+
+    __add__ = merge
+
+    # Properties
+    @property
+    def sum(self):
+        return self._total + self._compensation
+
+    @property
+    def variance(self):
+        '''The sample variance (divided by count - 1); nan below two numbers.'''
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def spread(self):
+        return self.max - self.min
+
+    def describe(self):
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else float('nan'),
+            'std': self.std,
+            'min': self.min,
+            'max': self.max,
+            'sum': self.sum,
+        }
+
+    def __repr__(self):
+        return f"RunningStats({self.describe()})"
@@ -0,0 +1,145 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from phoenixcel.src.column import Column
+
+
+# Layout of a saved dataframe:
+#   8 bytes   MAGIC
+#   8 bytes   length of the header, little-endian
+#   header    JSON: row count, byte order, and for every column its
+#             name, dtype, typecode, categories and where its buffer is
+#   buffers   one contiguous buffer per column, each starting on an
+#             8-byte boundary, so they can be used straight from a mmap
+MAGIC = b'PHXCEL01'
+ALIGNMENT = 8
+
+# Codes and ordinals are kept in 'l' arrays in memory, but 'l' is not
+# the same size everywhere, so on disk they are always 8 bytes.
+DISK_TYPECODES = {
+    'int64': 'q',
+    'float64': 'd',
+    'bool': 'b',
+    'str': 'q',
+    'date': 'q',
+}
+
+
+def _aligned(position):
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save(frame, file_path):
+    '''
+    Writes a dataframe to file_path in the binary columnar layout above.
+
+    Inputs:
+      frame - the DataFrame to save
+      file_path - where to write it
+
+    Outputs:
+      None
+
+    Modifies:
+      Creates or replaces file_path. The new file is written next to it
+      and moved into place, so frames opened from the old file keep
+      reading the old contents.
+
+    Raises:
+      ValueError for columns that hold arbitrary python objects, which
+      have no fixed-size representation
+    '''
+    buffers = []
+    columns = []
+    offset = 0
+    for key, column in frame._dictionary.items():
+        if column.dtype not in DISK_TYPECODES:
+            raise ValueError(
+                f"column {key!r} holds python objects and can't be saved; "
+                "convert it to numbers or strings first"
+            )
+        typecode = DISK_TYPECODES[column.dtype]
+        buffer = array(typecode, column._raw())
+        offset = _aligned(offset)
+        columns.append({
+            'name': key,
+            'dtype': column.dtype,
+            'typecode': typecode,
+            'offset': offset,
+            'length': len(buffer),
+            'categories': column.categories,
+        })
+        buffers.append((offset, buffer))
+        offset += len(buffer) * buffer.itemsize
+
+    header = json.dumps({
+        'length': len(frame),
+        'byteorder': sys.byteorder,
+        'columns': columns,
+    }).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    # Truncating the file in place would pull the pages out from under
+    # any frame that has it memory-mapped (reading one then dies with SIGBUS)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(file_path)), suffix='.tmp'
+    )
+    try:
+        with open(descriptor, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for offset, buffer in buffers:
+                f.write(b'\0' * (data_start + offset - f.tell()))
+                buffer.tofile(f)
+        # mkstemp makes the file private; give it the mode open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temporary_path, 0o666 & ~umask)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load(frame_class, file_path):
+    '''
+    Opens a dataframe saved with save(). The file is memory-mapped, so
+    this only reads the header: each column's values are paged in by the
+    operating system the first time something touches them.
+
+    Inputs:
+      frame_class - the DataFrame class to build
+      file_path - the file to open
+
+    Outputs:
+      A new dataframe whose columns read straight from the mapped file;
+      writing to a column copies it into memory first
+
+    Modifies:
+      Nothing
+    '''
+    with open(file_path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} is not a saved phoenixcel dataframe")
+        header_length, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f"{file_path} was saved on a {header['byteorder']}-endian machine")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+            if any(column['length'] for column in header['columns']) else b''
+
+    data_start = _aligned(len(MAGIC) + 8 + header_length)
+    whole = memoryview(mapped)
+    df = frame_class()
+    for column in header['columns']:
+        itemsize = array(column['typecode']).itemsize
+        start = data_start + column['offset']
+        data = whole[start:start + column['length'] * itemsize].cast(column['typecode'])
+        df._dictionary[column['name']] = Column(column['dtype'], data, column['categories'])
+    return df
@@ -0,0 +1,174 @@
+from datetime import date
+
+import pytest
+
+from phoenixcel.src.column import (
+    Column, infer_dtype, infer_string_dtype, parse_string, parse_strings
+)
+
+
+class TestInferDtype:
+    def test_infers_numbers_and_booleans(self):
+        assert infer_dtype([1, 2, 3]) == 'int64'
+        assert infer_dtype([1.5, 2.5]) == 'float64'
+        assert infer_dtype([True, False]) == 'bool'
+
+    def test_mixed_ints_and_floats_become_floats(self):
+        assert infer_dtype([1, 2.5]) == 'float64'
+
+    def test_anything_else_is_object(self):
+        assert infer_dtype([1, 'a']) == 'object'
+        assert infer_dtype([None, None]) == 'object'
+
+
+class TestInferStringDtype:
+    def test_infers_numbers_from_text(self):
+        assert infer_string_dtype(['1', '22', '-3']) == 'int64'
+        assert infer_string_dtype(['1', '2.5']) == 'float64'
+        assert infer_string_dtype(['True', 'false']) == 'bool'
+
+    def test_keeps_text_that_would_lose_information(self):
+        assert infer_string_dtype(['007', '12']) == 'str'
+        assert infer_string_dtype(['1', '']) == 'str'
+        assert infer_string_dtype(['12/10/2018']) == 'str'
+
+    def test_whole_numbers_too_big_for_int64_stay_text(self):
+        assert infer_string_dtype(['12345678901234567890', '2']) == 'str'
+        assert infer_string_dtype([str(2 ** 63 - 1), str(-2 ** 63)]) == 'int64'
+
+
+class TestParseStrings:
+    def test_parses_a_whole_column(self):
+        column = parse_strings(['1.5', '2'], 'float64')
+        assert column.dtype == 'float64'
+        assert list(column) == [1.5, 2.0]
+
+    def test_parses_dates_with_a_format(self):
+        column = parse_strings(['12/10/2018', '12/10/2018'], ('date', '%m/%d/%Y'))
+        assert column.dtype == 'date'
+        assert list(column) == [date(2018, 12, 10), date(2018, 12, 10)]
+
+    def test_parses_a_single_value_the_same_way(self):
+        assert parse_string('12/10/2018', 'date') == date(2018, 12, 10)
+        assert parse_string('false', 'bool') is False
+        assert parse_string('7', 'str') == '7'
+
+    def test_raises_on_bad_values(self):
+        with pytest.raises(ValueError):
+            parse_string('yes', 'bool')
+        with pytest.raises(ValueError):
+            parse_strings(['1', 'two'], 'int64')
+        with pytest.raises(ValueError):
+            parse_strings(['yes'], 'bool')
+
+    def test_ints_outside_int64_raise_value_error(self):
+        with pytest.raises(ValueError):
+            parse_strings(['1', '12345678901234567890'], 'int64')
+        with pytest.raises(ValueError):
+            parse_string('12345678901234567890', 'int64')
+
+
+class TestColumnFromValues:
+    def test_numbers_are_stored_in_a_typed_array(self):
+        column = Column.from_values([1, 2, 3])
+        assert column.dtype == 'int64'
+        assert column._data.typecode == 'q'
+        assert list(column) == [1, 2, 3]
+
+    def test_strings_are_dictionary_encoded(self):
+        column = Column.from_values(['oriole', 'wren', 'oriole'])
+        assert column.dtype == 'str'
+        assert column.categories == ['oriole', 'wren']
+        assert list(column._data) == [0, 1, 0]
+        assert column[2] == 'oriole'
+
+    def test_booleans_come_back_as_booleans(self):
+        column = Column.from_values([True, False])
+        assert list(column) == [True, False]
+        assert column[0] is True
+
+
+class TestColumnGrowth:
+    def test_extend_keeps_the_dtype(self):
+        column = Column.from_values(['a'])
+        column.extend(['b', 'a'])
+        assert list(column) == ['a', 'b', 'a']
+        assert column.categories == ['a', 'b']
+
+    def test_extend_widens_ints_to_floats(self):
+        column = Column.from_values([1, 2])
+        column.append(2.5)
+        assert column.dtype == 'float64'
+        assert list(column) == [1.0, 2.0, 2.5]
+
+    def test_extend_falls_back_to_object(self):
+        column = Column.from_values([1, 2])
+        column.append('three')
+        assert column.dtype == 'object'
+        assert list(column) == [1, 2, 'three']
+
+
+class TestColumnTake:
+    def test_take_selects_positions(self):
+        column = Column.from_values(['a', 'b', 'c'])
+        taken = column.take([2, 0])
+        assert list(taken) == ['c', 'a']
+        assert taken.dtype == 'str'
+
+
+class TestColumnViews:
+    def test_view_reads_through_a_selection(self):
+        column = Column.from_values(['a', 'b', 'c', 'd'])
+        view = column.view([3, 1])
+        assert list(view) == ['d', 'b']
+        assert view[0] == 'd'
+        assert len(view) == 2
+        assert view._data is column._data
+
+    def test_view_of_a_view_points_at_the_original_buffer(self):
+        column = Column.from_values([10, 20, 30, 40])
+        view = column.view([1, 2, 3]).view([2, 0])
+        assert list(view) == [40, 20]
+        assert view._data is column._data
+
+    def test_slicing_gives_a_view(self):
+        column = Column.from_values([10, 20, 30, 40])
+        assert list(column[1:3]) == [20, 30]
+        assert column[1:3]._data is column._data
+
+    def test_writing_to_a_view_copies_first(self):
+        column = Column.from_values(['a', 'b'])
+        view = column.view([1])
+        view.append('z')
+        assert list(view) == ['b', 'z']
+        assert list(column) == ['a', 'b']
+        assert column.categories == ['a', 'b']
+
+    def test_writing_to_the_parent_leaves_the_view_alone(self):
+        column = Column.from_values([1, 2])
+        shared = column.share()
+        column.append(3)
+        assert list(column) == [1, 2, 3]
+        assert list(shared) == [1, 2]
+
+    def test_appending_to_a_viewed_column_does_not_copy(self):
+        column = Column.from_values([1, 2, 3])
+        view = column.view([2, 0])
+        buffer = column._data
+        column.extend([4, 5])
+        assert column._data is buffer
+        assert list(view) == [3, 1]
+
+    def test_overwriting_a_viewed_column_still_copies(self):
+        column = Column.from_values(['a', 'b'])
+        view = column.view([0])
+        column.append('c')
+        column[0] = 'z'
+        assert list(view) == ['a']
+        assert list(column) == ['z', 'b', 'c']
+
+    def test_factorize_respects_the_selection(self):
+        column = Column.from_values(['a', 'b', 'a', 'c'])
+        codes, uniques = column.view([3, 0, 2]).factorize()
+        assert list(codes) == [0, 1, 1]
+        assert uniques == ['c', 'a']
@@ -1,8 +1,9 @@
 import os
 import pytest
 
+from phoenixcel.src import dataframe
 from phoenixcel.src.dataframe import DataFrame
-from phoenixcel.src.series import Series
+from phoenixcel.src.series import Categorical, Series
 
 
 class TestDataFrameInit:
@@ -56,6 +57,10 @@ class TestDataFrameFromDictionary:
         assert len(df.columns) == 2
         assert df.shape == (2, 2)
 
+    def test_columns_of_different_lengths_are_refused(self):
+        with pytest.raises(ValueError):
+            DataFrame.from_dictionary({'name': ['Alice', 'Bob'], 'age': [30]})
+
 
 class TestDataFrameProperties:
     @pytest.fixture(autouse=True)
@@ -109,6 +114,14 @@ class TestDataFrameSetItem:
         self.df['Job Title'] = new_series
         assert hasattr(self.df, 'job_title')
 
+    def test_setitem_needs_one_value_per_row(self):
+        with pytest.raises(ValueError):
+            self.df['job'] = Series(['Engineer'])
+        with pytest.raises(ValueError):
+            self.df['age'] = Series(['30', '25', '40'])
+        assert self.df.columns == ['name', 'age']
+        assert self.df.shape == (2, 2)
+
 
 class TestDataFrameWhere:
     @pytest.fixture(autouse=True)
@@ -136,6 +149,94 @@ class TestDataFrameAssign:
         result = self.df.assign(age_doubled=lambda row: int(row['age']) * 2)
         assert 'age_doubled' in result.columns
 
+    def test_any_header_can_be_assigned(self):
+        self.df.assign(workers=lambda row: 1, cache=lambda row: 2)
+        assert self.df['workers'] == [1, 1]
+        assert self.df['cache'] == [2, 2]
+
+    def test_later_columns_can_read_earlier_ones(self):
+        self.df.assign(
+            age=lambda row: int(row['age']),
+            next_age=lambda row: row['age'] + 1,
+            label=lambda row: f"{row['name']} {row['next_age']}",
+        )
+        assert self.df['label'] == ['Alice 31', 'Bob 26']
+
+
+class TestDataFrameAssignCache:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({'name': ['Alice', 'Bob'], 'age': [30, 25]})
+        self.calls = calls = []
+        # A closure over the list couldn't be fingerprinted (lists aren't
+        # hashable), so calls are counted through a default argument
+        self.doubled = lambda row, count=calls.append: (count(1), row['age'] * 2)[1]
+
+    def test_unchanged_inputs_reuse_the_column(self):
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        self.df.assign_columns({'again': self.doubled}, cache=True)
+        assert len(self.calls) == 2
+        assert self.df['again'] == [60, 50]
+
+    def test_replacing_a_column_it_reads_recomputes(self):
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        self.df['age'] = [1, 2]
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        assert len(self.calls) == 4
+        assert self.df['doubled'] == [2, 4]
+
+    def test_replacing_other_columns_keeps_the_cache(self):
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        self.df['name'] = ['Carol', 'Dan']
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        assert len(self.calls) == 2
+
+    def test_appending_or_updating_rows_recomputes(self):
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        self.df.append_rows([{'name': 'Carol', 'age': 40}])
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        assert self.df['doubled'] == [60, 50, 80]
+        self.df.update_row(0, {'age': 10})
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        assert self.df['doubled'] == [20, 50, 80]
+        assert len(self.calls) == 2 + 3 + 3
+
+    def test_functions_that_read_no_columns_recompute_after_appends(self):
+        one = lambda row: 1
+        self.df.assign_columns({'one': one}, cache=True)
+        self.df.append_rows([{'name': 'Carol', 'age': 40}])
+        self.df.assign_columns({'one': one}, cache=True)
+        assert self.df['one'] == [1, 1, 1]
+        assert len(list(self.df._rows())) == 3
+
+    def test_methods_of_different_objects_are_kept_apart(self):
+        class Scale():
+            def __init__(self, factor):
+                self.factor = factor
+
+            def apply(self, row):
+                return row['age'] * self.factor
+        self.df.assign_columns({'double': Scale(2).apply, 'triple': Scale(3).apply}, cache=True)
+        assert self.df['triple'] == [90, 75]
+
+    def test_closures_over_different_values_are_kept_apart(self):
+        def times(factor):
+            return lambda row: row['age'] * factor
+        self.df.assign_columns({'double': times(2), 'triple': times(3)}, cache=True)
+        assert self.df['double'] == [60, 50]
+        assert self.df['triple'] == [90, 75]
+
+    def test_cached_columns_are_not_shared_with_later_edits(self):
+        self.df.assign_columns({'doubled': self.doubled}, cache=True)
+        self.df.update_row(0, {'doubled': 0})
+        self.df.assign_columns({'again': self.doubled}, cache=True)
+        assert self.df['again'] == [60, 50]
+
+    def test_nothing_is_cached_by_default(self):
+        self.df.assign(doubled=self.doubled)
+        self.df.assign(doubled=self.doubled)
+        assert len(self.calls) == 4
+
 
 class TestDataFrameGroupBy:
     @pytest.fixture(autouse=True)
@@ -154,4 +255,473 @@ class TestDataFrameGroupBy:
     def test_group_by_groups_correct_items(self):
         grouped = self.df.group_by('department')
         assert len(grouped['Engineering']) == 2
-        assert len(grouped['Sales']) == 1
\ No newline at end of file
+        assert len(grouped['Sales']) == 1
+
+    def test_group_by_keeps_row_positions(self):
+        grouped = self.df.group_by('department')
+        assert list(grouped._indices['Engineering']) == [0, 1]
+        assert grouped['Sales'][0] == {'department': 'Sales', 'salary': '80000'}
+
+    def test_group_by_aggregates_from_columns(self):
+        grouped = self.df.group_by('department')
+        assert grouped.max(on='salary') == {'Engineering': '120000', 'Sales': '80000'}
+
+    def test_groups_are_not_changed_by_later_updates(self):
+        df = DataFrame.from_dictionary({'g': ['a', 'a', 'b'], 'v': [1, 2, 3]})
+        grouped = df.group_by('g')
+        df.update_row(0, {'v': 100, 'g': 'b'})
+        assert grouped.sum(on='v') == {'a': 3, 'b': 3}
+        assert grouped['a'][0] == {'g': 'a', 'v': 1}
+        assert df['v'] == [100, 2, 3]
+
+    def test_group_by_several_columns(self):
+        df = DataFrame.from_dictionary({
+            'activity': ['Alley', 'Alley', 'Alley', 'Sewer'],
+            'year': [2017, 2018, 2018, 2018],
+            'requests': [1, 2, 3, 4]
+        })
+        grouped = df.group_by(['activity', 'year'])
+        assert list(grouped.keys()) == [('Alley', 2017), ('Alley', 2018), ('Sewer', 2018)]
+        assert grouped.sum(on='requests')[('Alley', 2018)] == 5
+
+class TestDataFrameColumnarStorage:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'name': ['Alice', 'Bob'],
+            'age': [30, 25]
+        })
+
+    def test_each_column_is_one_typed_buffer(self):
+        assert self.df._dictionary['age'].dtype == 'int64'
+        assert self.df._dictionary['name'].dtype == 'str'
+
+    def test_rows_are_built_on_demand(self):
+        assert self.df._list == [
+            {'name': 'Alice', 'age': 30},
+            {'name': 'Bob', 'age': 25}
+        ]
+
+    def test_where_keeps_column_types(self):
+        filtered = self.df.where(lambda row: row['age'] > 26)
+        assert filtered._dictionary['age'].dtype == 'int64'
+        assert filtered['name'] == ['Alice']
+
+
+class TestDataFrameReadCSVChunks:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.csv_path = os.path.join(os.path.dirname(__file__), 'test_birds.csv')
+
+    def test_chunks_cover_every_row(self):
+        chunks = list(DataFrame.read_csv_chunks(self.csv_path, chunk_size=8))
+        assert [chunk.shape for chunk in chunks] == [(3, 8), (3, 8), (3, 5)]
+
+    def test_chunks_match_from_csv(self):
+        whole = DataFrame.from_csv(self.csv_path)
+        species = []
+        for chunk in DataFrame.read_csv_chunks(self.csv_path, chunk_size=5):
+            species.extend(chunk['species'])
+        assert species == whole['species']
+
+    def test_chunk_size_must_be_positive(self):
+        with pytest.raises(ValueError):
+            next(DataFrame.read_csv_chunks(self.csv_path, chunk_size=0))
+
+
+class TestDataFrameSchema:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.csv_path = os.path.join(os.path.dirname(__file__), 'test_birds.csv')
+
+    def test_from_csv_infers_numeric_columns(self):
+        df = DataFrame.from_csv(self.csv_path)
+        assert df._dictionary['weight'].dtype == 'float64'
+        assert df._dictionary['species'].dtype == 'str'
+        assert df['weight'][0] == 4.23
+
+    def test_from_csv_can_skip_inference(self):
+        df = DataFrame.from_csv(self.csv_path, infer_schema=False)
+        assert df['weight'][0] == '4.23'
+
+    def test_from_csv_uses_requested_dtypes(self):
+        df = DataFrame.from_csv(self.csv_path, dtypes={'weight': 'str'})
+        assert df['weight'][0] == '4.23'
+
+    def test_requested_dtype_that_does_not_fit_raises(self):
+        with pytest.raises(ValueError):
+            DataFrame.from_csv(self.csv_path, dtypes={'species': 'int64'})
+
+    def test_unknown_dtype_column_raises(self):
+        with pytest.raises(KeyError):
+            DataFrame.from_csv(self.csv_path, dtypes={'wingspan': 'float64'})
+
+    def test_guess_that_fails_past_the_sample_reads_the_column_as_text(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(dataframe, 'PARSE_BATCH_SIZE', 2)
+        path = tmp_path / 'codes.csv'
+        path.write_text('code,count\n1,1\n2,2\n3,3\n1e3,4\n5,5\n')
+        df = DataFrame.from_csv(str(path), sample_size=2)
+        assert df._dictionary['code'].dtype == 'str'
+        assert df['code'] == ['1', '2', '3', '1e3', '5']
+        assert df['count'] == [1, 2, 3, 4, 5]
+
+    def test_every_wrong_guess_is_fixed_in_one_more_pass(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(dataframe, 'PARSE_BATCH_SIZE', 2)
+        path = tmp_path / 'codes.csv'
+        path.write_text('code,zone,count\n1,1,1\n2,2,2\n3,3,3\n1e3,4,4\n5,Z,5\n')
+        passes = []
+        from_csv_rows = DataFrame._from_csv_rows.__func__
+        monkeypatch.setattr(DataFrame, '_from_csv_rows', classmethod(
+            lambda cls, *args: passes.append(1) or from_csv_rows(cls, *args)
+        ))
+        df = DataFrame.from_csv(str(path), sample_size=2)
+        assert len(passes) == 2
+        assert df['zone'] == ['1', '2', '3', '4', 'Z']
+        assert df._dictionary['count'].dtype == 'int64'
+
+    def test_a_wrong_guess_carries_over_to_later_chunks(self, tmp_path):
+        path = tmp_path / 'codes.csv'
+        path.write_text('code\n1\n2\nA\n4\n5\n6\n')
+        chunks = list(DataFrame.read_csv_chunks(str(path), chunk_size=2, sample_size=2))
+        assert [chunk._dictionary['code'].dtype for chunk in chunks] == ['int64', 'str', 'str']
+        assert chunks[2]['code'] == ['5', '6']
+
+    def test_ids_too_big_for_int64_are_read_as_text(self, tmp_path):
+        path = tmp_path / 'ids.csv'
+        path.write_text('id\n12345678901234567890\n2\n')
+        assert DataFrame.from_csv(str(path))['id'] == ['12345678901234567890', '2']
+        path.write_text('id\n1\n2\n12345678901234567890\n')
+        assert DataFrame.from_csv(str(path), sample_size=2)['id'] == ['1', '2', '12345678901234567890']
+        chunks = list(DataFrame.read_csv_chunks(str(path), chunk_size=2, sample_size=2))
+        assert chunks[1]['id'] == ['12345678901234567890']
+
+    def test_text_columns_keep_one_dictionary_across_batches(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(dataframe, 'PARSE_BATCH_SIZE', 2)
+        path = tmp_path / 'names.csv'
+        path.write_text('name\nb\na\nb\nc\na\n')
+        df = DataFrame.from_csv(str(path), sample_size=2)
+        assert df['name'] == ['b', 'a', 'b', 'c', 'a']
+        assert df._dictionary['name'].categories == ['b', 'a', 'c']
+
+    def test_batches_that_match_nothing_are_skipped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(dataframe, 'PARSE_BATCH_SIZE', 2)
+        path = tmp_path / 'counts.csv'
+        path.write_text('count\n1\n2\n3\n4\n5\n')
+        df = DataFrame.from_csv(str(path), where={'count': lambda count: count == 5})
+        assert df['count'] == [5]
+        empty = DataFrame.from_csv(str(path), where={'count': lambda count: count > 9})
+        assert empty.columns == ['count']
+        assert len(empty) == 0
+
+    def test_chunks_share_one_schema(self):
+        chunks = DataFrame.read_csv_chunks(self.csv_path, chunk_size=5)
+        assert {chunk._dictionary['weight'].dtype for chunk in chunks} == {'float64'}
+
+
+class TestDataFrameFromCSVPushdown:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.csv_path = os.path.join(os.path.dirname(__file__), 'test_birds.csv')
+
+    def test_usecols_keeps_only_those_columns(self):
+        df = DataFrame.from_csv(self.csv_path, usecols=['weight', 'species'])
+        assert df.columns == ['species', 'weight']
+
+    def test_where_skips_rows_while_parsing(self):
+        whole = DataFrame.from_csv(self.csv_path)
+        heavy = DataFrame.from_csv(self.csv_path, where={'weight': lambda weight: weight > 5})
+        assert heavy._list == whole.where(lambda row: row['weight'] > 5)._list
+        assert heavy.shape[1] > 0
+
+    def test_where_can_use_a_column_that_is_not_kept(self):
+        df = DataFrame.from_csv(
+            self.csv_path,
+            usecols=['weight'],
+            where={'species': lambda species: species == 'oriole'}
+        )
+        assert df.columns == ['weight']
+        assert df.shape[1] == len(DataFrame.from_csv(self.csv_path).where(
+            lambda row: row['species'] == 'oriole'
+        ))
+
+    def test_wrong_guess_under_a_where_asks_for_a_dtype(self, tmp_path):
+        path = tmp_path / 'ids.csv'
+        path.write_text('id\n0\n1\n2\n3\n4\nx\n9\n')
+        for predicate in (lambda id: id != 2, lambda id: id > 2):
+            with pytest.raises(ValueError, match="'id'"):
+                DataFrame.from_csv(str(path), sample_size=3, where={'id': predicate})
+        with pytest.raises(ValueError, match="'id'"):
+            list(DataFrame.read_csv_chunks(str(path), sample_size=3, where={'id': predicate}))
+        df = DataFrame.from_csv(str(path), sample_size=3, dtypes={'id': 'str'},
+                                where={'id': lambda id: id != '2'})
+        assert df['id'] == ['0', '1', '3', '4', 'x', '9']
+
+    def test_unknown_usecols_raise(self):
+        with pytest.raises(KeyError):
+            DataFrame.from_csv(self.csv_path, usecols=['wingspan'])
+
+    def test_scan_csv_pushes_wheres_into_the_reader(self):
+        plan = DataFrame.scan_csv(self.csv_path) \
+            .assign(heavy=lambda row: row['weight'] > 5) \
+            .where(lambda row: row['species'] == 'oriole') \
+            .select('species', 'heavy')
+        assert plan.explain().splitlines() == [
+            'scan (species, weight)',
+            'filter while parsing (1 condition)',
+            'assign (heavy)',
+            'select (species, heavy)',
+        ]
+        result = plan.collect()
+        eager = DataFrame.from_csv(self.csv_path) \
+            .assign(heavy=lambda row: row['weight'] > 5) \
+            .where(lambda row: row['species'] == 'oriole')
+        assert result['heavy'] == eager['heavy']
+
+
+class TestDataFrameViews:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'name': ['Alice', 'Bob', 'Charlie'],
+            'age': [30, 25, 35]
+        })
+
+    def test_where_shares_the_parent_buffers(self):
+        filtered = self.df.where(lambda row: row['age'] > 26)
+        assert filtered._dictionary['age']._data is self.df._dictionary['age']._data
+        assert filtered['name'] == ['Alice', 'Charlie']
+
+    def test_columns_of_a_filtered_frame_share_one_selection(self):
+        filtered = self.df.where(lambda row: row['age'] > 26).where(lambda row: row['age'] < 32)
+        selections = {id(column._selection) for column in filtered._dictionary.values()}
+        assert len(selections) == 1
+        assert filtered._list == [{'name': 'Alice', 'age': 30}]
+
+    def test_column_returns_a_view(self):
+        view = self.df.column('age')
+        assert list(view[1:]) == [25, 35]
+        assert view._data is self.df._dictionary['age']._data
+
+    def test_filtered_frames_group_by(self):
+        filtered = self.df.where(lambda row: row['age'] > 26)
+        assert filtered.group_by('name').sum(on='age') == {'Alice': 30, 'Charlie': 35}
+
+
+class TestDataFrameSortBy:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'number_column': [1, 5, 2, 4, 3],
+            'letter_column': ['A', 'B', 'B', 'C', 'C']
+        })
+
+    def test_sort_by_one_column(self):
+        ordered = self.df.sort_by('number_column')
+        assert ordered['number_column'] == [1, 2, 3, 4, 5]
+        assert ordered['letter_column'][1] == 'B'
+
+    def test_sort_by_descending(self):
+        assert self.df.sort_by('number_column', descending=True)['number_column'] == [5, 4, 3, 2, 1]
+
+    def test_sort_by_several_columns(self):
+        ordered = self.df.sort_by(['letter_column', 'number_column'], descending=[True, False])
+        assert ordered._list == [
+            {'number_column': 3, 'letter_column': 'C'},
+            {'number_column': 4, 'letter_column': 'C'},
+            {'number_column': 2, 'letter_column': 'B'},
+            {'number_column': 5, 'letter_column': 'B'},
+            {'number_column': 1, 'letter_column': 'A'},
+        ]
+
+    def test_sort_is_stable(self):
+        assert self.df.sort_by('letter_column')['number_column'] == [1, 5, 2, 4, 3]
+
+    def test_missing_values_sort_last_either_way(self):
+        df = DataFrame.from_dictionary({'score': [5, None, 9, 1]})
+        assert df.sort_by('score')['score'] == [1, 5, 9, None]
+        assert df.sort_by('score', descending=True)['score'] == [9, 5, 1, None]
+
+    def test_sort_leaves_the_original_alone(self):
+        self.df.sort_by('number_column')
+        assert self.df['number_column'] == [1, 5, 2, 4, 3]
+
+
+class TestDataFrameTopK:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'site': ['a', 'b', 'c', 'd', 'e'],
+            'score': [3.5, 9.0, 1.0, 7.25, 9.0]
+        })
+
+    def test_top_k_keeps_the_best_rows_in_order(self):
+        assert self.df.top_k('score', 3)['site'] == ['b', 'e', 'd']
+
+    def test_nsmallest(self):
+        assert self.df.nsmallest(2, 'score')['site'] == ['c', 'a']
+
+    def test_nlargest_by_several_columns(self):
+        assert self.df.nlargest(2, ['score', 'site'])['site'] == ['e', 'b']
+
+    def test_missing_values_are_never_the_best(self):
+        df = DataFrame.from_dictionary({'site': ['a', 'b', 'c', 'd'], 'score': [5, None, 9, 1]})
+        assert df.nlargest(2, 'score')['site'] == ['c', 'a']
+        assert df.nsmallest(2, 'score')['site'] == ['d', 'a']
+        assert df.top_k('score', 4)['site'] == ['c', 'a', 'd', 'b']
+
+    def test_k_larger_than_the_frame(self):
+        assert len(self.df.top_k('score', 10)) == 5
+
+
+class TestDataFrameCategorical:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Alley', 'Paving'],
+            'Days': [1, 3, 4, 2],
+        })
+
+    def test_string_columns_come_back_categorical(self):
+        activity = self.df['Activity']
+        assert isinstance(activity, Categorical)
+        assert activity.categories == ['Alley', 'Sewer', 'Paving']
+        assert isinstance(self.df['Days'], Series)
+        assert not isinstance(self.df['Days'], Categorical)
+
+    def test_views_keep_categories(self):
+        activity = self.df.where(lambda row: row['Days'] > 1)['Activity']
+        assert activity == ['Sewer', 'Alley', 'Paving']
+        assert activity.value_counts() == {'Sewer': 1, 'Alley': 1, 'Paving': 1}
+
+    def test_setting_a_categorical_keeps_its_codes(self):
+        self.df['kind'] = Categorical.from_codes([1, 0, 1, 1], ['small', 'big'])
+        column = self.df._dictionary['kind']
+        assert column.dtype == 'str'
+        assert list(column._raw()) == [1, 0, 1, 1]
+        assert self.df['kind'] == ['big', 'small', 'big', 'big']
+
+    def test_group_by_on_a_view_renumbers_codes(self):
+        grouped = self.df.where(lambda row: row['Days'] > 1).group_by('Activity')
+        assert list(grouped.keys()) == ['Sewer', 'Alley', 'Paving']
+        assert grouped.sum('Days') == {'Sewer': 3, 'Alley': 4, 'Paving': 2}
+
+
+class TestDataFrameAppend:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer'],
+            'Days': [1, 3],
+        })
+
+    def test_append_rows_grows_every_column(self):
+        result = self.df.append_rows([{'Activity': 'Paving', 'Days': 2}, {'Activity': 'Alley'}])
+        assert result is self.df
+        assert self.df['Activity'] == ['Alley', 'Sewer', 'Paving', 'Alley']
+        assert self.df['Days'] == [1, 3, 2, None]
+
+    def test_append_rows_widens_dtypes(self):
+        self.df.append_rows([{'Activity': 'Paving', 'Days': 2.5}])
+        assert self.df._dictionary['Days'].dtype == 'float64'
+        assert self.df._dictionary['Activity'].dtype == 'str'
+
+    def test_append_rows_to_an_empty_dataframe(self):
+        df = DataFrame().append_rows([{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}])
+        assert df._dictionary['a'].dtype == 'int64'
+        assert df['b'] == ['x', 'y']
+
+    def test_unknown_columns_raise(self):
+        with pytest.raises(KeyError):
+            self.df.append_rows([{'Activity': 'Paving', 'Weeks': 1}])
+        assert len(self.df) == 2
+
+    def test_views_do_not_see_appended_rows(self):
+        view = self.df.where(lambda row: row['Days'] > 0)
+        self.df.append_rows([{'Activity': 'Paving', 'Days': 2}])
+        assert view['Days'] == [1, 3]
+        assert self.df['Days'] == [1, 3, 2]
+
+    def test_indexes_take_in_new_rows(self):
+        self.df.create_index('Activity')
+        self.df.create_index('Days', kind='sorted')
+        index = self.df._indexes['Activity']
+        self.df.append_rows([{'Activity': 'Alley', 'Days': 2}])
+        assert self.df._indexes['Activity'] is index
+        assert self.df.lookup('Activity', 'Alley')['Days'] == [1, 2]
+        assert self.df.between('Days', 2, 3)['Activity'] == ['Sewer', 'Alley']
+
+    def test_concat(self):
+        other = DataFrame.from_dictionary({'Activity': ['Paving'], 'Days': [2]})
+        partial = DataFrame.from_dictionary({'Activity': ['Curb']})
+        df = DataFrame.concat([self.df, other, partial])
+        assert df['Activity'] == ['Alley', 'Sewer', 'Paving', 'Curb']
+        assert df['Days'] == [1, 3, 2, None]
+        assert self.df['Days'] == [1, 3]
+
+    def test_concat_of_views(self):
+        view = self.df.where(lambda row: row['Activity'] == 'Sewer')
+        df = DataFrame.concat([view, view])
+        assert df['Days'] == [3, 3]
+        assert df['Activity'] == ['Sewer', 'Sewer']
+
+
+class TestDataFrameMaterializeBy:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Alley'],
+            'Days': [1, 3, 4],
+        })
+        self.args = [
+            {'agg': 'sum', 'column': 'Days'},
+            {'agg': 'avg', 'column': 'Days'},
+            {'agg': 'min', 'column': 'Days'},
+            {'agg': 'max', 'column': 'Days'},
+            {'agg': 'count', 'column': 'Days'},
+        ]
+        self.summary = self.df.materialize_by('Activity', *self.args)
+
+    def assert_matches_a_full_regroup(self):
+        assert self.summary.describe() == self.df.group_by('Activity').describe_with(*self.args)
+
+    def test_starts_out_like_describe_with(self):
+        self.assert_matches_a_full_regroup()
+
+    def test_follows_appended_rows(self):
+        self.df.append_rows([{'Activity': 'Paving', 'Days': 2}, {'Activity': 'Sewer', 'Days': 9}])
+        self.assert_matches_a_full_regroup()
+
+    def test_follows_updated_values(self):
+        self.df.update_row(0, {'Days': 7})
+        self.assert_matches_a_full_regroup()
+        assert self.summary.describe()['Alley']['Days min'] == 4
+
+    def test_rescans_every_stale_group(self):
+        self.df.update_row(0, {'Days': 7})
+        self.df.update_row(1, {'Days': 0})
+        self.df.update_row(2, {'Days': 2})
+        self.assert_matches_a_full_regroup()
+
+    def test_follows_rows_moving_between_groups(self):
+        self.df.update_row(1, {'Activity': 'Alley'})
+        self.df.update_row(2, {'Activity': 'Curb', 'Days': 5})
+        self.assert_matches_a_full_regroup()
+        assert 'Sewer' not in self.summary.describe()
+
+    def test_follows_replaced_columns(self):
+        self.df['Days'] = [2, 2, 2]
+        self.assert_matches_a_full_regroup()
+
+    def test_close_stops_following(self):
+        self.summary.close()
+        self.df.append_rows([{'Activity': 'Alley', 'Days': 10}])
+        assert self.summary.describe()['Alley']['Days sum'] == 5
+
+    def test_aggregations_that_cannot_be_kept_up_to_date_raise(self):
+        with pytest.raises(ValueError):
+            self.df.materialize_by('Activity', {'agg': 'var', 'column': 'Days'})
+
+    def test_number_columns_come_back_with_their_buffer(self):
+        days = self.df['Days']
+        assert days._column._data is self.df._dictionary['Days']._data
+        assert days.mul(2).sum() == 16
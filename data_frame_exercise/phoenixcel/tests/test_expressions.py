@@ -0,0 +1,98 @@
+import pytest
+
+from phoenixcel.src.dataframe import DataFrame
+from phoenixcel.src.expressions import Expr, col, lit
+from phoenixcel.src.lazy import columns_read
+
+
+class TestExpressions:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Alley', 'Paving'],
+            'Period Start': ['12/10/2018', '11/26/2017', '11/19/2017', '01/02/2018'],
+            'Days': [1, 3, 4, 2],
+            'Cost': [10.0, 2.5, 4.0, 8.0],
+        })
+
+    def test_arithmetic(self):
+        self.df.assign(double=col('Days') * 2, rate=col('Cost') / col('Days'), less=10 - col('Days'))
+        assert self.df['double'] == [2, 6, 8, 4]
+        assert self.df['rate'] == [10.0, 2.5 / 3, 1.0, 4.0]
+        assert self.df['less'] == [9, 7, 6, 8]
+
+    def test_string_slices_stay_dictionary_encoded(self):
+        self.df.assign(year=col('Period Start').str[-4:])
+        assert self.df['year'] == ['2018', '2017', '2017', '2018']
+        column = self.df._dictionary['year']
+        assert column.dtype == 'str'
+        assert column.categories == ['2018', '2017']
+
+    def test_concatenation_of_columns(self):
+        self.df.assign(label=col('Activity') + ' (' + col('Period Start').str[-4:] + ')')
+        assert self.df['label'][0] == 'Alley (2018)'
+
+    def test_where_with_comparisons_and_combinators(self):
+        subset = self.df.where((col('Activity') == 'Alley') & (col('Days') > 1))
+        assert subset['Days'] == [4]
+        subset = self.df.where((col('Activity') == 'Sewer') | ~(col('Cost') < 5))
+        assert subset['Activity'] == ['Alley', 'Sewer', 'Paving']
+
+    def test_where_on_a_view(self):
+        subset = self.df.where(col('Days') > 1).where(col('Activity').str.startswith('A'))
+        assert subset['Period Start'] == ['11/19/2017']
+
+    def test_isin_and_cast(self):
+        subset = self.df.where(col('Activity').isin({'Sewer', 'Paving'}))
+        assert subset['Days'] == [3, 2]
+        self.df.assign(year=col('Period Start').str[-4:].cast(int))
+        assert self.df['year'] == [2018, 2017, 2017, 2018]
+
+    def test_per_category_skips_strings_no_row_holds(self):
+        df = DataFrame.from_dictionary({'n': ['1', 'x', '2', '1', '2']})
+        subset = df.where(col('n') != 'x')
+        subset.assign(number=col('n').cast(int), padded=col('n').apply(lambda n: n.zfill(2)))
+        assert subset['number'] == [1, 2, 1, 2]
+        assert subset['padded'] == ['01', '02', '01', '02']
+        assert 'x' not in subset._dictionary['padded'].categories
+
+    def test_errors_in_user_functions_are_raised(self):
+        with pytest.raises(ZeroDivisionError):
+            self.df.assign(broken=col('Activity').apply(lambda value: 1 / 0))
+
+    def test_expr_is_abstract(self):
+        with pytest.raises(TypeError):
+            Expr()
+
+    def test_expressions_can_be_called_on_rows(self):
+        expression = (col('Days') + lit(1)) * 2
+        assert expression({'Days': 3}) == 8
+
+    def test_using_an_expression_as_a_bool_is_an_error(self):
+        with pytest.raises(TypeError):
+            (col('Days') > 1) and (col('Days') < 3)
+
+    def test_columns_read(self):
+        expression = (col('Activity') == 'Alley') & (col('Days') > lit(1))
+        assert expression.columns() == {'Activity', 'Days'}
+        assert columns_read(expression) == {'Activity', 'Days'}
+
+    def test_lazy_frames_accept_expressions(self):
+        result = (
+            self.df.lazy()
+            .assign(year=col('Period Start').str[-4:])
+            .where(col('Activity') == 'Alley')
+            .select('year', 'Days')
+            .collect()
+        )
+        assert result.columns == ['year', 'Days']
+        assert result['year'] == ['2018', '2017']
+
+    def test_lazy_frames_mix_expressions_and_functions(self):
+        result = (
+            self.df.lazy()
+            .where(col('Days') > 1)
+            .where(lambda row: row['Activity'] != 'Paving')
+            .collect()
+        )
+        assert result['Days'] == [3, 4]
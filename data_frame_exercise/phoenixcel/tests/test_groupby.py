@@ -1,6 +1,7 @@
 import sys
 import os
 import pytest
+from datetime import date, timedelta
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from groupby import GroupBy
@@ -94,6 +95,10 @@ class TestGroupBySpread:
         assert result['A'] == 10
         assert result['B'] == 20
 
+    def test_spread_of_dates_is_a_timedelta(self):
+        grouped = GroupBy({'A': [{'day': date(2018, 12, 10)}, {'day': date(2018, 11, 26)}]})
+        assert grouped.spread(on='day') == {'A': timedelta(days=14)}
+
 
 class TestGroupByAggregate:
     @pytest.fixture(autouse=True)
@@ -158,4 +163,79 @@ class TestGroupByPrintCute:
             success = True
         except Exception:
             success = False
-        assert success
\ No newline at end of file
+        assert success
+
+class TestGroupByFromColumns:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        from phoenixcel.src.column import Column
+        self.grouped = GroupBy.from_columns({
+            'key': Column.from_values(['A', 'B', 'A', 'B']),
+            'value': Column.from_values([10, 30, 20, 50])
+        }, ['key'])
+
+    def test_kernels_agree_with_aggregate(self):
+        for name in ['sum', 'average', 'count', 'min', 'max', 'spread', 'first', 'last']:
+            using_kernel = getattr(self.grouped, name)(on='value')
+            using_rows = getattr(GroupBy(self.grouped), name)(on='value')
+            assert using_kernel == using_rows
+
+    def test_var_is_sample_variance(self):
+        assert self.grouped.var(on='value') == {'A': 50.0, 'B': 200.0}
+
+    def test_reductions_still_need_a_column(self):
+        with pytest.raises(Exception):
+            self.grouped.sum()
+
+
+class TestGroupByDescribeWithFused:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        from phoenixcel.src.column import Column
+        self.grouped = GroupBy.from_columns({
+            'key': Column.from_values(['A', 'B', 'A', 'B', 'A']),
+            'value': Column.from_values([10, 30, 20, 50, 60])
+        }, ['key'])
+        self.aggregations = [
+            {'agg': 'sum', 'column': 'value'},
+            {'agg': 'average', 'column': 'value'},
+            {'agg': 'count', 'column': 'value'},
+            {'agg': 'spread', 'column': 'value'},
+            {'agg': 'var', 'column': 'value'},
+            {'agg': 'aggregate', 'column': 'value', 'using_func': sorted},
+        ]
+
+    def test_fused_description_matches_one_at_a_time(self):
+        fused = self.grouped.describe_with(*self.aggregations)
+        one_at_a_time = GroupBy(self.grouped).describe_with(*self.aggregations)
+        assert fused == one_at_a_time
+        assert fused['A'] == {
+            'value sum': 90,
+            'value average': 30,
+            'value count': 3,
+            'value spread': 50,
+            'value var': 700.0,
+            'value sorted': [10, 20, 60],
+        }
+
+    def test_scans_each_column_once(self, monkeypatch):
+        groupby_module = sys.modules[GroupBy.__module__]
+        calls = []
+        original = groupby_module.segment_states
+
+        def counting(*args):
+            calls.append(args[3])
+            return original(*args)
+
+        monkeypatch.setattr(groupby_module, 'segment_states', counting)
+        self.grouped.describe_with(*self.aggregations)
+        assert calls == [{'sum', 'count', 'min', 'max', 'mean', 'm2', 'values'}]
+
+    def test_overridden_aggregations_are_respected(self):
+        class Doubled(GroupBy):
+            def sum(self, on=None):
+                return {key: 2 * value for key, value in super().sum(on=on).items()}
+
+        grouped = Doubled.from_columns(self.grouped._columns, ['key'])
+        result = grouped.describe_with({'agg': 'sum', 'column': 'value'})
+        assert result['A'] == {'value sum': 180}
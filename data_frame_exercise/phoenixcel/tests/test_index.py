@@ -0,0 +1,109 @@
+from datetime import date
+
+import pytest
+
+from phoenixcel.src.column import Column
+from phoenixcel.src.dataframe import DataFrame
+from phoenixcel.src.index import HashIndex, SortedIndex
+
+
+class TestHashIndex:
+    def test_lookup_finds_every_position(self):
+        index = HashIndex(Column.from_values(['a', 'b', 'a']))
+        assert list(index.lookup('a')) == [0, 2]
+        assert list(index.lookup('z')) == []
+
+    def test_extend_adds_new_rows(self):
+        index = HashIndex(Column.from_values(['a']))
+        index.extend(1, ['b', 'a'])
+        assert list(index.lookup('a')) == [0, 2]
+
+    def test_replace_moves_a_row(self):
+        index = HashIndex(Column.from_values(['a', 'b', 'a']))
+        index.replace(0, 'a', 'b')
+        assert list(index.lookup('a')) == [2]
+        assert list(index.lookup('b')) == [0, 1]
+
+    def test_range_lookups_are_refused(self):
+        with pytest.raises(TypeError):
+            HashIndex(Column.from_values([1])).between(0, 2)
+
+
+class TestSortedIndex:
+    def test_between_is_inclusive(self):
+        index = SortedIndex(Column.from_values([5, 1, 3, 9, 3]))
+        assert list(index.between(3, 5)) == [2, 4, 0]
+
+    def test_missing_values_are_left_out(self):
+        index = SortedIndex(Column.from_values([2, None, 1]))
+        assert list(index.between(0, 10)) == [2, 0]
+
+    def test_extend_keeps_the_order(self):
+        index = SortedIndex(Column.from_values([5, 1]))
+        index.extend(2, [3, 1])
+        assert list(index.between(1, 3)) == [1, 3, 2]
+
+    def test_replace_keeps_the_order(self):
+        index = SortedIndex(Column.from_values([5, 1, 3, None]))
+        index.replace(0, 5, 3)
+        index.replace(3, None, 2)
+        assert list(index.between(0, 10)) == [1, 3, 0, 2]
+
+    def test_lookup_of_none_finds_the_missing_rows(self):
+        index = SortedIndex(Column.from_values([None, 1, None]))
+        assert list(index.lookup(None)) == [0, 2]
+        index.extend(3, [None, 2])
+        index.replace(0, None, 4)
+        index.replace(1, 1, None)
+        assert list(index.lookup(None)) == [1, 2, 3]
+        assert list(index.between(0, 10)) == [4, 0]
+
+
+class TestDataFrameIndexes:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Alley', 'Curb'],
+            'Period Start': [date(2018, 1, 1), date(2018, 2, 1), date(2018, 3, 1), date(2018, 4, 1)],
+        })
+
+    def test_lookup_with_a_hash_index(self):
+        self.df.create_index('Activity')
+        assert self.df.lookup('Activity', 'Alley')['Period Start'] == [date(2018, 1, 1), date(2018, 3, 1)]
+
+    def test_between_with_a_sorted_index(self):
+        self.df.create_index('Period Start', kind='sorted')
+        found = self.df.between('Period Start', date(2018, 2, 1), date(2018, 3, 15))
+        assert found['Activity'] == ['Sewer', 'Alley']
+
+    def test_lookups_without_an_index_scan(self):
+        assert self.df.lookup('Activity', 'Curb').shape == (2, 1)
+        assert len(self.df.between('Period Start', date(2018, 3, 1), date(2019, 1, 1))) == 2
+
+    def test_index_follows_setitem(self):
+        self.df.create_index('Activity')
+        self.df['Activity'] = ['Tree', 'Tree', 'Alley', 'Curb']
+        assert len(self.df.lookup('Activity', 'Tree')) == 2
+        assert self.df._indexes['Activity'].kind == 'hash'
+
+    def test_index_follows_assign(self):
+        self.df.create_index('Activity', kind='sorted')
+        self.df.assign(Activity=lambda row: row['Activity'].upper())
+        assert len(self.df.lookup('Activity', 'ALLEY')) == 2
+
+    @pytest.mark.parametrize('kind', [None, 'hash', 'sorted'])
+    def test_lookup_of_none_does_not_depend_on_the_index(self, kind):
+        df = DataFrame.from_dictionary({'score': [5, None, 9, None], 'site': ['a', 'b', 'c', 'd']})
+        if kind is not None:
+            df.create_index('score', kind=kind)
+        assert df.lookup('score', None)['site'] == ['b', 'd']
+
+    def test_unknown_kind_is_refused(self):
+        with pytest.raises(ValueError):
+            self.df.create_index('Activity', kind='bitmap')
+
+    def test_update_row_keeps_indexes_current(self):
+        self.df.create_index('Activity')
+        self.df.update_row(1, {'Activity': 'Alley'})
+        assert len(self.df.lookup('Activity', 'Alley')) == 3
+        assert len(self.df.lookup('Activity', 'Sewer')) == 0
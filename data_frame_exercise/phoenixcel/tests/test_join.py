@@ -0,0 +1,110 @@
+import pytest
+
+from phoenixcel.src.dataframe import DataFrame
+from phoenixcel.src.join import can_merge, hash_join, merge_join
+
+
+class TestJoinAlgorithms:
+    @pytest.mark.parametrize('join', [hash_join, merge_join])
+    def test_inner_pairs_every_match(self, join):
+        assert join([1, 2, 2, 3], [2, 2, 3, 4], 'inner') == (
+            [1, 1, 2, 2, 3], [0, 1, 0, 1, 2]
+        )
+
+    @pytest.mark.parametrize('join', [hash_join, merge_join])
+    def test_left_keeps_unmatched_left_rows(self, join):
+        assert join([1, 2, 3], [2], 'left') == ([0, 1, 2], [None, 0, None])
+
+    @pytest.mark.parametrize('join', [hash_join, merge_join])
+    def test_outer_adds_unmatched_right_rows(self, join):
+        assert join([1, 2], [2, 5], 'outer') == ([0, 1, None], [None, 0, 1])
+
+    def test_hash_join_builds_on_either_side_with_the_same_result(self):
+        small, large = ['b', 'a'], ['a', 'c', 'b', 'a']
+        left, right = hash_join(small, large, 'inner')
+        assert list(zip(left, right)) == [(0, 2), (1, 0), (1, 3)]
+        left, right = hash_join(large, small, 'inner')
+        assert list(zip(left, right)) == [(0, 1), (2, 0), (3, 1)]
+
+    @pytest.mark.parametrize('join', [hash_join, merge_join])
+    def test_none_keys_never_match(self, join):
+        assert join([None, 1], [None, 1], 'inner') == ([1], [1])
+        assert join([1, None, 2], [None, 2], 'left') == ([0, 1, 2], [None, None, 1])
+
+    @pytest.mark.parametrize('join', [hash_join, merge_join])
+    def test_none_inside_a_run_of_equal_keys(self, join):
+        assert join([1, None, 1], [1], 'inner') == ([0, 2], [0, 0])
+        assert join([1], [1, None, 1, 2], 'inner') == ([0, 0], [0, 2])
+
+    def test_can_merge_only_sorted_keys(self):
+        assert can_merge([1, 2, 2], [1, 3])
+        assert can_merge([None, 1, None, 2], [1])
+        assert not can_merge([2, 1], [1])
+        assert not can_merge([1, 'a'], [1])
+
+
+class TestDataFrameJoin:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.metrics = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Alley', 'Curb'],
+            'Days': [1.0, 2.0, 3.0, 4.0],
+        })
+        self.lookup = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Tree'],
+            'Department': ['Streets', 'Water', 'Parks'],
+        })
+
+    def test_inner_join(self):
+        joined = self.metrics.join(self.lookup, on='Activity')
+        assert joined.columns == ['Activity', 'Days', 'Department']
+        assert joined['Department'] == ['Streets', 'Water', 'Streets']
+
+    def test_inner_join_views_the_inputs(self):
+        joined = self.metrics.join(self.lookup, on='Activity')
+        assert joined._dictionary['Days']._data is self.metrics._dictionary['Days']._data
+
+    def test_left_join_fills_in_none(self):
+        joined = self.metrics.join(self.lookup, on='Activity', how='left')
+        assert joined['Department'] == ['Streets', 'Water', 'Streets', None]
+
+    def test_outer_join_keeps_both_sides(self):
+        joined = self.metrics.join(self.lookup, on='Activity', how='outer')
+        assert joined['Activity'] == ['Alley', 'Sewer', 'Alley', 'Curb', 'Tree']
+        assert joined['Days'] == [1.0, 2.0, 3.0, 4.0, None]
+
+    def test_merge_and_hash_agree(self):
+        left = self.metrics.sort_by('Activity')
+        by_merge = left.join(self.lookup, on='Activity', how='outer', method='merge')
+        by_hash = left.join(self.lookup, on='Activity', how='outer', method='hash')
+        assert by_merge._list == by_hash._list
+
+    def test_default_method_agrees_with_hash_on_none_keys(self):
+        left = DataFrame.from_dictionary({'k': [1, None, 1], 'v': [10, 20, 30]})
+        right = DataFrame.from_dictionary({'k': [1, None, 1, 2], 'w': [100, 200, 300, 400]})
+        for how in ('inner', 'left', 'outer'):
+            by_default = left.join(right, on='k', how=how)
+            by_hash = left.join(right, on='k', how=how, method='hash')
+            assert by_default._list == by_hash._list
+        assert len(left.join(right, on='k')) == 4
+
+    def test_merge_on_unsorted_frames_raises(self):
+        with pytest.raises(ValueError):
+            self.metrics.join(self.lookup, on='Activity', method='merge')
+
+    def test_clashing_column_names_get_a_suffix(self):
+        other = DataFrame.from_dictionary({'Activity': ['Alley'], 'Days': [9.0]})
+        joined = self.metrics.join(other, on='Activity')
+        assert joined.columns == ['Activity', 'Days', 'Days_right']
+
+    def test_join_on_several_columns(self):
+        left = DataFrame.from_dictionary({'a': [1, 1, 2], 'b': ['x', 'y', 'x'], 'v': [1, 2, 3]})
+        right = DataFrame.from_dictionary({'a': [1, 2], 'b': ['y', 'x'], 'w': [10, 20]})
+        assert left.join(right, on=['a', 'b'])._list == [
+            {'a': 1, 'b': 'y', 'v': 2, 'w': 10},
+            {'a': 2, 'b': 'x', 'v': 3, 'w': 20},
+        ]
+
+    def test_unknown_how_is_refused(self):
+        with pytest.raises(ValueError):
+            self.metrics.join(self.lookup, on='Activity', how='sideways')
@@ -0,0 +1,92 @@
+import math
+
+import pytest
+
+from phoenixcel.src.kernels import (
+    segment_count, segment_first, segment_last, segment_max, segment_mean,
+    segment_min, segment_spread, segment_sum, segment_variance, variance,
+    add_group, add_value, merge_partials, remove_value, rescan_group, segment_states
+)
+
+
+CODES = [0, 1, 0, 1, 0]
+VALUES = [10, 30, 20, 50, 60]
+
+
+class TestSegmentKernels:
+    def test_count(self):
+        assert segment_count(CODES, VALUES, 2) == [3, 2]
+
+    def test_sum(self):
+        assert segment_sum(CODES, VALUES, 2) == [90, 80]
+
+    def test_mean(self):
+        assert segment_mean(CODES, VALUES, 2) == [30, 40]
+
+    def test_min_and_max(self):
+        assert segment_min(CODES, VALUES, 2) == [10, 30]
+        assert segment_max(CODES, VALUES, 2) == [60, 50]
+
+    def test_spread(self):
+        assert segment_spread(CODES, VALUES, 2) == [50, 20]
+
+    def test_first_and_last(self):
+        assert segment_first(CODES, VALUES, 2) == [10, 30]
+        assert segment_last(CODES, VALUES, 2) == [60, 50]
+
+    def test_variance_matches_the_textbook_formula(self):
+        assert segment_variance(CODES, VALUES, 2) == [700.0, 200.0]
+
+    def test_variance_of_one_value_is_nan(self):
+        assert math.isnan(variance([4]))
+
+
+class TestMergePartials:
+    def test_merging_chunks_matches_one_scan(self):
+        states = {'count', 'sum', 'min', 'max', 'first', 'last', 'mean', 'm2'}
+        whole = segment_states(CODES, VALUES, 2, states)
+        first_half = segment_states(CODES[:2], VALUES[:2], 2, states)
+        second_half = segment_states([0, 1, 0], VALUES[2:], 2, states)
+        keys, merged = merge_partials([
+            (['a', 'b'], {'value': first_half}),
+            (['a', 'b'], {'value': second_half}),
+        ])
+        assert keys == ['a', 'b']
+        for name in states:
+            assert merged['value'][name] == pytest.approx(whole[name])
+
+    def test_new_groups_are_added_in_order(self):
+        keys, merged = merge_partials([
+            (['a'], {'value': {'count': [2]}}),
+            (['b', 'a'], {'value': {'count': [1, 3]}}),
+        ])
+        assert keys == ['a', 'b']
+        assert merged['value']['count'] == [5, 1]
+
+
+class TestRowByRowState:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.state = segment_states(CODES, VALUES, 2, {'count', 'sum', 'min', 'max'})
+
+    def test_adding_a_value(self):
+        add_value(self.state, 1, 5)
+        assert self.state['count'] == [3, 3]
+        assert self.state['sum'] == [90, 85]
+        assert self.state['min'] == [10, 5]
+
+    def test_removing_a_value_that_is_not_the_min_or_max(self):
+        assert not remove_value(self.state, 0, 20)
+        assert self.state['count'] == [2, 2]
+        assert self.state['sum'] == [70, 80]
+
+    def test_removing_the_min_asks_for_a_rescan(self):
+        assert remove_value(self.state, 0, 10)
+        rescan_group(self.state, 0, [20, 60])
+        assert self.state['min'] == [20, 30]
+
+    def test_a_new_group_starts_empty(self):
+        add_group(self.state)
+        add_value(self.state, 2, 7)
+        assert self.state['min'][2] == self.state['max'][2] == 7
+        assert self.state['count'][2] == 1
@@ -0,0 +1,121 @@
+import pytest
+
+from phoenixcel.src.dataframe import DataFrame
+from phoenixcel.src.lazy import columns_read
+
+
+class TestColumnsRead:
+    def test_finds_subscripted_columns(self):
+        assert columns_read(lambda row: f'{row["Activity"]} ({row["year"]})') == {'Activity', 'year'}
+
+    def test_finds_get_calls(self):
+        assert columns_read(lambda row: row.get('year', 0) + 1) == {'year'}
+
+    def test_gives_up_on_computed_keys(self):
+        key = 'year'
+        assert columns_read(lambda row: row[key]) is None
+
+    def test_gives_up_when_the_row_is_passed_along(self):
+        assert columns_read(lambda row: len(row)) is None
+
+    def test_gives_up_when_the_row_is_captured(self):
+        assert columns_read(lambda row: [row[k] for k in 'ab']) is None
+
+    def test_gives_up_on_things_that_are_not_functions(self):
+        assert columns_read(len) is None
+
+    def test_gives_up_on_bound_methods(self):
+        class Check():
+            def slow(self, row):
+                return row['days'] > 2
+        assert columns_read(Check().slow) is None
+
+
+class TestLazyFrame:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Alley'],
+            'Period Start': ['12/10/2018', '11/26/2017', '11/19/2017'],
+            'Days': ['1', '2.5', '4'],
+        })
+        self.calls = []
+
+    def pipeline(self, frame):
+        def year(row):
+            self.calls.append(row['Period Start'])
+            return row['Period Start'][-4:]
+
+        return frame \
+            .assign(year=year) \
+            .assign(activity_year=lambda row: f'{row["Activity"]} ({row["year"]})') \
+            .assign(days=lambda row: float(row['Days'])) \
+            .where(lambda row: row['Activity'] == 'Alley')
+
+    def test_collect_matches_the_eager_pipeline(self):
+        lazy = self.pipeline(self.df.lazy()).collect()
+        eager = self.pipeline(DataFrame.from_dictionary({
+            key: self.df[key] for key in self.df.columns
+        }))
+        assert lazy._list == eager._list
+
+    def test_where_runs_before_unrelated_assigns(self):
+        self.pipeline(self.df.lazy()).collect()
+        assert self.calls == ['12/10/2018', '11/19/2017']
+
+    def test_consecutive_assigns_are_fused(self):
+        plan = self.pipeline(self.df.lazy()).explain()
+        assert plan.splitlines() == [
+            'scan (all columns)',
+            'where (1 condition)',
+            'assign (year, activity_year, days)',
+        ]
+
+    def test_select_prunes_assigns_and_columns(self):
+        plan = self.pipeline(self.df.lazy()).select('activity_year').explain()
+        assert plan.splitlines() == [
+            'scan (Activity, Period Start)',
+            'where (1 condition)',
+            'assign (year, activity_year)',
+            'select (activity_year)',
+        ]
+
+    def test_select_returns_the_requested_columns(self):
+        result = self.pipeline(self.df.lazy()).select('activity_year', 'days').collect()
+        assert result.columns == ['activity_year', 'days']
+        assert result['activity_year'] == ['Alley (2018)', 'Alley (2017)']
+
+    def test_where_stays_after_the_assign_it_reads(self):
+        plan = self.df.lazy() \
+            .assign(days=lambda row: float(row['Days'])) \
+            .where(lambda row: row['days'] > 2) \
+            .explain()
+        assert plan.splitlines()[1:] == ['assign (days)', 'where (1 condition)']
+
+    def test_steps_that_read_no_columns_see_every_row(self):
+        result = self.df.lazy().where(lambda row: True).assign(one=lambda row: 1).collect()
+        assert len(result) == 3
+        assert result['one'] == [1, 1, 1]
+
+    def test_a_select_of_only_new_columns_keeps_every_row(self):
+        result = self.df.lazy().assign(one=lambda row: 1).select('one').collect()
+        assert result['one'] == [1, 1, 1]
+
+    def test_method_predicates_stay_after_the_assign_they_read(self):
+        class Check():
+            def slow(self, row):
+                return row['days'] > 2
+        result = self.df.lazy() \
+            .assign(days=lambda row: float(row['Days'])) \
+            .where(Check().slow) \
+            .collect()
+        assert result['days'] == [2.5, 4.0]
+
+    def test_collect_leaves_the_source_alone(self):
+        self.pipeline(self.df.lazy()).collect()
+        assert self.df.columns == ['Activity', 'Period Start', 'Days']
+        assert self.df.shape == (3, 3)
+
+    def test_group_by_collects_first(self):
+        grouped = self.pipeline(self.df.lazy()).group_by('activity_year')
+        assert grouped.sum(on='days') == {'Alley (2018)': 1.0, 'Alley (2017)': 4.0}
@@ -0,0 +1,107 @@
+import multiprocessing
+
+import pytest
+
+from phoenixcel.src import parallel
+from phoenixcel.src.dataframe import DataFrame
+from phoenixcel.src.parallel import partitions
+
+
+requires_fork = pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(),
+    reason="parallel execution needs the fork start method"
+)
+
+
+class TestPartitions:
+    def test_partitions_cover_every_row_in_order(self):
+        assert partitions(10, 3) == [(0, 4), (4, 7), (7, 10)]
+
+    def test_never_more_partitions_than_rows(self):
+        assert partitions(2, 8) == [(0, 1), (1, 2)]
+
+
+@requires_fork
+class TestParallelExecution:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'activity': ['Alley', 'Sewer'] * 50,
+            'days': list(range(100))
+        })
+
+    def test_parallel_assign_matches_serial(self):
+        offset = 7
+        self.df.assign_columns({'shifted': lambda row: row['days'] + offset}, workers=3)
+        assert self.df['shifted'] == [day + offset for day in range(100)]
+
+    def test_parallel_assign_uses_one_pool_per_call(self, monkeypatch):
+        pools = []
+        map_partitions = parallel.map_partitions
+        monkeypatch.setattr(parallel, 'map_partitions', lambda *args: pools.append(1) or map_partitions(*args))
+        self.df.assign_columns({
+            'double': lambda row: row['days'] * 2,
+            'triple': lambda row: row['days'] * 3,
+        }, workers=2)
+        assert len(pools) == 1
+        assert self.df['triple'][:3] == [0, 3, 6]
+
+    def test_parallel_where_matches_serial(self):
+        parallel = self.df.where(lambda row: row['days'] % 3 == 0, workers=4)
+        serial = self.df.where(lambda row: row['days'] % 3 == 0)
+        assert parallel._list == serial._list
+
+    def test_parallel_where_on_a_filtered_frame(self):
+        alleys = self.df.where(lambda row: row['activity'] == 'Alley')
+        result = alleys.where(lambda row: row['days'] > 90, workers=2)
+        assert result['days'] == [92, 94, 96, 98]
+
+
+class TestDescribeBy:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'activity': ['Alley', 'Sewer', 'Alley', 'Curb', 'Sewer'] * 20,
+            'days': [float(day % 17) for day in range(100)]
+        })
+        self.aggregations = [
+            {'agg': 'sum', 'column': 'days'},
+            {'agg': 'average', 'column': 'days'},
+            {'agg': 'count', 'column': 'days'},
+            {'agg': 'spread', 'column': 'days'},
+            {'agg': 'first', 'column': 'days'},
+            {'agg': 'last', 'column': 'days'},
+            {'agg': 'aggregate', 'column': 'days', 'using_func': sorted},
+        ]
+
+    def test_matches_describe_with(self):
+        expected = self.df.group_by('activity').describe_with(*self.aggregations)
+        assert self.df.describe_by('activity', *self.aggregations) == expected
+
+    @requires_fork
+    def test_parallel_partials_merge_to_the_same_result(self):
+        expected = self.df.describe_by('activity', *self.aggregations)
+        result = self.df.describe_by('activity', *self.aggregations, workers=3)
+        assert list(result.keys()) == list(expected.keys())
+        assert result == expected
+
+    @requires_fork
+    def test_parallel_variance_merges(self):
+        var = {'agg': 'var', 'column': 'days'}
+        expected = self.df.group_by('activity').var(on='days')
+        result = self.df.describe_by('activity', var, workers=4)
+        for key, value in expected.items():
+            assert result[key]['days var'] == pytest.approx(value)
+
+    @requires_fork
+    def test_parallel_sketches_merge(self):
+        args = [
+            {'agg': 'approx_distinct', 'column': 'days'},
+            {'agg': 'approx_quantile', 'column': 'days', 'q': 0.5},
+        ]
+        expected = self.df.describe_by('activity', *args)
+        assert self.df.describe_by('activity', *args, workers=3) == expected
+
+    def test_unknown_aggregations_are_refused(self):
+        with pytest.raises(ValueError):
+            self.df.describe_by('activity', {'agg': 'median', 'column': 'days'})
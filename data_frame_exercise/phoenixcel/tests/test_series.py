@@ -1,9 +1,11 @@
+import math
 import sys
 import os
 import pytest
+from array import array
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from series import Series
+from series import Categorical, Series
 
 
 class TestSeriesInit:
@@ -86,4 +88,137 @@ class TestSeriesListMethods:
     def test_iteration_works(self):
         s = Series([1, 2, 3])
         result = [x * 2 for x in s]
-        assert result == [2, 4, 6]
\ No newline at end of file
+        assert result == [2, 4, 6]
+
+class TestCategorical:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.s = Categorical(['Alley', 'Sewer', 'Alley', 'Paving'])
+
+    def test_is_a_series_of_the_values(self):
+        assert isinstance(self.s, Series)
+        assert self.s == ['Alley', 'Sewer', 'Alley', 'Paving']
+
+    def test_codes_and_categories(self):
+        assert list(self.s.codes) == [0, 1, 0, 2]
+        assert self.s.categories == ['Alley', 'Sewer', 'Paving']
+
+    def test_rows_share_category_objects(self):
+        s = Categorical.from_codes([1, 1, 0], ['Alley', 'Sewer'])
+        assert s == ['Sewer', 'Sewer', 'Alley']
+        assert s[0] is s[1]
+
+    def test_eq_ne_and_isin(self):
+        assert self.s.eq('Alley') == [True, False, True, False]
+        assert self.s.ne('Alley') == [False, True, False, True]
+        assert self.s.isin({'Sewer', 'Paving'}) == [False, True, False, True]
+
+    def test_value_counts(self):
+        assert self.s.value_counts() == {'Alley': 2, 'Sewer': 1, 'Paving': 1}
+
+    def test_apply_runs_once_per_category(self):
+        calls = []
+
+        def shout(value):
+            calls.append(value)
+            return value.upper()
+        assert self.s.apply(shout) == ['ALLEY', 'SEWER', 'ALLEY', 'PAVING']
+        assert len(calls) == 3
+
+    def test_apply_skips_categories_no_row_holds(self):
+        s = Categorical.from_codes([1, 1], ['n/a', '7'])
+        assert s.apply(int) == [7, 7]
+
+    def test_list_changes_refresh_the_codes(self):
+        self.s.codes
+        self.s.append('Curb')
+        self.s[0] = 'Sewer'
+        assert list(self.s.codes) == [0, 0, 1, 2, 3]
+        assert self.s.categories == ['Sewer', 'Alley', 'Paving', 'Curb']
+
+
+class TestSeriesArithmetic:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.s = Series([1, 2, 3, 4])
+
+    def test_methods_with_a_value(self):
+        assert self.s.mul(2) == [2, 4, 6, 8]
+        assert self.s.add(1) == [2, 3, 4, 5]
+        assert self.s.rsub(10) == [9, 8, 7, 6]
+        assert self.s.div(2) == [0.5, 1.0, 1.5, 2.0]
+        assert isinstance(self.s.mul(2), Series)
+
+    def test_methods_with_another_series(self):
+        assert self.s.add(Series([10, 20, 30, 40])) == [11, 22, 33, 44]
+        assert self.s.mul([1, 0, 1, 0]) == [1, 0, 3, 0]
+
+    def test_lengths_have_to_match(self):
+        with pytest.raises(ValueError):
+            self.s.add([1, 2])
+
+    def test_comparisons(self):
+        assert self.s.gt(2) == [False, False, True, True]
+        assert self.s.le(2) == [True, True, False, False]
+        assert self.s.eq(3) == [False, False, True, False]
+        assert self.s.ne([1, 0, 3, 0]) == [False, True, False, True]
+
+    def test_operators_keep_their_list_meaning(self):
+        assert self.s == [1, 2, 3, 4]
+        assert self.s != [1, 2, 3]
+        assert self.s + [5] == [1, 2, 3, 4, 5]
+        assert self.s * 2 == [1, 2, 3, 4, 1, 2, 3, 4]
+        assert (self.s < [1, 2, 4]) is True
+        self.s += [5]
+        assert self.s == [1, 2, 3, 4, 5]
+
+    def test_categorical_methods_work_per_category(self):
+        s = Categorical(['Alley', 'Sewer', 'Alley'])
+        assert s.add('!') == ['Alley!', 'Sewer!', 'Alley!']
+        assert s.radd('(') == ['(Alley', '(Sewer', '(Alley']
+        assert s.eq('Alley') == [True, False, True]
+        assert s.ne('Alley') == [False, True, False]
+        assert s.eq(['Alley', 'Alley', 'Alley']) == [True, False, True]
+
+
+class TestSeriesReductions:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.s = Series.from_buffer(array('d', [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]))
+
+    def test_sum_mean_min_max(self):
+        assert self.s.sum() == 40.0
+        assert self.s.mean() == 5.0
+        assert self.s.min() == 2.0
+        assert self.s.max() == 9.0
+
+    def test_std_is_the_sample_standard_deviation(self):
+        assert self.s.std() == pytest.approx(2.138089935)
+        assert math.isnan(Series([1]).std())
+
+    def test_quantile_interpolates(self):
+        assert self.s.quantile(0.5) == 4.5
+        assert self.s.quantile([0, 1]) == [2.0, 9.0]
+        assert Series([1, 2, 3, 4]).quantile(0.25) == 1.75
+
+    def test_changing_the_series_drops_the_buffer(self):
+        self.s.append(10.0)
+        assert self.s._buffer is None
+        assert self.s.sum() == 50.0
+
+    def test_whole_numbers_never_overflow(self):
+        s = Series.from_buffer(array('q', [2 ** 62, 2 ** 62]))
+        assert s.sum() == 2 ** 63
+
+    def test_sum_with_numpy_matches_python(self):
+        pytest.importorskip('numpy')
+        s = Series.from_buffer(array('d', [0.5] * 1000))
+        assert s._float_buffer() is s._buffer
+        assert s.sum() == 500.0
+
+    def test_apply_with_a_builtin(self):
+        assert Series(['1', '2']).apply(int) == [1, 2]
+
+    def test_apply_with_a_numpy_ufunc(self):
+        numpy = pytest.importorskip('numpy')
+        assert Series([1.0, 4.0, 9.0]).apply(numpy.sqrt) == [1.0, 2.0, 3.0]
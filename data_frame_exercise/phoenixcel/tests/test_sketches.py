@@ -0,0 +1,103 @@
+import random
+from bisect import bisect_left
+
+import pytest
+
+from phoenixcel.src.dataframe import DataFrame
+from phoenixcel.src.sketches import DistinctSketch, QuantileSketch
+
+
+class TestDistinctSketch:
+    def test_small_counts_are_nearly_exact(self):
+        assert DistinctSketch.from_values(range(10)).estimate() == 10
+        assert DistinctSketch.from_values(['a', 'b', 'a', None]).estimate() == 2
+
+    def test_large_counts_are_within_a_few_percent(self):
+        generator = random.Random(0)
+        values = [generator.randrange(50000) for _ in range(100000)]
+        exact = len(set(values))
+        assert DistinctSketch.from_values(values).estimate() == pytest.approx(exact, rel=0.05)
+
+    def test_merge_counts_the_union(self):
+        left = DistinctSketch.from_values(range(0, 30000))
+        right = DistinctSketch.from_values(range(20000, 50000))
+        assert left.merge(right).estimate() == pytest.approx(50000, rel=0.05)
+
+    def test_equal_numbers_count_once(self):
+        assert DistinctSketch.from_values([1, 1.0, True, 2.5, 2]).estimate() == len({1, 1.0, True, 2.5, 2})
+
+    def test_merge_needs_the_same_precision(self):
+        with pytest.raises(ValueError):
+            DistinctSketch(10).merge(DistinctSketch(12))
+
+
+class TestQuantileSketch:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        generator = random.Random(0)
+        self.values = [generator.random() for _ in range(50000)]
+        self.ordered = sorted(self.values)
+
+    def rank(self, value):
+        return bisect_left(self.ordered, value) / len(self.ordered)
+
+    def test_small_inputs_are_exact(self):
+        sketch = QuantileSketch.from_values([5, 1, 4, None, 2, 3])
+        assert sketch.quantile([0, 0.5, 1]) == [1, 3, 5]
+
+    def test_memory_stays_bounded(self):
+        sketch = QuantileSketch.from_values(self.values, seed=1)
+        assert len(sketch) == len(self.values)
+        assert sum(map(len, sketch._compactors)) < 3 * sketch.k
+
+    def test_quantiles_are_close_in_rank(self):
+        sketch = QuantileSketch.from_values(self.values, seed=1)
+        for q in (0.1, 0.5, 0.9):
+            assert self.rank(sketch.quantile(q)) == pytest.approx(q, abs=0.02)
+
+    def test_merged_chunks_answer_for_the_whole(self):
+        left = QuantileSketch.from_values(self.values[:20000], seed=1)
+        right = QuantileSketch.from_values(self.values[20000:], seed=2)
+        merged = left.merge(right)
+        assert len(merged) == len(self.values)
+        assert self.rank(merged.quantile(0.5)) == pytest.approx(0.5, abs=0.02)
+
+    def test_answers_are_the_same_on_every_run(self):
+        first = QuantileSketch.from_values(self.values).quantile([0.1, 0.5, 0.9])
+        again = QuantileSketch.from_values(self.values).quantile([0.1, 0.5, 0.9])
+        assert first == again
+
+    def test_empty_sketch(self):
+        assert QuantileSketch().quantile(0.5) is None
+        with pytest.raises(ValueError):
+            QuantileSketch().quantile(2)
+
+
+class TestGroupedSketches:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.df = DataFrame.from_dictionary({
+            'Activity': ['Alley', 'Sewer', 'Alley', 'Alley', 'Sewer'],
+            'Crew': ['a', 'b', 'b', 'a', 'b'],
+            'Days': [1, 3, 4, 2, 5],
+        })
+
+    def test_group_by_methods(self):
+        grouped = self.df.group_by('Activity')
+        assert grouped.approx_distinct('Crew') == {'Alley': 2, 'Sewer': 1}
+        assert grouped.approx_quantile('Days') == {'Alley': 2, 'Sewer': 3}
+        assert grouped.approx_quantile('Days', q=1) == {'Alley': 4, 'Sewer': 5}
+
+    def test_describe_with_and_describe_by_agree(self):
+        args = [
+            {'agg': 'approx_distinct', 'column': 'Crew'},
+            {'agg': 'approx_quantile', 'column': 'Days', 'q': 0.5},
+            {'agg': 'approx_quantile', 'column': 'Days', 'q': 1},
+        ]
+        described = self.df.group_by('Activity').describe_with(*args)
+        assert described['Alley'] == {
+            'Crew approx_distinct': 2,
+            'Days approx_quantile(0.5)': 2,
+            'Days approx_quantile(1)': 4,
+        }
+        assert self.df.describe_by('Activity', *args) == described
@@ -0,0 +1,68 @@
+import math
+import os
+import statistics
+
+import pytest
+
+from phoenixcel.src.dataframe import DataFrame
+from phoenixcel.src.series import Series
+from phoenixcel.src.stats import RunningStats
+
+
+VALUES = [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]
+
+
+class TestRunningStats:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.stats = RunningStats.from_values(VALUES)
+
+    def test_matches_the_statistics_module(self):
+        assert self.stats.count == 8
+        assert self.stats.sum == 40.0
+        assert self.stats.mean == 5.0
+        assert self.stats.variance == pytest.approx(statistics.variance(VALUES))
+        assert self.stats.std == pytest.approx(statistics.stdev(VALUES))
+        assert (self.stats.min, self.stats.max, self.stats.spread) == (2.0, 9.0, 7.0)
+
+    def test_empty_and_single_values(self):
+        empty = RunningStats()
+        assert empty.count == 0 and empty.min is None
+        assert math.isnan(empty.describe()['mean'])
+        assert math.isnan(RunningStats.from_values([3]).variance)
+
+    def test_whole_numbers_sum_exactly(self):
+        assert RunningStats.from_values([10 ** 20, 1, -10 ** 20]).sum == 1
+
+    def test_compensated_sum_keeps_small_floats(self):
+        values = [1e16] + [1.0] * 1000 + [-1e16]
+        assert RunningStats.from_values(values).sum == 1000.0
+        assert sum(values) != 1000.0
+
+    def test_merging_chunks_matches_one_pass(self):
+        merged = RunningStats.from_values(VALUES[:3]).merge(RunningStats.from_values(VALUES[3:]))
+        assert merged.count == self.stats.count
+        assert merged.mean == pytest.approx(self.stats.mean)
+        assert merged.variance == pytest.approx(self.stats.variance)
+        assert (merged.min, merged.max) == (2.0, 9.0)
+
+    def test_merging_with_an_empty_stats(self):
+        merged = RunningStats() + self.stats
+        assert merged.describe() == pytest.approx(self.stats.describe())
+
+
+class TestSeriesDescribe:
+    def test_describe(self):
+        description = Series(VALUES).describe()
+        assert description['count'] == 8
+        assert description['mean'] == 5.0
+        assert description['std'] == pytest.approx(statistics.stdev(VALUES))
+
+    def test_stats_merge_across_csv_chunks(self):
+        csv_path = os.path.join(os.path.dirname(__file__), 'test_birds.csv')
+        chunks = DataFrame.read_csv_chunks(csv_path, chunk_size=4)
+        streamed = sum((chunk['weight'].running_stats() for chunk in chunks), RunningStats())
+        whole = DataFrame.from_csv(csv_path)['weight']
+        assert streamed.count == len(whole)
+        assert streamed.mean == pytest.approx(statistics.mean(whole))
+        assert streamed.std == pytest.approx(statistics.stdev(whole))
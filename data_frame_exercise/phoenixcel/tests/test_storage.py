@@ -0,0 +1,79 @@
+import os
+from datetime import date
+
+import pytest
+
+from phoenixcel.src.dataframe import DataFrame
+
+
+class TestSaveAndOpen:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, tmp_path):
+        self.path = os.path.join(tmp_path, 'frame.phx')
+        self.df = DataFrame.from_dictionary({
+            'activity': ['Alley', 'Sewer', 'Alley'],
+            'start': [date(2018, 12, 10), date(2018, 11, 26), date(2017, 1, 2)],
+            'days': [1.5, 2.0, 171.58],
+            'requests': [8, 9, 10],
+            'late': [True, False, True],
+        })
+
+    def test_round_trip_keeps_values_and_types(self):
+        self.df.save(self.path)
+        opened = DataFrame.open(self.path)
+        assert opened.columns == self.df.columns
+        assert opened._list == self.df._list
+        assert {key: column.dtype for key, column in opened._dictionary.items()} == \
+            {key: column.dtype for key, column in self.df._dictionary.items()}
+
+    def test_opened_columns_read_from_the_mapped_file(self):
+        self.df.save(self.path)
+        opened = DataFrame.open(self.path)
+        assert isinstance(opened._dictionary['requests']._data, memoryview)
+
+    def test_opened_frames_work_in_pipelines(self):
+        self.df.save(self.path)
+        opened = DataFrame.open(self.path)
+        grouped = opened.where(lambda row: row['requests'] > 8).group_by('activity')
+        assert grouped.sum(on='days') == {'Sewer': 2.0, 'Alley': 171.58}
+
+    def test_writing_to_an_opened_column_copies_it(self):
+        self.df.save(self.path)
+        opened = DataFrame.open(self.path)
+        column = opened._dictionary['activity']
+        column.append('Curb')
+        assert list(column) == ['Alley', 'Sewer', 'Alley', 'Curb']
+        assert list(DataFrame.open(self.path)['activity']) == ['Alley', 'Sewer', 'Alley']
+
+    def test_saving_over_an_opened_file_leaves_it_readable(self):
+        big = DataFrame.from_dictionary({'requests': list(range(1000))})
+        big.save(self.path)
+        opened = DataFrame.open(self.path)
+        self.df.save(self.path)
+        assert opened['requests'] == list(range(1000))
+        assert DataFrame.open(self.path)._list == self.df._list
+
+    def test_a_frame_can_be_saved_over_the_file_it_was_opened_from(self):
+        self.df.save(self.path)
+        opened = DataFrame.open(self.path)
+        opened.where(lambda row: row['late']).save(self.path)
+        assert DataFrame.open(self.path)['requests'] == [8, 10]
+        assert os.listdir(os.path.dirname(self.path)) == ['frame.phx']
+
+    def test_views_are_saved_as_their_rows(self):
+        self.df.where(lambda row: row['late']).save(self.path)
+        assert DataFrame.open(self.path)['requests'] == [8, 10]
+
+    def test_empty_frames_round_trip(self):
+        self.df.where(lambda row: False).save(self.path)
+        assert DataFrame.open(self.path).shape == (5, 0)
+
+    def test_object_columns_are_refused(self):
+        with pytest.raises(ValueError):
+            DataFrame.from_dictionary({'mixed': [1, 'a']}).save(self.path)
+
+    def test_other_files_are_refused(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a dataframe')
+        with pytest.raises(ValueError):
+            DataFrame.open(self.path)
@@ -0,0 +1,138 @@
+import random
+
+
+class Datastore():
+    '''
+    An in-memory key-value store that keeps track of how many times each
+    value is stored, so count() doesn't have to look at every record.
+
+    The counts are kept up to date on every write: set() adds one for the
+    new value and, when it overwrites a key, takes one away from the old
+    value; delete() takes one away. Values that are no longer stored
+    anywhere are dropped from the counts, so they don't pile up.
+
+    With index_keys=True it also keeps, for every value, the keys that
+    hold it, so reverse lookups (keys_with) only copy those keys instead
+    of scanning the store.
+    That costs memory for one more reference per key.
+
+    Values have to be hashable, since they are used as dictionary keys.
+    '''
+    def __init__(self, index_keys=False):
+        self._data = {}
+        self._counts = {}
+        # Value -> {key: None}, a dictionary used as an ordered set so
+        # keys come back in the order they were stored. None when the
+        # inverted index is not kept.
+        self._keys = {} if index_keys else None
+
+    def insert_at_random(self, values, num_records):
+        for x in range(num_records):
+            random_key = hash(x)  # This is how we're getting a pseudo-random and probably unique ID
+            value_from_choices = random.choices(values)[0]
+            self.set(random_key, value_from_choices)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    # Reading
+    def get(self, key):
+        return self._data[key]
+
+    def count(self, value):
+        '''
+        How many keys currently hold value, 0 if none do. Takes the same
+        time however many records there are.
+        '''
+        return self._counts.get(value, 0)
+
+    def value_counts(self):
+        '''A copy of the value -> count index.'''
+        return dict(self._counts)
+
+    def keys_with(self, value):
+        '''
+        The keys that currently hold value, in the order they were set.
+
+        Input:
+          value - the value to look for
+
+        Output:
+          a tuple of the keys holding value right now (empty when no key
+          does). It is a copy, so later sets and deletes don't change it
+          and it can be looped over while the store is being changed.
+
+        Modifies:
+          Nothing
+        '''
+        if self._keys is None:
+            raise Exception("Reverse lookups need a Datastore created with index_keys=True.")
+        return tuple(self._keys.get(value, ()))
+
+    # Writing
+    def set(self, key, value):
+        '''
+        Stores value under key, replacing what was there before.
+
+        Input:
+          key - any hashable key
+          value - any hashable value
+
+        Output:
+          None
+
+        Modifies:
+          Modifies the store, its counts and (if kept) its inverted index.
+        '''
+        if key in self._data:
+            old = self._data[key]
+            if old == value:
+                # Counted under the same entry either way
+                self._data[key] = value
+                return
+            # Counting the new value first raises for an unhashable
+            # value before anything has changed
+            self._add(key, value)
+            self._remove(key, old)
+        else:
+            self._add(key, value)
+        self._data[key] = value
+
+    def delete(self, key):
+        '''
+        Removes key and its value from the store.
+
+        Input:
+          key - a key that is in the store
+
+        Output:
+          None
+
+        Modifies:
+          Modifies the store, its counts and (if kept) its inverted index.
+          Raises KeyError if key is not in the store.
+        '''
+        value = self._data.pop(key)
+        self._remove(key, value)
+
+    # Keeping the indexes up to date
+    def _add(self, key, value):
+        self._counts[value] = self._counts.get(value, 0) + 1
+        if self._keys is not None:
+            self._keys.setdefault(value, {})[key] = None
+
+    def _remove(self, key, value):
+        remaining = self._counts[value] - 1
+        if remaining:
+            self._counts[value] = remaining
+        else:
+            del self._counts[value]
+
+        if self._keys is not None:
+            keys = self._keys[value]
+            del keys[key]
+            if not keys:
+                del self._keys[value]
@@ -0,0 +1,139 @@
+import unittest
+from collections import Counter
+from datetime import datetime
+from datastore import Datastore
+
+
+class TestDatastoreInitialization(unittest.TestCase):
+    def test_initialization(self):
+        db = Datastore()
+        self.assertEqual(len(db), 0)
+        self.assertEqual(db.value_counts(), {})
+
+
+class TestDatastoreCount(unittest.TestCase):
+    def setUp(self):
+        self.db = Datastore()
+
+    def test_count_of_a_missing_value_is_zero(self):
+        self.assertEqual(self.db.count("clementine"), 0)
+
+    def test_set_counts_new_values(self):
+        self.db.set(1, "apple")
+        self.db.set(2, "apple")
+        self.db.set(3, "banana")
+
+        self.assertEqual(self.db.count("apple"), 2)
+        self.assertEqual(self.db.count("banana"), 1)
+
+    def test_overwrite_moves_the_count_to_the_new_value(self):
+        self.db.set(1, "apple")
+        self.db.set(1, "banana")
+
+        self.assertEqual(self.db.get(1), "banana")
+        self.assertEqual(self.db.value_counts(), {"banana": 1})
+
+    def test_overwrite_with_the_same_value_keeps_the_count(self):
+        self.db.set(1, "apple")
+        self.db.set(1, "apple")
+
+        self.assertEqual(self.db.count("apple"), 1)
+
+    def test_delete_takes_the_value_away(self):
+        self.db.set(1, "apple")
+        self.db.set(2, "apple")
+        self.db.delete(1)
+
+        self.assertEqual(self.db.count("apple"), 1)
+        self.assertNotIn(1, self.db)
+
+    def test_values_no_longer_stored_are_dropped(self):
+        self.db.set(1, "apple")
+        self.db.delete(1)
+
+        self.assertEqual(self.db.value_counts(), {})
+
+    def test_delete_of_a_missing_key_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.db.delete(1)
+
+    def test_unhashable_value_leaves_the_store_unchanged(self):
+        self.db.set(1, "apple")
+        with self.assertRaises(TypeError):
+            self.db.set(1, ["apple"])
+
+        self.assertEqual(self.db.get(1), "apple")
+        self.assertEqual(self.db.value_counts(), {"apple": 1})
+
+    def test_counts_match_a_recount_after_random_inserts(self):
+        values = ["apple", "banana", "carrot", "celery", "mirepoix", "clementine"]
+        self.db.insert_at_random(values=values, num_records=10000)
+        self.db.insert_at_random(values=values, num_records=5000)  # Overwrites the first 5000 keys
+
+        self.assertEqual(self.db.value_counts(), Counter(self.db._data.values()))
+        self.assertEqual(len(self.db), 10000)
+
+
+class TestDatastoreCountPerformance(unittest.TestCase):
+    def test_count_does_not_depend_on_the_number_of_records(self):
+        db = Datastore()
+        db.insert_at_random(values=["apple", "banana", "carrot", "celery", "mirepoix", "clementine"], num_records=200000)
+
+        start = datetime.now()
+        for _ in range(1000):
+            db.count("clementine")
+        end = datetime.now()
+        self.assertTrue((end - start).total_seconds() < 0.01)
+
+
+class TestDatastoreKeysWith(unittest.TestCase):
+    def setUp(self):
+        self.db = Datastore(index_keys=True)
+        self.db.set("a", "apple")
+        self.db.set("b", "banana")
+        self.db.set("c", "apple")
+
+    def test_keys_with_returns_keys_in_the_order_they_were_set(self):
+        self.assertEqual(list(self.db.keys_with("apple")), ["a", "c"])
+
+    def test_keys_with_a_missing_value_is_empty(self):
+        self.assertEqual(list(self.db.keys_with("carrot")), [])
+
+    def test_overwrite_moves_the_key(self):
+        self.db.set("a", "banana")
+
+        self.assertEqual(list(self.db.keys_with("apple")), ["c"])
+        self.assertEqual(list(self.db.keys_with("banana")), ["b", "a"])
+
+    def test_overwrite_with_the_same_value_keeps_the_key(self):
+        self.db.set("a", "apple")
+
+        self.assertEqual(list(self.db.keys_with("apple")), ["a", "c"])
+
+    def test_delete_removes_the_key(self):
+        self.db.delete("b")
+
+        self.assertEqual(list(self.db.keys_with("banana")), [])
+        self.assertEqual(self.db._keys.keys(), {"apple"})
+
+    def test_keys_with_is_not_changed_by_later_writes(self):
+        apples = self.db.keys_with("apple")
+        carrots = self.db.keys_with("carrot")
+        self.db.set("d", "apple")
+        self.db.set("e", "carrot")
+        self.db.delete("a")
+
+        self.assertEqual(apples, ("a", "c"))
+        self.assertEqual(carrots, ())
+
+    def test_keys_with_can_be_looped_over_while_writing(self):
+        for key in self.db.keys_with("apple"):
+            self.db.delete(key)
+
+        self.assertEqual(self.db.keys_with("apple"), ())
+        self.assertEqual(self.db.count("apple"), 0)
+
+    def test_keys_with_without_the_index_raises_exception(self):
+        with self.assertRaises(Exception) as context:
+            Datastore().keys_with("apple")
+        self.assertEqual(str(context.exception), "Reverse lookups need a Datastore created with index_keys=True.")